@@ -3,13 +3,24 @@ Main application class for the QuackQuery AI Assistant.
 """
 
 import os
+import sys
 import json
 import logging
 import asyncio
+import time
 import re
 import getpass
+import functools
+import contextlib
+import itertools
+import concurrent.futures
+import hashlib
+import collections
+import copy
+import types
 from dotenv import load_dotenv
 from ..core.assistant import Assistant
+from ..core.prompts import ROLE_PROMPTS, ROLE_KEYS, ROLE_KEY_SET, ROLE_CHOICES_STR, ROLE_TABLE_ROWS
 from ..utils.screenshot import DesktopScreenshot
 from ..utils.ocr import OCRProcessor
 from ..integrations.github import GitHubIntegration
@@ -20,6 +31,8 @@ from ..utils.app_intent import AppIntentParser
 from ..integrations.app_launcher import AppLauncher
 from ..integrations.email_manager import EmailManager
 from ..utils.email_intent import EmailIntentParser
+from ..utils.excel_handler import ExcelHandler
+from ..utils.excel_nlp import ExcelNLProcessor
 from ai_assistant.integrations.whatsapp_manager import WhatsAppManager
 from ai_assistant.utils.whatsapp_intent import WhatsAppIntentParser
 from ai_assistant.utils.speech import SpeechRecognizer
@@ -29,11 +42,13 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from rich.markdown import Markdown
+from rich.live import Live
 from rich.syntax import Syntax
 from rich.table import Table
 from rich.prompt import Prompt, Confirm
 from rich import box
 from datetime import datetime
+from operator import itemgetter
 import shutil
 import smtplib
 import imaplib
@@ -42,11 +57,363 @@ import subprocess
 from rich.columns import Columns
 import pandas as pd
 
+# orjson reads and writes the config as bytes and is several times faster than the stdlib
+try:
+    from orjson import loads as _jloads, dumps as _jdumps
+except ImportError:
+    from json import loads as _jloads
+    def _jdumps(obj):
+        return json.dumps(obj).encode()
+
 # Load environment variables for API keys
 load_dotenv()
 
 logger = logging.getLogger("ai_assistant")
 
+# Inputs that end the session, and cheap substrings that gate the WhatsApp fallbacks
+_EXIT_COMMANDS = frozenset({"exit", "quit", "/exit", "/quit"})
+_WHATSAPP_HINTS = ("whatsapp", "message", "msg")
+
+# Shared column layouts for the transient spinners (see AIAssistantApp._spin)
+_SPIN_COLUMNS = (SpinnerColumn(), TextColumn("[bold blue]{task.description}[/bold blue]"))
+_BAR_COLUMNS = _SPIN_COLUMNS + (BarColumn(), TimeElapsedColumn())
+
+# Box styles bound once for the tables and panels below
+_ROUNDED, _SIMPLE = box.ROUNDED, box.SIMPLE
+
+# Shared Panel styles and recurring panel titles
+_PANEL_BLUE = dict(border_style="blue", box=_ROUNDED)
+_PANEL_GREEN = dict(border_style="green", box=_ROUNDED)
+_PANEL_RED = dict(border_style="red", box=_ROUNDED)
+_PANEL_CYAN = dict(border_style="cyan", box=_ROUNDED)
+_PANEL_YELLOW = dict(border_style="yellow", box=_ROUNDED)
+_TITLE_AI_ANALYSIS = "[bold]AI Analysis[/bold]"
+_TITLE_AI_EMAIL = "[bold]AI Email Writer[/bold]"
+_TITLE_GITHUB_ISSUES = "[bold]GitHub Issues[/bold]"
+_TITLE_NEW_ISSUE = "[bold]New GitHub Issue[/bold]"
+_TITLE_ISSUE_PREVIEW = "[bold]Issue Preview[/bold]"
+_TITLE_GIT_CLONE = "[bold]Git Clone Operation[/bold]"
+_TITLE_OCR = "[bold]OCR Operation[/bold]"
+
+# Static help shown by a bare /whatsapp command
+_WHATSAPP_HELP_PANEL = Panel(
+    "WhatsApp Commands:\n\n"
+    "• [bold cyan]setup[/bold cyan] - Configure WhatsApp integration\n"
+    "• [bold cyan]connect[/bold cyan] - Connect to WhatsApp Web\n"
+    "• [bold cyan]disconnect[/bold cyan] - Disconnect from WhatsApp Web\n"
+    "• [bold cyan]send[/bold cyan] - Send a WhatsApp message\n"
+    "• [bold cyan]ai[/bold cyan] - Use AI to compose a message\n"
+    "• [bold cyan]contacts[/bold cyan] - List recent contacts\n\n"
+    "[bold cyan]Role-based message composition:[/bold cyan]\n"
+    "• [bold cyan]ai <recipient> [role] [instructions][/bold cyan] - Generate a message using a specific AI role\n"
+    "• Example: [bold cyan]/whatsapp ai +1234567890 Business \"Schedule a meeting for tomorrow\"[/bold cyan]",
+    title="[bold]WhatsApp Help[/bold]",
+    **_PANEL_CYAN
+)
+
+# Startup banner printed by run()
+_WELCOME_PANEL = Panel.fit(
+    "🦆 [bold cyan]QuackQuery AI Assistant[/bold cyan] [green]initialized for your service[/green]",
+    **_PANEL_CYAN,
+    title="Welcome",
+    subtitle="v5.0"
+)
+
+# Read-only intents for the argument-free WhatsApp operations, shared instead of rebuilt per call;
+# _WHATSAPP_SIMPLE_INTENTS maps the /whatsapp subcommands that take no arguments onto them
+_WA_CONNECT_INTENT = types.MappingProxyType({'action': 'connect_whatsapp'})
+_WHATSAPP_SIMPLE_INTENTS = {
+    "connect": _WA_CONNECT_INTENT,
+    "disconnect": types.MappingProxyType({'action': 'disconnect_whatsapp'}),
+    "contacts": types.MappingProxyType({'action': 'list_contacts'}),
+}
+
+# Options offered after the AI WhatsApp composer generates a message, rendered once
+_WHATSAPP_AI_CHOICES = {
+    "1": "Send as is",
+    "2": "Edit before sending",
+    "3": "Regenerate with new instructions",
+    "4": "Regenerate with different role",
+    "5": "Save as draft (not implemented)",
+    "6": "Cancel"
+}
+_WHATSAPP_AI_MENU = "\n".join(f"[bold blue]{key}.[/bold blue] {value}" for key, value in _WHATSAPP_AI_CHOICES.items())
+_WHATSAPP_AI_KEYS = list(_WHATSAPP_AI_CHOICES)
+
+# Fixed Prompt.ask choice sets for the interactive menus
+_MAIN_MENU_CHOICES = ("s", "t", "c", "q")
+_CONFIG_MENU_CHOICES = ("1", "2", "3", "4", "5", "6", "7")
+_MODEL_MENU_CHOICES = ("1", "2")
+_GH_MENU_CHOICES = ("1", "2", "3", "4")
+_GH_CREATE_CHOICES = ("issue", "pr")
+_WA_TONE_CHOICES = ("friendly", "formal", "casual", "professional")
+_WA_LENGTH_CHOICES = ("short", "medium", "long")
+_SHEET_OP_CHOICES = ("analyze", "filter", "chart", "save", "cancel")
+_CHART_TYPE_CHOICES = ("bar", "line", "scatter", "pie")
+_DOC_TYPE_CHOICES = ("report", "letter", "proposal", "article", "other")
+_DOC_FORMAT_CHOICES = ("markdown", "text", "html")
+
+# Column extractors for GitHub repository and issue table rows
+_REPO_COLS = itemgetter("name", "description", "stars", "forks", "language")
+_ISSUE_COLS = itemgetter("number", "title", "state", "created_at", "comments")
+
+# Pre-rendered state cells for GitHub issue tables, keyed by issue state
+_STATE_STYLES = {"open": "[green]open[/green]", "closed": "[red]closed[/red]"}
+
+# Options offered after the AI email writer generates a draft, rendered once
+_EMAIL_AI_CHOICES = {
+    "1": "Send as is",
+    "2": "Edit before sending",
+    "3": "Regenerate with new instructions",
+    "4": "Save as draft (not implemented)",
+    "5": "Cancel"
+}
+_EMAIL_AI_MENU = "\n".join(f"[bold blue]{key}.[/bold blue] {value}" for key, value in _EMAIL_AI_CHOICES.items())
+_EMAIL_AI_KEYS = list(_EMAIL_AI_CHOICES)
+
+# Email bodies longer than this are cut down before being rendered in a preview panel
+_PREVIEW_LIMIT = 4096
+
+# Units for _humansize, one per power of 1024
+_UNIT_STRINGS = ('B', 'KB', 'MB', 'GB')
+
+# Files larger than this (10MB) are only partially read for display
+_READ_LIMIT = 10 * 1024 * 1024
+
+# Syntax lexer for files shown by the file read operation (plain text gets no highlighting)
+_LEXER_BY_EXT = {
+    ".py": "python",
+    ".js": "javascript",
+    ".html": "html",
+    ".css": "css",
+    ".json": "json",
+    ".md": "markdown",
+    ".xml": "xml",
+    ".java": "java",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".cs": "csharp",
+    ".go": "go",
+    ".rb": "ruby",
+    ".php": "php",
+    ".sh": "bash",
+    ".bat": "batch",
+    ".ps1": "powershell",
+    ".sql": "sql",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".txt": None
+}
+
+# Seconds an inbox listing is reused by read_emails before IMAP is queried again
+_EMAIL_CACHE_TTL = 15
+
+# Email intents that only look at the mailbox; every other operation drops the cached listing
+_EMAIL_READ_OPS = frozenset(('read_email', 'list_emails'))
+
+# AI-composed messages kept for reuse when the same (normalized) composition prompt comes back
+_COMPOSE_CACHE_SIZE = 512
+
+# The GITHUB_TOKEN assignment line in a .env file
+_GH_TOKEN_RE = re.compile(r'(?m)^GITHUB_TOKEN=.*$')
+_GH_TOKEN_LINE_RE = re.compile(r'(?m)^GITHUB_TOKEN=.*(?:\r?\n|\Z)')
+
+# Percentage in git clone's "Receiving objects:  45% (...)" progress lines
+_GIT_RECEIVING_RE = re.compile(rb'Receiving objects:\s+(\d+)%')
+
+# Bare email address, e.g. inside a "Name <user@example.com>" From header
+_EMAIL_RE = re.compile(r'[\w.-]+@[\w.-]+\.[A-Za-z]{2,}')
+
+# Fenced code block: optional language tag on the opening line, then the code body
+_FENCE_RE = re.compile(r"```([^\n]*)\n(.*?)\n?```", re.DOTALL)
+
+# Phone-number fallbacks for WhatsApp requests the intent parser missed
+_PHONE_RE = re.compile(r'[+=]?\d{10,}')
+_PHONE_TO_RE = re.compile(r'(?:to\s+)?([+=]?\d{10,})')
+_AI_COMPOSE_RE = re.compile(r'(?:ai|assistant|help)\s+(?:write|compose|draft|create)\s+(?:a\s+)?(?:message|msg)(?:\s+to\s+|\s+for\s+)?([+=]?\d{10,})', re.IGNORECASE)
+_AI_COMPOSE_VERBS = ("write", "compose", "draft", "create")
+
+# WhatsApp composition prompts: each role's system prompt with the fixed lead-in baked on
+_WA_PROMPT_HEADS = {role: f"{prompt}\n\nNow, compose a WhatsApp message to " for role, prompt in ROLE_PROMPTS.items()}
+_WA_PROMPT_TAIL = "\nThe message should be concise and appropriate for WhatsApp. Don't include any introduction or explanation, just the message content."
+
+@functools.lru_cache(maxsize=128)
+def _md(text):
+    """Build (and cache) a Markdown renderable for repeated response text."""
+    return Markdown(text)
+
+@functools.lru_cache(maxsize=128)
+def _syn(code, lang):
+    """Build (and cache) a highlighted Syntax renderable for repeated code blocks."""
+    return Syntax(code, lang, theme="monokai", line_numbers=True, word_wrap=True)
+
+def _preview_text(text):
+    """Return text unchanged, or cut to 4000 characters once it reaches _PREVIEW_LIMIT."""
+    if len(text) < _PREVIEW_LIMIT:
+        return text
+    return text[:4000] + "\n…[truncated]"
+
+def _whatsapp_prompt(role, recipient, instruction, tone=None):
+    """Build the AI prompt for composing a WhatsApp message; callers pass an already-validated role."""
+    head = _WA_PROMPT_HEADS[role]
+    tone_part = f" with a {tone} tone" if tone else ""
+    return f"{head}{recipient}{tone_part}. The message should be about: {instruction}{_WA_PROMPT_TAIL}"
+
+def _unquote(text):
+    """Strip surrounding whitespace and one enclosing pair of double quotes from an AI reply."""
+    text = text.strip()
+    if text[:1] == '"' and text[-1:] == '"':
+        return text[1:-1]
+    return text
+
+def _humansize(n):
+    """Format a byte count as B, KB, MB or GB, picking the unit from the bit length."""
+    if n < 1024:
+        return f"{n} B"
+    unit = min((n.bit_length() - 1) // 10, len(_UNIT_STRINGS) - 1)
+    return f"{n / (1 << (10 * unit)):.1f} {_UNIT_STRINGS[unit]}"
+
+def _list_entries(directory, recursive=False):
+    """
+    Return (name, is_dir, stat) for the entries of a directory (run via AIAssistantApp._in_io).
+    
+    Names are relative to directory. Symlinks are never followed: they are listed with
+    their own stat data and a recursive listing does not descend into them.
+    """
+    entries = []
+    # Breadth-first: subdirectories appended here are picked up by the loop in order
+    pending = [(directory, "")]
+    for path, prefix in pending:
+        # scandir returns type and stat data with each entry, avoiding extra stat calls
+        with os.scandir(path) as it:
+            for entry in it:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                name = prefix + entry.name
+                entries.append((name, is_dir, entry.stat(follow_symlinks=False)))
+                if recursive and is_dir:
+                    pending.append((entry.path, name + os.sep))
+    return entries
+
+@functools.lru_cache(maxsize=1)
+def _main_menu_panel():
+    """Build (once) the Main Menu panel shown on every pass of the run() loop."""
+    menu_table = Table(show_header=False, box=_SIMPLE)
+    menu_table.add_column("Option", style="cyan")
+    menu_table.add_column("Description")
+    menu_table.add_row("S", "Speak to the assistant")
+    menu_table.add_row("T", "Type a question")
+    menu_table.add_row("C", "Configure settings")
+    menu_table.add_row("Q", "Quit")
+    return Panel(menu_table, title="[bold]Main Menu[/bold]", **_PANEL_BLUE)
+
+@functools.lru_cache(maxsize=1)
+def _role_panel():
+    """Build (once) the Assistant Roles panel listing every role with its short description."""
+    role_table = Table(box=_ROUNDED)
+    role_table.add_column("Option", style="cyan")
+    role_table.add_column("Role")
+    role_table.add_column("Description")
+    for row in ROLE_TABLE_ROWS:
+        role_table.add_row(*row)
+    return Panel(role_table, title="[bold]Assistant Roles[/bold]", **_PANEL_BLUE)
+
+def _read_text(path, max_lines=None):
+    """Read a UTF-8 text file, stopping after max_lines lines if given (run via AIAssistantApp._in_io)."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        if max_lines is None:
+            return f.read()
+        return "".join(itertools.islice(f, max_lines))
+
+def _read_capped(path):
+    """
+    Return (size, text) for a file, keeping only the first 100 lines past _READ_LIMIT bytes.
+    
+    Text is None when the file looks binary (a NUL byte in its first 4 KiB); undecodable
+    bytes elsewhere are replaced rather than failing the read.
+    """
+    size = os.path.getsize(path)
+    
+    # Read the raw bytes in 1 MiB chunks, bypassing the text I/O layer
+    chunks = []
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if size > _READ_LIMIT:
+            # Only sniff the head; the first lines are streamed separately below
+            chunks.append(os.read(fd, 4096))
+        else:
+            while chunk := os.read(fd, 1 << 20):
+                chunks.append(chunk)
+    finally:
+        os.close(fd)
+    
+    data = b"".join(chunks)
+    if b"\0" in data[:4096]:
+        return size, None
+    if size > _READ_LIMIT:
+        return size, _read_text(path, 100)
+    return size, data.decode('utf-8', errors='replace').replace("\r\n", "\n")
+
+def _read_stdin_body():
+    """Read multi-line input up to EOF (Ctrl+D) in a single call (run via AIAssistantApp._in_io)."""
+    return sys.stdin.read()
+
+def _rewrite_env(path, mutate):
+    """
+    Rewrite a .env file with one read and one write.
+    
+    The file keeps its permission bits and its line-ending style (LF or CRLF).
+    
+    Args:
+        path (str): Path to the .env file; a missing file is treated as empty
+        mutate (callable): Takes the file content (with \n line endings) and returns the new content
+    """
+    try:
+        with open(path, 'r', newline='') as f:
+            raw = f.read()
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        raw, mode = "", None
+    
+    newline = "\r\n" if "\r\n" in raw else ("\n" if raw else os.linesep)
+    content = mutate(raw.replace("\r\n", "\n"))
+    if newline != "\n":
+        content = content.replace("\n", newline)
+    
+    # Write a sibling temp file and swap it in, so a crash never leaves a torn .env. The temp
+    # file starts owner-only since it holds secrets, then takes over the original's mode
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, 'w', newline='') as f:
+        f.write(content)
+    os.chmod(tmp_path, 0o600 if mode is None else mode)
+    os.replace(tmp_path, path)
+
+def _set_env_token(content, token):
+    """Replace every GITHUB_TOKEN line in .env content, or append one if there is none."""
+    token_line = f"GITHUB_TOKEN={token}"
+    # A callable replacement keeps backslashes in the token literal
+    new, count = _GH_TOKEN_RE.subn(lambda m: token_line, content)
+    if count:
+        return new
+    return content + ("" if not content or content.endswith("\n") else "\n") + token_line + "\n"
+
+def _drop_env_token(content):
+    """Remove every GITHUB_TOKEN line (with its line ending) from .env content in one pass."""
+    return _GH_TOKEN_LINE_RE.sub("", content)
+
+def _write_text(path, data):
+    """
+    Write text, or an iterable of text chunks, as UTF-8 through a 1 MiB buffer (run via AIAssistantApp._in_io).
+    
+    No fsync is issued on purpose: these are user-facing scratch and output files, and flushing
+    them to disk is left to the OS.
+    """
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        if isinstance(data, str):
+            f.write(data)
+        else:
+            f.writelines(data)
+
 class AIAssistantApp:
     """
     Main application class for the AI Assistant.
@@ -90,7 +457,26 @@ class AIAssistantApp:
         
         # Initialize required attributes with default values
         self.speech_recognizer = None
-        self.whatsapp_manager = None
+        self._whatsapp_manager = None
+        
+        # Shared worker threads for blocking file, network and device calls (see _in_io)
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='ai-io')
+        
+        # Reusable spinner displays for _spin, keyed by layout: [Progress, number of active users]
+        self._progress = {}
+        
+        # One dedicated thread for the WhatsApp Selenium session, created on first use (see _in_whatsapp)
+        self._wa_executor = None
+        
+        # Inbox listing from the last check_emails call and when it was fetched
+        self._email_cache = None
+        self._email_cache_ts = 0
+        
+        # AI-composed messages keyed by a digest of model, role and normalized prompt (see _compose)
+        self._compose_cache = collections.OrderedDict()
+        
+        # Attach a desktop screenshot to every question while enabled (toggled with /screenshot)
+        self._screenshot_mode = False
         
         # Load or initialize components based on config
         self.initialize_core_components()
@@ -104,8 +490,7 @@ class AIAssistantApp:
             console.print(Panel(
                 "[yellow]Debug mode enabled.[/yellow] Detailed logging will be shown.",
                 title="[bold]Debug Info[/bold]",
-                border_style="yellow",
-                box=box.ROUNDED
+                **_PANEL_YELLOW
             ))
             
     def display_error(self, error_message, error_detail=None):
@@ -114,8 +499,7 @@ class AIAssistantApp:
             f"[bold red]{error_message}[/bold red]" + 
             (f"\n\n[dim]{error_detail}[/dim]" if error_detail else ""),
             title="[bold]Error[/bold]",
-            border_style="red",
-            box=box.ROUNDED
+            **_PANEL_RED
         )
         console.print(error_panel)
         
@@ -124,8 +508,7 @@ class AIAssistantApp:
         success_panel = Panel(
             f"[bold green]{message}[/bold green]",
             title="[bold]Success[/bold]",
-            border_style="green",
-            box=box.ROUNDED
+            **_PANEL_GREEN
         )
         console.print(success_panel)
         
@@ -134,8 +517,7 @@ class AIAssistantApp:
         warning_panel = Panel(
             f"[bold yellow]{message}[/bold yellow]",
             title="[bold]Warning[/bold]",
-            border_style="yellow",
-            box=box.ROUNDED
+            **_PANEL_YELLOW
         )
         console.print(warning_panel)
         
@@ -144,10 +526,103 @@ class AIAssistantApp:
         console.print(Panel(
             message,
             title="[bold]Info[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
+            **_PANEL_BLUE
         ))
 
+    async def _in_io(self, fn, *args, **kwargs):
+        """
+        Run a blocking call on the shared I/O thread pool and await its result.
+        
+        Args:
+            fn: Blocking callable
+            *args, **kwargs: Arguments passed to fn
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(fn, *args, **kwargs))
+
+    async def _in_whatsapp(self, fn, *args):
+        """
+        Run a blocking WhatsApp manager call on the dedicated WhatsApp thread.
+        
+        The WebDriver session is not thread-safe, so every WhatsApp call is
+        serialized onto the same worker instead of the shared I/O pool.
+        
+        Args:
+            fn: Blocking WhatsAppManager method
+            *args: Arguments passed to fn
+        """
+        if self._wa_executor is None:
+            self._wa_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='whatsapp')
+        return await asyncio.get_running_loop().run_in_executor(self._wa_executor, fn, *args)
+
+    async def _compose(self, ai_prompt, fresh=False):
+        """
+        Ask the AI to compose a message, reusing the answer to an identical earlier prompt.
+        
+        Args:
+            ai_prompt (str): Full composition prompt, role context included
+            fresh (bool): Skip the cache lookup, e.g. when the user asked to regenerate
+            
+        Returns:
+            str: The AI's response
+        """
+        # Whitespace-insensitive key; case is kept since names, acronyms and quoted text matter
+        canonical = " ".join(ai_prompt.split())
+        key = hashlib.blake2b(
+            f"{self.assistant.model_choice}\0{self.assistant.role}\0{canonical}".encode(), digest_size=16
+        ).digest()
+        if not fresh:
+            cached = self._compose_cache.get(key)
+            if cached is not None:
+                self._compose_cache.move_to_end(key)
+                return cached
+        
+        message = await self.assistant.answer_async(ai_prompt)
+        
+        # Never cache answer_async's error text
+        if message and not message.startswith("I encountered an error"):
+            self._compose_cache[key] = message
+            self._compose_cache.move_to_end(key)
+            if len(self._compose_cache) > _COMPOSE_CACHE_SIZE:
+                self._compose_cache.popitem(last=False)
+        return message
+
+    @property
+    def whatsapp_manager(self):
+        """The WhatsApp manager, created (and its config parsed) on first use."""
+        if self._whatsapp_manager is None:
+            self._whatsapp_manager = WhatsAppManager(self.config_path)
+        return self._whatsapp_manager
+
+    @contextlib.asynccontextmanager
+    async def _spin(self, text, bar=False):
+        """
+        Show a transient spinner while the wrapped block runs.
+        
+        Args:
+            text (str): Label shown next to the spinner
+            bar (bool, optional): Also show a progress bar and elapsed time
+            
+        Yields:
+            callable: Forwards keyword arguments (total, completed, ...) to Progress.update for this task
+        """
+        # One long-lived Progress per column layout; nested spinners share its live display
+        entry = self._progress.get(bar)
+        if entry is None:
+            entry = self._progress[bar] = [Progress(*(_BAR_COLUMNS if bar else _SPIN_COLUMNS), console=console, transient=True), 0]
+        progress = entry[0]
+        if not entry[1]:
+            progress.start()
+        entry[1] += 1
+        task = progress.add_task(text, total=None)
+        try:
+            yield functools.partial(progress.update, task)
+        finally:
+            progress.remove_task(task)
+            entry[1] -= 1
+            if not entry[1]:
+                progress.stop()
+
     def initialize_core_components(self):
         """Initialize core components based on configuration."""
         self.config = load_config(self.config_path)
@@ -159,7 +634,6 @@ class AIAssistantApp:
         
         # Initialize speech recognizer
         try:
-            from ai_assistant.utils.speech import SpeechRecognizer
             self.speech_recognizer = SpeechRecognizer()
             logger.info("Speech recognition initialized")
         except Exception as e:
@@ -188,8 +662,39 @@ class AIAssistantApp:
             self.email_manager = None
             self.email_setup_complete = False
         
-        # Initialize WhatsApp manager if configured
-        self.whatsapp_manager = WhatsAppManager(self.config_path)
+        # Initialize email and WhatsApp intent parsers
+        self.email_intent_parser = EmailIntentParser()
+        self.whatsapp_intent_parser = WhatsAppIntentParser()
+        
+        # Intent parsers in priority order, each paired with its handler
+        self._intent_pipeline = [
+            (self.github_intent_parser.parse_intent, lambda intent, text: self.handle_github_operation(intent)),
+            (self.whatsapp_intent_parser.parse_intent, lambda intent, text: self.handle_whatsapp_operation(intent)),
+            (self._parse_whatsapp_fallback, lambda intent, text: self.handle_whatsapp_operation(intent)),
+            (self.email_intent_parser.parse_intent, lambda intent, text: self.handle_email_operation(intent, prompt=text)),
+            (self.file_intent_parser.parse_intent, lambda intent, text: self.handle_file_operation(intent)),
+            (self.app_intent_parser.parse_intent, lambda intent, text: self.handle_app_operation(intent)),
+        ]
+        
+        # Operation handlers for handle_whatsapp_operation and handle_email_operation, keyed by action
+        self._whatsapp_ops = {
+            'setup_whatsapp': self._wa_setup,
+            'connect_whatsapp': self._wa_connect,
+            'disconnect_whatsapp': self._wa_disconnect,
+            'list_contacts': self._wa_list_contacts,
+            'send_whatsapp': self._wa_send,
+            'ai_compose_whatsapp': self._wa_ai_compose,
+        }
+        self._email_ops = {
+            'ai_compose_email': self._email_ai_compose,
+            'read_email': self._email_read,
+            'list_emails': self._email_read,
+            'send_email': self._email_send,
+            'setup_email': self._email_setup,
+            'reply_to_email': self._email_reply,
+            'forward_email': self._email_forward,
+            'delete_email': self._email_delete,
+        }
         
         self.initialize_assistant()
         self.register_functions()
@@ -242,7 +747,8 @@ class AIAssistantApp:
             "/whatsapp": self.whatsapp_command,
             "/stats": self.stats_command,
             "/excel": self.excel_command,  # Add the Excel command
-            "/code-edit": self.code_edit_command
+            "/code-edit": self.code_edit_command,
+            "/screenshot": self.screenshot_command
         }
 
     async def process_command(self, text):
@@ -312,13 +818,17 @@ class AIAssistantApp:
             await self.code_edit_command(args)
             return True
             
+        # Screenshot context toggle
+        elif command == "/screenshot":
+            await self.screenshot_command(args)
+            return True
+            
         # Unknown command
         else:
             console.print(Panel(
                 f"[bold red]Unknown command:[/bold red] {command}\nType /help to see available commands.",
                 title="[bold]Command Error[/bold]",
-                border_style="red",
-                box=box.ROUNDED
+                **_PANEL_RED
             ))
             return True
         
@@ -351,8 +861,7 @@ class AIAssistantApp:
                     "• After text extraction, you can choose to analyze the text with AI\n"
                     "• You can save extracted text to a file",
                     title="[bold]OCR Command Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "document":
@@ -367,8 +876,7 @@ class AIAssistantApp:
                     "• [bold]/document generate[/bold cyan] - Starts the document generation wizard\n"
                     "• [bold]/document analyze data.csv[/bold cyan] - Analyzes the CSV file",
                     title="[bold]Document Commands Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "web":
@@ -383,8 +891,7 @@ class AIAssistantApp:
                     "[bold cyan]Options:[/bold cyan]\n"
                     "• After fetching web content, you can choose to analyze it with AI",
                     title="[bold]Web Command Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "email":
@@ -401,8 +908,7 @@ class AIAssistantApp:
                     "• [bold]/email read[/bold cyan] - View your recent emails\n"
                     "• [bold]/email setup[/bold cyan] - Configure your email account",
                     title="[bold]Email Command Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "github":
@@ -419,8 +925,7 @@ class AIAssistantApp:
                     "• [bold]/github issues username/repo[/bold cyan] - Lists issues in that repo\n"
                     "• [bold]/github create[/bold cyan] - Start the creation wizard",
                     title="[bold]GitHub Command Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "config":
@@ -435,8 +940,7 @@ class AIAssistantApp:
                     "• [bold]/config role[/bold cyan] - Set a new role for the assistant\n"
                     "• [bold]/config show[/bold cyan] - Display current settings",
                     title="[bold]Configuration Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "voice":
@@ -451,8 +955,7 @@ class AIAssistantApp:
                     "• \"Take a screenshot and extract text\"\n"
                     "• \"Stop listening\" (to exit voice mode)",
                     title="[bold]Voice Command Help[/bold]",
-                    border_style="blue", 
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "whatsapp":
@@ -480,8 +983,7 @@ class AIAssistantApp:
                     "• Creative Writer - Engaging and imaginative\n"
                     "And many more. Use them to tailor your message style to the recipient and purpose.",
                     title="[bold]WhatsApp Command Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "stats":
@@ -492,8 +994,7 @@ class AIAssistantApp:
                     "[bold cyan]Options:[/bold cyan]\n"
                     "• [bold]/stats detailed[/bold] - Show detailed statistics by platform, version, etc.",
                     title="[bold]Stats Command Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             elif command == "excel":
@@ -513,8 +1014,7 @@ class AIAssistantApp:
                     "• [bold]/excel filter data where Revenue > 1000 from sales.xlsx[/bold]\n"
                     "• [bold]/excel extract top 10 rows from customer_data.xlsx[/bold]",
                     title="[bold]Excel Command Help[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED
+                    **_PANEL_GREEN
                 ))
                 
             elif command == "code-edit":
@@ -530,8 +1030,7 @@ class AIAssistantApp:
                     "• You can use natural language to describe changes\n"
                     "• You can specify specific instructions for the changes",
                     title="[bold]Code Edit Command Help[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
             else:
@@ -549,6 +1048,7 @@ class AIAssistantApp:
                 "• [bold]/github[/bold] - GitHub integration",
                 "• [bold]/whatsapp[/bold] - WhatsApp messaging",
                 "• [bold]/stats[/bold] - Show installation statistics",
+                "• [bold]/screenshot on|off[/bold] - Include screen context with questions",
                 "• [bold]/exit[/bold] - Exit the assistant"
             ]
             
@@ -558,23 +1058,35 @@ class AIAssistantApp:
                 f"[bold cyan]Available Commands:[/bold cyan]\n\n{commands_text}\n\n"
                 f"Type [bold]/help command[/bold] for detailed help on a specific command.",
                 title="[bold]QuackQuery Help[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
     
+    async def screenshot_command(self, args=None):
+        """
+        Turn screenshot context for questions on or off for this session.
+        
+        Args:
+            args: "on" or "off"; shows the current setting when omitted
+        """
+        mode = (args or "").strip().lower()
+        if mode == "on":
+            self._screenshot_mode = True
+            self.display_success("Screenshot context enabled. Your screen will be included with each question.")
+        elif mode == "off":
+            self._screenshot_mode = False
+            self.display_success("Screenshot context disabled.")
+        elif not mode:
+            state = "on" if self._screenshot_mode else "off"
+            self.display_info(f"Screenshot context is [bold]{state}[/bold]. Use [bold]/screenshot on|off[/bold] to change it.")
+        else:
+            self.display_error(f"Unknown option: {mode}", "Usage: /screenshot on|off")
+    
     async def stats_command(self, args=None):
         """Show statistics about the AI assistant."""
-        from rich.columns import Columns
-        from rich.console import Console
-        from rich.panel import Panel
-        
-        console = Console()
-        
         console.print(Panel(
             "[bold]AI Assistant Statistics[/bold]\n",
             title="[bold]Stats[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
+            **_PANEL_BLUE
         ))
 
         # Display stats here
@@ -584,7 +1096,7 @@ class AIAssistantApp:
                 if key == 'recent_commands':
                     continue
                 stats_panels.append(
-                    Panel(f"[bold cyan]{value}[/bold cyan]", title=f"[bold]{key.replace('_', ' ').title()}[/bold]", border_style="green")
+                    Panel(f"[bold cyan]{value}[/bold cyan]", title=f"[bold]{key.replace('_', ' ').title()}[/bold]", **_PANEL_GREEN)
                 )
             
             console.print(Columns(stats_panels))
@@ -593,14 +1105,6 @@ class AIAssistantApp:
 
     async def excel_command(self, user_input=None):
         """Handle Excel operations through natural language commands."""
-        from rich.panel import Panel
-        from rich.console import Console
-        from rich.table import Table
-        from rich.box import ROUNDED
-        from rich.prompt import Prompt, Confirm
-        
-        console = Console()
-        
         if not user_input:
             # Show Excel command help
             console.print(Panel(
@@ -613,15 +1117,10 @@ class AIAssistantApp:
                 "• [bold]/excel filter data where Revenue > 1000 from sales.xlsx[/bold]\n"
                 "• [bold]/excel extract top 10 rows from customer_data.xlsx[/bold]",
                 title="[bold]Excel Command Help[/bold]",
-                border_style="green",
-                box=ROUNDED
+                **_PANEL_GREEN
             ))
             return
 
-        # Import the Excel handler and NLP processor
-        from ai_assistant.utils.excel_handler import ExcelHandler
-        from ai_assistant.utils.excel_nlp import ExcelNLProcessor
-        
         # Initialize Excel handler and NLP processor
         excel_handler = ExcelHandler()
         excel_nlp = ExcelNLProcessor()
@@ -645,14 +1144,12 @@ class AIAssistantApp:
                 return
                 
             # Create table for display
-            table = Table(title="Excel Files", box=ROUNDED)
+            table = Table(title="Excel Files", box=_ROUNDED)
             table.add_column("File", style="cyan")
             table.add_column("Info")
             
-            for file in excel_files:
-                # Get file info
-                file_info = excel_handler.get_excel_info(file)
-                
+            # Get file info for all files at once; workbooks are opened concurrently
+            for file, file_info in zip(excel_files, excel_handler.get_many_excel_infos(excel_files)):
                 if "error" in file_info:
                     info_text = f"[red]Error: {file_info['error']}[/red]"
                 else:
@@ -764,7 +1261,7 @@ class AIAssistantApp:
             if Confirm.ask("[bold]Would you like to perform operations on this file?[/bold]", default=False):
                 operation_type = Prompt.ask(
                     "[bold]Select operation[/bold]",
-                    choices=["analyze", "filter", "chart", "save", "cancel"],
+                    choices=_SHEET_OP_CHOICES,
                     default="analyze"
                 )
                 
@@ -778,7 +1275,7 @@ class AIAssistantApp:
                     # Display available columns
                     df = excel_handler.read_excel_file(file_name, sheet_name)
                     if df is not None:
-                        column_table = Table(box=ROUNDED)
+                        column_table = Table(box=_ROUNDED)
                         column_table.add_column("#", style="cyan")
                         column_table.add_column("Column Name")
                         column_table.add_column("Data Type")
@@ -787,12 +1284,13 @@ class AIAssistantApp:
                             data_type = str(df[column].dtype)
                             column_table.add_row(str(i), column, data_type)
                             
-                        console.print(Panel(column_table, title="[bold]Available Columns[/bold]", border_style="blue"))
+                        console.print(Panel(column_table, title="[bold]Available Columns[/bold]", **_PANEL_BLUE))
+                        column_choices = [str(i) for i in range(1, len(df.columns) + 1)]
                         
                         # Get x column
                         x_col_idx = Prompt.ask(
                             "[bold]Select column for X-axis (enter number)[/bold]",
-                            choices=[str(i) for i in range(1, len(df.columns) + 1)],
+                            choices=column_choices,
                             default="1"
                         )
                         x_column = df.columns[int(x_col_idx) - 1]
@@ -800,7 +1298,7 @@ class AIAssistantApp:
                         # Get y column
                         y_col_idx = Prompt.ask(
                             "[bold]Select column for Y-axis (enter number)[/bold]",
-                            choices=[str(i) for i in range(1, len(df.columns) + 1)],
+                            choices=column_choices,
                             default="2"
                         )
                         y_column = df.columns[int(y_col_idx) - 1]
@@ -808,7 +1306,7 @@ class AIAssistantApp:
                         # Get chart type
                         chart_type = Prompt.ask(
                             "[bold]Select chart type[/bold]",
-                            choices=["bar", "line", "scatter", "pie"],
+                            choices=_CHART_TYPE_CHOICES,
                             default="bar"
                         )
                         
@@ -834,7 +1332,6 @@ class AIAssistantApp:
                                 # Ask if user wants to view the chart
                                 if Confirm.ask("[bold]View the chart?[/bold]", default=True):
                                     try:
-                                        import os
                                         os.system(f"start {chart_path}")
                                     except Exception as e:
                                         console.print(f"[bold red]Error opening chart: {e}[/bold red]")
@@ -882,8 +1379,7 @@ class AIAssistantApp:
                 console.print(Panel(
                     f"[bold]Summary Statistics for {file_name}[/bold]\n\n{summary_df.to_string()}",
                     title="[bold]Data Analysis Results[/bold]",
-                    border_style="green",
-                    box=ROUNDED
+                    **_PANEL_GREEN
                 ))
                 
                 # Display null values
@@ -892,8 +1388,7 @@ class AIAssistantApp:
                     console.print(Panel(
                         f"[bold]Null Value Counts[/bold]\n\n{null_counts.to_string()}",
                         title="[bold]Missing Data[/bold]",
-                        border_style="yellow",
-                        box=ROUNDED
+                        **_PANEL_YELLOW
                     ))
                     
             elif analysis_type == "correlation":
@@ -902,15 +1397,14 @@ class AIAssistantApp:
                 console.print(Panel(
                     f"[bold]Correlation Matrix for {file_name}[/bold]\n\n{corr_df.to_string()}",
                     title="[bold]Correlation Analysis[/bold]",
-                    border_style="green",
-                    box=ROUNDED
+                    **_PANEL_GREEN
                 ))
                 
             elif analysis_type == "descriptive":
                 console.print(f"[bold cyan]Descriptive Statistics for {file_name}:[/bold cyan]\n")
                 
                 for column, stats in analysis["descriptive"].items():
-                    stat_table = Table(title=f"Column: {column}", box=ROUNDED)
+                    stat_table = Table(title=f"Column: {column}", box=_ROUNDED)
                     stat_table.add_column("Statistic", style="cyan")
                     stat_table.add_column("Value")
                     
@@ -949,7 +1443,7 @@ class AIAssistantApp:
             # If columns not specified, ask user to select
             if not x_column or not y_column:
                 # Display available columns
-                column_table = Table(box=ROUNDED)
+                column_table = Table(box=_ROUNDED)
                 column_table.add_column("#", style="cyan")
                 column_table.add_column("Column Name")
                 column_table.add_column("Data Type")
@@ -958,13 +1452,14 @@ class AIAssistantApp:
                     data_type = str(df[column].dtype)
                     column_table.add_row(str(i), column, data_type)
                     
-                console.print(Panel(column_table, title="[bold]Available Columns[/bold]", border_style="blue"))
+                console.print(Panel(column_table, title="[bold]Available Columns[/bold]", **_PANEL_BLUE))
+                column_choices = [str(i) for i in range(1, len(df.columns) + 1)]
                 
                 # Get x column if not specified
                 if not x_column:
                     x_col_idx = Prompt.ask(
                         "[bold]Select column for X-axis (enter number)[/bold]",
-                        choices=[str(i) for i in range(1, len(df.columns) + 1)],
+                        choices=column_choices,
                         default="1"
                     )
                     x_column = df.columns[int(x_col_idx) - 1]
@@ -973,7 +1468,7 @@ class AIAssistantApp:
                 if not y_column:
                     y_col_idx = Prompt.ask(
                         "[bold]Select column for Y-axis (enter number)[/bold]",
-                        choices=[str(i) for i in range(1, len(df.columns) + 1)],
+                        choices=column_choices,
                         default="2"
                     )
                     y_column = df.columns[int(y_col_idx) - 1]
@@ -1000,7 +1495,6 @@ class AIAssistantApp:
                     # Ask if user wants to view the chart
                     if Confirm.ask("[bold]View the chart?[/bold]", default=True):
                         try:
-                            import os
                             os.system(f"start {chart_path}")
                         except Exception as e:
                             console.print(f"[bold red]Error opening chart: {e}[/bold red]")
@@ -1183,7 +1677,7 @@ class AIAssistantApp:
             response = await self.assistant.answer_async(prompt)
             
             # Display response
-            console.print(Panel(response, title="[bold]Excel Assistant Response[/bold]", border_style="green"))
+            console.print(Panel(response, title="[bold]Excel Assistant Response[/bold]", **_PANEL_GREEN))
             
         else:
             console.print(f"[bold red]Error: Unknown or unsupported Excel operation '{operation['operation']}'[/bold red]")
@@ -1191,12 +1685,6 @@ class AIAssistantApp:
 
     async def code_edit_command(self, args=None):
         """Handle code edit command using OpenAI or Google AI."""
-        from rich.prompt import Prompt
-        from rich.console import Console
-        from rich.panel import Panel
-        
-        console = Console()
-        
         if not args:
             console.print(Panel(
                 "The code-edit command allows you to edit code files using natural language.\n\n"
@@ -1210,8 +1698,7 @@ class AIAssistantApp:
                 "• You can use natural language to describe changes\n"
                 "• You can specify specific instructions for the changes",
                 title="[bold]Code Edit Command Help[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             return
 
@@ -1270,21 +1757,11 @@ class AIAssistantApp:
             console.print(Panel(
                 f"[bold]Summarizing document:[/bold] {os.path.basename(file_path)}",
                 title="[bold]Document Operation[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
             # Extract text from the document
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Reading document...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Extracting text...", total=None)
-                
+            async with self._spin("Reading document...", bar=True):
                 try:
                     # Extract text based on file type
                     if file_ext == ".pdf":
@@ -1302,16 +1779,7 @@ class AIAssistantApp:
                     return
             
             # Generate a summary using AI
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Generating summary...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Analyzing content...", total=None)
-                
+            async with self._spin("Generating summary...", bar=True):
                 prompt = f"Please summarize the following document content:\n\n{text[:4000]}"
                 if len(text) > 4000:
                     prompt += "\n\n[Content truncated due to length...]"
@@ -1322,8 +1790,7 @@ class AIAssistantApp:
             console.print(Panel(
                 Markdown(summary),
                 title=f"[bold]Summary of {os.path.basename(file_path)}[/bold]",
-                border_style="green",
-                box=box.ROUNDED
+                **_PANEL_GREEN
             ))
             
         elif subcmd == "generate":
@@ -1332,14 +1799,13 @@ class AIAssistantApp:
                 "[bold]Document Generation Assistant[/bold]\n"
                 "I'll help you create a new document based on your specifications.",
                 title="[bold]Document Generator[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
             # Get document details
             doc_type = Prompt.ask(
                 "[bold]Document type[/bold]", 
-                choices=["report", "letter", "proposal", "article", "other"],
+                choices=_DOC_TYPE_CHOICES,
                 default="report"
             )
             
@@ -1350,21 +1816,12 @@ class AIAssistantApp:
             instructions = Prompt.ask("[bold]Additional instructions[/bold] (optional)")
             output_format = Prompt.ask(
                 "[bold]Output format[/bold]",
-                choices=["markdown", "text", "html"],
+                choices=_DOC_FORMAT_CHOICES,
                 default="markdown"
             )
             
             # Generate the document
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Generating document...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Creating content...", total=None)
-                
+            async with self._spin("Generating document...", bar=True):
                 prompt = f"Generate a {doc_type} about '{topic}'. "
                 prompt += f"Additional instructions: {instructions}" if instructions else ""
                 prompt += f" Please format the output in {output_format}."
@@ -1376,22 +1833,19 @@ class AIAssistantApp:
                 console.print(Panel(
                     Markdown(generated_content),
                     title=f"[bold]Generated {doc_type.title()}: {topic}[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED
+                    **_PANEL_GREEN
                 ))
             elif output_format == "html":
                 console.print(Panel(
                     Syntax(generated_content, "html", theme="monokai"),
                     title=f"[bold]Generated {doc_type.title()} (HTML): {topic}[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED
+                    **_PANEL_GREEN
                 ))
             else:
                 console.print(Panel(
                     generated_content,
                     title=f"[bold]Generated {doc_type.title()}: {topic}[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED
+                    **_PANEL_GREEN
                 ))
                 
             # Ask if user wants to save the document
@@ -1437,21 +1891,11 @@ class AIAssistantApp:
             console.print(Panel(
                 f"[bold]Analyzing document:[/bold] {os.path.basename(file_path)}",
                 title="[bold]Document Analysis[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
             # Extract content from the file
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Reading document...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Extracting content...", total=None)
-                
+            async with self._spin("Reading document...", bar=True):
                 try:
                     # Extract text based on file type (simplified implementation)
                     if file_ext in [".pdf", ".docx"]:
@@ -1466,16 +1910,7 @@ class AIAssistantApp:
                     return
             
             # Analyze the document
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Analyzing content...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Processing...", total=None)
-                
+            async with self._spin("Analyzing content...", bar=True):
                 prompt = f"Analyze the following document and provide a detailed analysis including main topics, key points, and insights:\n\n{content[:4000]}"
                 if len(content) > 4000:
                     prompt += "\n\n[Content truncated due to length...]"
@@ -1486,8 +1921,7 @@ class AIAssistantApp:
             console.print(Panel(
                 Markdown(analysis),
                 title=f"[bold]Analysis of {os.path.basename(file_path)}[/bold]",
-                border_style="green",
-                box=box.ROUNDED
+                **_PANEL_GREEN
             ))
             
         else:
@@ -1498,8 +1932,7 @@ class AIAssistantApp:
                 "• [bold cyan]generate[/bold cyan] - Create a new document using AI\n"
                 "• [bold cyan]analyze [file_path][/bold cyan] - Analyze the content of a document",
                 title="[bold]Document Commands Help[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
 
     async def github_command(self, args):
@@ -1528,8 +1961,7 @@ class AIAssistantApp:
                 f"[green]✓[/green] GitHub API is configured and ready to use.\n"
                 f"[dim]Token: ...{self.config['github']['token'][-4:]} (last 4 characters)[/dim]",
                 title="[bold]GitHub Integration[/bold]",
-                border_style="green",
-                box=box.ROUNDED
+                **_PANEL_GREEN
             ))
             
         elif subcmd == "repos":
@@ -1541,21 +1973,11 @@ class AIAssistantApp:
             console.print(Panel(
                 "[bold]Fetching your GitHub repositories...[/bold]",
                 title="[bold]GitHub Repositories[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
             # Fetch repositories
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Connecting to GitHub API...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Fetching repositories...", total=None)
-                
+            async with self._spin("Connecting to GitHub API...", bar=True):
                 # Placeholder for actual GitHub API call
                 repositories = [
                     {"name": "project-alpha", "description": "A cool project", "stars": 12, "forks": 5, "language": "Python"},
@@ -1564,21 +1986,19 @@ class AIAssistantApp:
                 ]
             
             # Display repositories in a table
-            repo_table = Table(title="Your GitHub Repositories", box=box.ROUNDED, border_style="blue")
+            repo_table = Table(title="Your GitHub Repositories", **_PANEL_BLUE)
             repo_table.add_column("Name", style="cyan")
             repo_table.add_column("Description")
             repo_table.add_column("Stars", justify="right", style="yellow")
             repo_table.add_column("Forks", justify="right", style="green")
             repo_table.add_column("Language", style="magenta")
             
-            for repo in repositories:
-                repo_table.add_row(
-                    repo["name"],
-                    repo["description"] or "",
-                    str(repo["stars"]),
-                    str(repo["forks"]),
-                    repo["language"] or "Unknown"
-                )
+            rows = [
+                (name, description or "", f"{stars}", f"{forks}", language or "Unknown")
+                for name, description, stars, forks, language in map(_REPO_COLS, repositories)
+            ]
+            for row in rows:
+                repo_table.add_row(*row)
                 
             console.print(repo_table)
             
@@ -1590,27 +2010,17 @@ class AIAssistantApp:
                 console.print(Panel(
                     f"[bold]Cloning repository:[/bold] {repo_name}\n"
                     f"[bold]Target directory:[/bold] {clone_dir}",
-                    title="[bold]Git Clone Operation[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    title=_TITLE_GIT_CLONE,
+                    **_PANEL_BLUE
                 ))
                 
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Cloning repository...[/bold blue]"),
-                    BarColumn(),
-                    TimeElapsedColumn(),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Cloning...", total=None)
-                    
-                    # Placeholder for actual git clone operation
-                    # This would use subprocess to run git commands
-                    import time
-                    time.sleep(2)  # Simulate cloning process
-            
-            self.display_success(f"Repository {repo_name} cloned successfully to {clone_dir}")
+                async with self._spin("Cloning repository...", bar=True) as update:
+                    error = await self._git_clone(repo_name, clone_dir, update)
+                
+                if error:
+                    self.display_error(f"Failed to clone {repo_name}", error)
+                else:
+                    self.display_success(f"Repository {repo_name} cloned successfully to {clone_dir}")
             
         elif subcmd == "issues":
             # List GitHub issues
@@ -1624,22 +2034,12 @@ class AIAssistantApp:
                 
             console.print(Panel(
                 f"[bold]Fetching issues for:[/bold] {repo_name}",
-                title="[bold]GitHub Issues[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                title=_TITLE_GITHUB_ISSUES,
+                **_PANEL_BLUE
             ))
             
             # Fetch issues
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Connecting to GitHub API...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Fetching issues...", total=None)
-                
+            async with self._spin("Connecting to GitHub API...", bar=True):
                 # Placeholder for actual GitHub API call
                 issues = [
                     {"number": 42, "title": "Fix login bug", "state": "open", "created_at": "2023-01-15", "comments": 3},
@@ -1652,21 +2052,19 @@ class AIAssistantApp:
                 return
                 
             # Display issues in a table
-            issue_table = Table(title=f"Issues for {repo_name}", box=box.ROUNDED, border_style="blue")
+            issue_table = Table(title=f"Issues for {repo_name}", **_PANEL_BLUE)
             issue_table.add_column("#", style="cyan", justify="right")
             issue_table.add_column("Title")
             issue_table.add_column("State", style="bold")
             issue_table.add_column("Created", style="yellow")
             issue_table.add_column("Comments", justify="right")
             
-            for issue in issues:
-                issue_table.add_row(
-                    str(issue["number"]),
-                    issue["title"],
-                    f"[green]{issue['state']}[/green]" if issue["state"] == "open" else f"[red]{issue['state']}[/red]",
-                    issue["created_at"],
-                    str(issue["comments"])
-                )
+            rows = [
+                (f"{number}", title, _STATE_STYLES.get(state, state), created_at, f"{comments}")
+                for number, title, state, created_at, comments in map(_ISSUE_COLS, issues)
+            ]
+            for row in rows:
+                issue_table.add_row(*row)
                 
             console.print(issue_table)
             
@@ -1679,7 +2077,7 @@ class AIAssistantApp:
             # Determine what to create
             create_type = Prompt.ask(
                 "[bold]What would you like to create?[/bold]",
-                choices=["issue", "pr"],
+                choices=_GH_CREATE_CHOICES,
                 default="issue"
             )
             
@@ -1688,44 +2086,27 @@ class AIAssistantApp:
             if create_type == "issue":
                 console.print(Panel(
                     f"[bold]Creating new issue in:[/bold] {repo_name}",
-                    title="[bold]New GitHub Issue[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    title=_TITLE_NEW_ISSUE,
+                    **_PANEL_BLUE
                 ))
                 
                 title = Prompt.ask("[bold]Issue title[/bold]")
                 console.print("[bold]Issue description:[/bold] (Type your message, press Enter then Ctrl+D to finish)")
                 
-                # Collect body lines
-                body_lines = []
-                while True:
-                    try:
-                        line = input()
-                        body_lines.append(line)
-                    except EOFError:
-                        break
-                        
-                body = "\n".join(body_lines)
+                # Read the whole body up to Ctrl+D, draining pasted lines first
+                body = (await self._in_io(_read_stdin_body)).rstrip('\n')
                 
                 # Preview the issue
                 console.print(Panel(
                     f"[bold]Title:[/bold] {title}\n\n"
                     f"[bold]Description:[/bold]\n{body}",
-                    title="[bold]Issue Preview[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED
+                    title=_TITLE_ISSUE_PREVIEW,
+                    **_PANEL_GREEN
                 ))
                 
                 # Ask for confirmation
                 if Confirm.ask("Create this issue?", default=True):
-                    with Progress(
-                        SpinnerColumn(),
-                        TextColumn("[bold blue]Creating issue...[/bold blue]"),
-                        console=console,
-                        transient=True
-                    ) as progress:
-                        task = progress.add_task("[green]Connecting to GitHub API...", total=None)
-                        
+                    async with self._spin("Creating issue..."):
                         # Placeholder for actual GitHub API call
                         issue_number = 46  # This would be the actual issue number from the API response
                     
@@ -1737,8 +2118,7 @@ class AIAssistantApp:
                 console.print(Panel(
                     f"[bold]Creating new pull request in:[/bold] {repo_name}",
                     title="[bold]New GitHub Pull Request[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
                 base_branch = Prompt.ask("[bold]Base branch[/bold]", default="main")
@@ -1746,16 +2126,8 @@ class AIAssistantApp:
                 title = Prompt.ask("[bold]PR title[/bold]")
                 console.print("[bold]PR description:[/bold] (Type your message, press Enter then Ctrl+D to finish)")
                 
-                # Collect body lines
-                body_lines = []
-                while True:
-                    try:
-                        line = input()
-                        body_lines.append(line)
-                    except EOFError:
-                        break
-                        
-                body = "\n".join(body_lines)
+                # Read the whole body up to Ctrl+D, draining pasted lines first
+                body = (await self._in_io(_read_stdin_body)).rstrip('\n')
                 
                 # Preview the PR
                 console.print(Panel(
@@ -1763,20 +2135,12 @@ class AIAssistantApp:
                     f"[bold]Branches:[/bold] {head_branch} → {base_branch}\n\n"
                     f"[bold]Description:[/bold]\n{body}",
                     title="[bold]Pull Request Preview[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED
+                    **_PANEL_GREEN
                 ))
                 
                 # Ask for confirmation
                 if Confirm.ask("Create this pull request?", default=True):
-                    with Progress(
-                        SpinnerColumn(),
-                        TextColumn("[bold blue]Creating pull request...[/bold blue]"),
-                        console=console,
-                        transient=True
-                    ) as progress:
-                        task = progress.add_task("[green]Connecting to GitHub API...", total=None)
-                        
+                    async with self._spin("Creating pull request..."):
                         # Placeholder for actual GitHub API call
                         pr_number = 15  # This would be the actual PR number from the API response
                     
@@ -1794,8 +2158,7 @@ class AIAssistantApp:
                 "• [bold cyan]issues [owner/repo][/bold cyan] - List issues for a repository\n"
                 "• [bold cyan]create[/bold cyan] - Create a new issue or pull request",
                 title="[bold]GitHub Commands Help[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
     async def configure_github(self):
@@ -1805,8 +2168,7 @@ class AIAssistantApp:
             "This will set up your GitHub API token for integration with the assistant.\n"
             "[yellow]Note: Your token will be stored securely but not encrypted.[/yellow]",
             title="[bold]GitHub Setup[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
+            **_PANEL_BLUE
         ))
         
         console.print(Panel(
@@ -1818,8 +2180,7 @@ class AIAssistantApp:
             "5. Click 'Generate token'\n"
             "6. Copy the generated token\n",
             title="[bold]Token Instructions[/bold]",
-            border_style="yellow",
-            box=box.ROUNDED
+            **_PANEL_YELLOW
         ))
         
         # Get GitHub token
@@ -1833,14 +2194,7 @@ class AIAssistantApp:
             return
             
         # Test the token
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[bold blue]Testing GitHub token...[/bold blue]"),
-            console=console,
-            transient=True
-        ) as progress:
-            task = progress.add_task("[green]Connecting to GitHub API...", total=None)
-            
+        async with self._spin("Testing GitHub token..."):
             # Test connection to GitHub API
             test_result = True  # Placeholder for actual test
             
@@ -1856,412 +2210,144 @@ class AIAssistantApp:
         else:
             self.display_error("Failed to validate GitHub token. Please check your token and try again.")
             
-    async def handle_github_operation(self, intent):
+    def _parse_whatsapp_fallback(self, text):
         """
-        Handle GitHub operations based on detected intent.
+        Catch WhatsApp requests to a bare phone number that the WhatsApp parser missed.
         
         Args:
-            intent: Dictionary containing detected intent information
+            text (str): User input
+            
+        Returns:
+            dict: Synthesized ai_compose_whatsapp intent, or None
         """
-        if not self.config.get("github", {}).get("token"):
-            self.display_error("GitHub is not configured. Please run /github setup first.")
-            return
+        low = text.lower()
+        
+        # Skip the regex fallbacks entirely for prompts that can't be messages
+        if not any(k in low for k in _WHATSAPP_HINTS):
+            return None
+            
+        # If the shared text appears to be a WhatsApp-related request with a phone number
+        if ("message" in low or "whatsapp" in low) and _PHONE_RE.search(text):
+            logger.info("Detected potential WhatsApp message to phone number")
+            # Try to extract recipient (phone number) and use the full text as the instruction
+            # The captured group is bare digits (optionally +/=), so it needs no strip()
+            phone_match = _PHONE_TO_RE.search(text)
+            if phone_match:
+                recipient = phone_match.group(1)
+                logger.info("Creating manual WhatsApp intent for phone: %s", recipient)
+                return {
+                    'action': 'ai_compose_whatsapp',
+                    'recipient': recipient,
+                    'instruction': text
+                }
+                
+        # Direct pattern match for AI write message with phone number; the big alternation
+        # only runs when the text has one of its verbs and a message word
+        if not (("message" in low or "msg" in low) and any(v in low for v in _AI_COMPOSE_VERBS)):
+            return None
+        ai_whatsapp_phone_match = _AI_COMPOSE_RE.search(text)
+        if ai_whatsapp_phone_match:
+            logger.info("Direct pattern match for AI WhatsApp message to phone")
+            return {
+                'action': 'ai_compose_whatsapp',
+                'recipient': ai_whatsapp_phone_match.group(1),
+                'instruction': text
+            }
             
-        operation = intent.get("operation")
-        repo = intent.get("repository")
+        return None
+
+    async def _dispatch_intent(self, text):
+        """
+        Run the intent pipeline and hand the text to the first matching handler.
         
-        if not operation:
-            self.display_error("Unable to determine GitHub operation. Please try again with more details.")
-            return
+        Args:
+            text (str): User input
             
-        if operation == "list_repos":
-            console.print(Panel(
-                "[bold]Fetching your GitHub repositories...[/bold]",
-                title="[bold]GitHub Repositories[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
-            ))
+        Returns:
+            bool: True if an intent handler processed the text, False otherwise
+        """
+        for parse, handler in self._intent_pipeline:
+            intent = parse(text)
+            if intent:
+                result = await handler(intent, text)
+                self._format_and_display_response(result)
+                return True
+        return False
+
+    async def handle_text_input(self):
+        """Handle text input from the user."""
+        try:
+            # Get user input with Rich Prompt
+            text = Prompt.ask("\n[bold cyan]You[/bold cyan]")
             
-            # Fetch repositories
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Connecting to GitHub API...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Fetching repositories...", total=None)
+            # Skip empty input
+            if not text:
+                return
+
+            # Check for exit command
+            if text.lower() in _EXIT_COMMANDS:
+                console.print("[bold green]Goodbye![/bold green]")
+                raise KeyboardInterrupt()
                 
-                # Placeholder for actual GitHub API call
-                repositories = [
-                    {"name": "project-alpha", "description": "A cool project", "stars": 12, "forks": 5, "language": "Python"},
-                    {"name": "web-app", "description": "Web application template", "stars": 45, "forks": 20, "language": "JavaScript"},
-                    {"name": "data-tools", "description": "Tools for data analysis", "stars": 8, "forks": 2, "language": "Python"}
-                ]
-            
-            # Display repositories in a table
-            repo_table = Table(title="Your GitHub Repositories", box=box.ROUNDED, border_style="blue")
-            repo_table.add_column("Name", style="cyan")
-            repo_table.add_column("Description")
-            repo_table.add_column("Stars", justify="right", style="yellow")
-            repo_table.add_column("Forks", justify="right", style="green")
-            repo_table.add_column("Language", style="magenta")
-            
-            for repo in repositories:
-                repo_table.add_row(
-                    repo["name"],
-                    repo["description"] or "",
-                    str(repo["stars"]),
-                    str(repo["forks"]),
-                    repo["language"] or "Unknown"
-                )
+            # Process special commands
+            if text.startswith("/"):
+                if await self.process_command(text):
+                    return
+                    
+            # Start the screen capture now so it overlaps with intent parsing
+            cap_task = asyncio.create_task(self._in_io(self.desktop_screenshot.capture)) if self._screenshot_mode else None
                 
-            console.print(repo_table)
+            try:
+                # Hand off to the first intent handler that recognises the text
+                if await self._dispatch_intent(text):
+                    return
+                    
+                try:
+                    async with self._spin("Processing..."):
+                        screenshot_encoded = await cap_task if cap_task else None
+                    
+                    # Stream the answer so it starts rendering with the first chunk
+                    return await self._stream_and_display_response(text, screenshot_encoded)
+                    
+                except Exception as e:
+                    logger.error(f"Question processing error: {e}")
+                    console.print(f"\n[bold red]❌ Error processing question: {e}[/bold red]")
+                    return
+            finally:
+                # Never leave the capture pending, whichever way we leave (no-op once it finished)
+                if cap_task:
+                    cap_task.cancel()
+
+        except Exception as e:
+            console.print(f"\n[bold red]❌ Error processing input: {str(e)}[/bold red]")
+            logger.exception("Error processing input:")
+
+    async def ocr_command(self, args):
+        """
+        Handle OCR command for extracting text from images.
+        
+        Args:
+            args: Command arguments
+        """
+        if not args:
+            self.display_error("Please specify an image path or 'screen' to capture the current screen")
+            console.print("[dim]Example: /ocr path/to/image.jpg[/dim]")
+            console.print("[dim]Example: /ocr screen[/dim]")
+            return
             
-        elif operation == "list_issues" and repo:
+        # Check if the user wants to capture the screen
+        if args.lower() == "screen":
             console.print(Panel(
-                f"[bold]Fetching issues for:[/bold] {repo}",
-                title="[bold]GitHub Issues[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                "[bold]📸 Capturing your screen...[/bold]",
+                title=_TITLE_OCR,
+                **_PANEL_BLUE
             ))
             
-            # Fetch issues
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Connecting to GitHub API...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Fetching issues...", total=None)
-                
-                # Placeholder for actual GitHub API call
-                issues = [
-                    {"number": 42, "title": "Fix login bug", "state": "open", "created_at": "2023-01-15", "comments": 3},
-                    {"number": 36, "title": "Update documentation", "state": "closed", "created_at": "2023-01-10", "comments": 5},
-                    {"number": 45, "title": "Add new feature", "state": "open", "created_at": "2023-01-20", "comments": 2}
-                ]
-            
-            if not issues:
-                self.display_warning(f"No issues found for repository {repo}")
-                return
-                
-            # Display issues in a table
-            issue_table = Table(title=f"Issues for {repo}", box=box.ROUNDED, border_style="blue")
-            issue_table.add_column("#", style="cyan", justify="right")
-            issue_table.add_column("Title")
-            issue_table.add_column("State", style="bold")
-            issue_table.add_column("Created", style="yellow")
-            issue_table.add_column("Comments", justify="right")
-            
-            for issue in issues:
-                issue_table.add_row(
-                    str(issue["number"]),
-                    issue["title"],
-                    f"[green]{issue['state']}[/green]" if issue["state"] == "open" else f"[red]{issue['state']}[/red]",
-                    issue["created_at"],
-                    str(issue["comments"])
-                )
-                
-            console.print(issue_table)
-            
-        elif operation == "create_issue" and repo:
-            console.print(Panel(
-                f"[bold]Creating new issue in:[/bold] {repo}",
-                title="[bold]New GitHub Issue[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
-            ))
-            
-            title = Prompt.ask("[bold]Issue title[/bold]")
-            console.print("[bold]Issue description:[/bold] (Type your message, press Enter then Ctrl+D to finish)")
-            
-            # Collect body lines
-            body_lines = []
-            while True:
-                try:
-                    line = input()
-                    body_lines.append(line)
-                except EOFError:
-                    break
-                    
-            body = "\n".join(body_lines)
-            
-            # Preview the issue
-            console.print(Panel(
-                f"[bold]Title:[/bold] {title}\n\n"
-                f"[bold]Description:[/bold]\n{body}",
-                title="[bold]Issue Preview[/bold]",
-                border_style="green",
-                box=box.ROUNDED
-            ))
-            
-            # Ask for confirmation
-            if Confirm.ask("Create this issue?", default=True):
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Creating issue...[/bold blue]"),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Connecting to GitHub API...", total=None)
-                    
-                    # Placeholder for actual GitHub API call
-                    issue_number = 46  # This would be the actual issue number from the API response
-                
-                self.display_success(f"Issue #{issue_number} created successfully in {repo}")
-            else:
-                self.display_warning("Issue creation canceled")
-                
-        elif operation == "clone" and repo:
-            # Clone operation
-            clone_dir = intent.get("directory", ".")
-            
-            console.print(Panel(
-                f"[bold]Cloning repository:[/bold] {repo}\n"
-                f"[bold]Target directory:[/bold] {clone_dir}",
-                title="[bold]Git Clone Operation[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
-            ))
-            
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Cloning repository...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Cloning...", total=None)
-                
-                # Placeholder for actual git clone operation
-                # This would use subprocess to run git commands
-                import time
-                time.sleep(2)  # Simulate cloning process
-            
-            self.display_success(f"Repository {repo} cloned successfully to {clone_dir}")
-            
-        else:
-            self.display_error(f"Unsupported GitHub operation: {operation}")
-            
-    async def handle_text_input(self):
-        """Handle text input from the user."""
-        from ai_assistant.utils.github_intent import GitHubIntentParser
-        from ai_assistant.utils.file_intent import FileIntentParser
-        from ai_assistant.utils.app_intent import AppIntentParser
-        from ai_assistant.utils.email_intent import EmailIntentParser
-        from ai_assistant.utils.whatsapp_intent import WhatsAppIntentParser
-        
-        try:
-            # Get user input with Rich Prompt
-            text = Prompt.ask("\n[bold cyan]You[/bold cyan]")
-            
-            # Skip empty input
-            if not text:
-                return
-
-            # Check for exit command
-            if text.lower() in ["exit", "quit", "/exit", "/quit"]:
-                console.print("[bold green]Goodbye![/bold green]")
-                raise KeyboardInterrupt()
-                
-            # Process special commands
-            if text.startswith("/"):
-                if await self.process_command(text):
-                    return
-                    
-            # Initialize intent parsers if not already done
-            github_intent_parser = GitHubIntentParser()
-            file_intent_parser = FileIntentParser()
-            app_intent_parser = AppIntentParser()
-            email_intent_parser = EmailIntentParser()
-            whatsapp_intent_parser = WhatsAppIntentParser()
-            
-            # Check for GitHub operations
-            github_intent = github_intent_parser.parse_intent(text)
-            if github_intent:
-                result = await self.handle_github_operation(github_intent)
-                self._format_and_display_response(result)
-                return
-
-            # Check for WhatsApp operations
-            whatsapp_intent = whatsapp_intent_parser.parse_intent(text)
-            logger.info(f"WhatsApp intent detection result: {whatsapp_intent}")
-            
-            if whatsapp_intent:
-                result = await self.handle_whatsapp_operation(whatsapp_intent)
-                # Format the response to make it visible
-                self._format_and_display_response(result)
-                return
-                
-            # If the shared text appears to be a WhatsApp-related request with a phone number
-            if ("message" in text.lower() or "whatsapp" in text.lower()) and re.search(r'[+=]?\d{10,}', text):
-                logger.info("Detected potential WhatsApp message to phone number")
-                # Try to extract recipient (phone number) and message content
-                phone_match = re.search(r'(?:to\s+)?([+=]?\d{10,})', text)
-                if phone_match:
-                    recipient = phone_match.group(1)
-                    # Look for content after "about" or similar terms
-                    content_match = re.search(r'(?:about|regarding|on|for)\s+(.*?)(?:\.|$)', text, re.IGNORECASE)
-                    instruction = text  # Use full text as instruction if no specific content found
-                    
-                    logger.info(f"Creating manual WhatsApp intent for phone: {recipient}")
-                    # Create a WhatsApp intent
-                    whatsapp_intent = {
-                        'action': 'ai_compose_whatsapp',
-                        'recipient': recipient.strip(),
-                        'instruction': instruction
-                    }
-                    
-                    result = await self.handle_whatsapp_operation(whatsapp_intent)
-                    self._format_and_display_response(result)
-                    return
-                
-            # Direct pattern match for AI write message with phone number
-            ai_whatsapp_phone_match = re.search(r'(?:ai|assistant|help)\s+(?:write|compose|draft|create)\s+(?:a\s+)?(?:message|msg)(?:\s+to\s+|\s+for\s+)?([+=]?\d{10,})', text.lower())
-            if ai_whatsapp_phone_match:
-                logger.info("Direct pattern match for AI WhatsApp message to phone")
-                recipient = ai_whatsapp_phone_match.group(1)
-                
-                # Create a WhatsApp intent
-                whatsapp_intent = {
-                    'action': 'ai_compose_whatsapp',
-                    'recipient': recipient.strip(),
-                    'instruction': text
-                }
-                
-                result = await self.handle_whatsapp_operation(whatsapp_intent)
-                self._format_and_display_response(result)
-                return
-            
-            # Check for Email operations
-            email_intent = email_intent_parser.parse_intent(text)
-            if email_intent:
-                result = await self.handle_email_operation(email_intent, prompt=text)
-                self._format_and_display_response(result)
-                return
-                
-            # Check for File operations
-            file_intent = file_intent_parser.parse_intent(text)
-            if file_intent:
-                result = await self.handle_file_operation(file_intent)
-                self._format_and_display_response(result)
-                return
-                
-            # Check for App operations
-            app_intent = app_intent_parser.parse_intent(text)
-            if app_intent:
-                result = await self.handle_app_operation(app_intent)
-                self._format_and_display_response(result)
-                return
-                
-            # Process as a regular question with Rich UI feedback
-            include_screenshot = Confirm.ask("Include screenshot context?", default=False)
-            
-            # Use Rich progress bar instead of animated loading
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Processing...[/bold blue]"),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Thinking...", total=None)
-                
-                try:
-                    screenshot_encoded = self.desktop_screenshot.capture() if include_screenshot else None
-                    response = await self.assistant.answer_async(text, screenshot_encoded)
-                    
-                    # Display response with syntax highlighting for code blocks
-                    self._format_and_display_response(response)
-                    
-                    return response
-                    
-                except Exception as e:
-                    logger.error(f"Question processing error: {e}")
-                    console.print(f"\n[bold red]❌ Error processing question: {e}[/bold red]")
-                    return
-
-        except Exception as e:
-            console.print(f"\n[bold red]❌ Error processing input: {str(e)}[/bold red]")
-            logger.exception("Error processing input:")
-
-    def _format_and_display_response(self, response):
-        """Format and display AI response with Rich UI enhancements."""
-        # Check if response is None or empty
-        if not response:
-            logger.warning("Received empty response from assistant")
-            console.print("[yellow]No response received from assistant.[/yellow]")
-            return
-            
-        # Check for code blocks in the response
-        if "```" in response:
-            # Split the response by code blocks
-            parts = response.split("```")
-            
-            # Display each part with appropriate formatting
-            for i, part in enumerate(parts):
-                if i == 0:
-                    # First part is always text before the first code block
-                    if part.strip():
-                        console.print(Markdown(part.strip()))
-                elif i % 2 == 1:
-                    # Odd-indexed parts are code blocks
-                    # Extract language if specified (e.g., ```python)
-                    code_lines = part.strip().split('\n')
-                    if code_lines and not code_lines[0].isspace() and len(code_lines[0].strip()) > 0:
-                        lang = code_lines[0].strip().lower()
-                        code = '\n'.join(code_lines[1:])
-                    else:
-                        lang = "text"
-                        code = part.strip()
-                    
-                    # Display code with syntax highlighting
-                    console.print(Syntax(code, lang, theme="monokai", line_numbers=True, word_wrap=True))
-                else:
-                    # Even-indexed parts (except 0) are text between code blocks
-                    if part.strip():
-                        console.print(Markdown(part.strip()))
-        else:
-            # No code blocks, display as markdown
-            console.print(Markdown(response))
-
-    async def ocr_command(self, args):
-        """
-        Handle OCR command for extracting text from images.
-        
-        Args:
-            args: Command arguments
-        """
-        if not args:
-            self.display_error("Please specify an image path or 'screen' to capture the current screen")
-            console.print("[dim]Example: /ocr path/to/image.jpg[/dim]")
-            console.print("[dim]Example: /ocr screen[/dim]")
-            return
-            
-        # Check if the user wants to capture the screen
-        if args.lower() == "screen":
-            console.print(Panel(
-                "[bold]📸 Capturing your screen...[/bold]",
-                title="[bold]OCR Operation[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
-            ))
-            
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Capturing screen...[/bold blue]"),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Processing...", total=None)
-                # Capture the screen
-                screenshot_path = os.path.join(os.getcwd(), "screenshot.png")
-                self.desktop_screenshot.capture_to_file(screenshot_path)
-                image_path = screenshot_path
+            async with self._spin("Capturing screen..."):
+                # Capture the screen
+                screenshot_path = os.path.join(os.getcwd(), "screenshot.png")
+                await self._in_io(self.desktop_screenshot.capture_to_file, screenshot_path)
+                image_path = screenshot_path
                 
             self.display_success(f"Screen captured and saved to {screenshot_path}")
         else:
@@ -2271,17 +2357,18 @@ class AIAssistantApp:
                 self.display_error(f"Image file not found: {image_path}")
                 return
         
+        # Ask about AI analysis up front so it can run in the same pass as extraction
+        want_analysis = Confirm.ask("Would you like AI analysis of the extracted text?", default=True)
+        analysis = None
+        
         # Progress indicators for OCR processing
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[bold blue]Extracting text...[/bold blue]"),
-            BarColumn(),
-            TimeElapsedColumn(),
-            console=console,
-            transient=True
-        ) as progress:
-            task = progress.add_task("[green]Processing image...", total=None)
-            extracted_text = self.ocr_processor.extract_text(image_path)
+        async with self._spin("Extracting text...", bar=True):
+            extracted_text = await self._in_io(self.ocr_processor.extract_text, image_path)
+            
+            if extracted_text and want_analysis:
+                # Ask the AI to analyze the extracted text
+                analysis_prompt = f"OCR text follows — provide analysis with key insights:\n\n{extracted_text}"
+                analysis = await self.assistant.answer_async(analysis_prompt)
         
         if not extracted_text:
             self.display_warning("No text was extracted from the image")
@@ -2291,44 +2378,26 @@ class AIAssistantApp:
         console.print(Panel(
             f"[bold green]Extracted Text:[/bold green]\n\n{extracted_text}",
             title=f"[bold]OCR Results: {os.path.basename(image_path)}[/bold]",
-            border_style="green",
-            box=box.ROUNDED
+            **_PANEL_GREEN
         ))
         
         # Ask if user wants to save the extracted text
         if Confirm.ask("Would you like to save this text to a file?", default=False):
-            default_filename = f"{os.path.basename(image_path).split('.')[0]}.txt"
+            default_filename = f"{os.path.splitext(os.path.basename(image_path))[0]}.txt"
             file_path = Prompt.ask("Enter file path", default=default_filename)
             
             try:
-                with open(file_path, 'w') as f:
-                    f.write(extracted_text)
+                await self._in_io(_write_text, file_path, extracted_text)
                 self.display_success(f"Text saved to {file_path}")
             except Exception as e:
                 self.display_error(f"Error saving file: {str(e)}")
                 
-        # Ask if user wants AI analysis of the extracted text
-        if Confirm.ask("Would you like AI analysis of this text?", default=True):
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Analyzing text...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                analysis_task = progress.add_task("[green]Thinking...", total=None)
-                
-                # Ask the AI to analyze the extracted text
-                analysis_prompt = f"Analyze the following OCR extracted text and provide insights:\n\n{extracted_text}"
-                analysis = await self.assistant.answer_async(analysis_prompt)
-            
+        if analysis:
             # Display the analysis
             console.print(Panel(
                 Markdown(analysis),
-                title="[bold]AI Analysis[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                title=_TITLE_AI_ANALYSIS,
+                **_PANEL_BLUE
             ))
 
     async def web_command(self, args):
@@ -2351,75 +2420,48 @@ class AIAssistantApp:
             console.print(Panel(
                 f"[bold]🌐 Accessing URL:[/bold] {query}",
                 title="[bold]Web Operation[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Fetching content...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Loading...", total=None)
-                
-                try:
+            # Ask about AI analysis up front so it can run in the same pass as the fetch
+            want_analysis = Confirm.ask("Would you like AI analysis of this web content?", default=True)
+            
+            try:
+                async with self._spin("Fetching content...", bar=True):
                     # Implement a web fetcher or use an existing one
                     content = "Web content fetching would go here"
                     
-                    # Display a sample of the content
+                    analysis = None
+                    if want_analysis:
+                        analysis = await self.assistant.answer_async(f"Analyze this web content: {content[:2000]}")
+                
+                # Display a sample of the content
+                console.print(Panel(
+                    f"[dim]{content[:500]}...[/dim]",
+                    title=f"[bold]Content from {query}[/bold]",
+                    **_PANEL_BLUE
+                ))
+                
+                if analysis:
+                    # Display the analysis
                     console.print(Panel(
-                        f"[dim]{content[:500]}...[/dim]",
-                        title=f"[bold]Content from {query}[/bold]",
-                        border_style="blue",
-                        box=box.ROUNDED
+                        Markdown(analysis),
+                        title=_TITLE_AI_ANALYSIS,
+                        **_PANEL_BLUE
                     ))
                     
-                    # Ask if the user wants AI to analyze the web content
-                    if Confirm.ask("Would you like AI analysis of this web content?", default=True):
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[bold blue]Analyzing content...[/bold blue]"),
-                            BarColumn(),
-                            TimeElapsedColumn(),
-                            console=console,
-                            transient=True
-                        ) as progress:
-                            analysis_task = progress.add_task("[green]Thinking...", total=None)
-                            analysis = await self.assistant.answer_async(f"Analyze this web content: {content[:2000]}")
-                        
-                        # Display the analysis
-                        console.print(Panel(
-                            Markdown(analysis),
-                            title="[bold]AI Analysis[/bold]",
-                            border_style="blue",
-                            box=box.ROUNDED
-                        ))
-                    
-                except Exception as e:
-                    self.display_error(f"Error fetching web content: {str(e)}")
+            except Exception as e:
+                self.display_error(f"Error fetching web content: {str(e)}")
             
         else:
             # It's a search query
             console.print(Panel(
                 f"[bold]🔍 Searching for:[/bold] {query}",
                 title="[bold]Web Search[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Searching...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Fetching results...", total=None)
-                
+            async with self._spin("Searching...", bar=True):
                 try:
                     # Use the assistant to search for answers
                     response = await self.assistant.answer_async(f"Web search: {query}")
@@ -2516,18 +2558,16 @@ class AIAssistantApp:
             if not to_address:
                 console.print(Panel(
                     "To generate an email with AI assistance, we need a recipient email address.",
-                    title="[bold]AI Email Writer[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    title=_TITLE_AI_EMAIL,
+                    **_PANEL_BLUE
                 ))
                 to_address = Prompt.ask("[bold cyan]Recipient email address[/bold cyan]")
                 
             console.print(Panel(
                 f"[bold]AI Email Composition Assistant[/bold]\n"
                 f"Recipient: {to_address}",
-                title="[bold]AI Email Writer[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                title=_TITLE_AI_EMAIL,
+                **_PANEL_BLUE
             ))
             
             # Get email details
@@ -2541,23 +2581,13 @@ class AIAssistantApp:
                 "• Key points to include\n"
                 "• Any specific requirements",
                 title="[bold]Email Instructions[/bold]",
-                border_style="green",
-                box=box.ROUNDED
+                **_PANEL_GREEN
             ))
             
             instructions = Prompt.ask("[bold cyan]Instructions for AI[/bold cyan]")
             
             # Generate the email using AI
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Generating email...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Thinking...", total=None)
-                
+            async with self._spin("Generating email...", bar=True):
                 prompt = f"Write an email to {to_address} with the subject '{subject}'. {instructions}"
                 if prompt:
                     generated_email = await self.assistant.answer_async(prompt)
@@ -2568,88 +2598,76 @@ class AIAssistantApp:
                 # This is a simple implementation; might need better parsing
                 generated_body = generated_email
             
-            # Preview the email with improved formatting
+            # Preview the email with improved formatting, truncating very long bodies
+            preview_body = _preview_text(generated_body)
             console.print(Panel(
                 f"[bold]Subject:[/bold] {subject}\n\n"
-                f"[bold]Body:[/bold]\n{generated_body}",
+                f"[bold]Body:[/bold]\n{preview_body}",
                 title=f"[bold]Generated Email: {subject}[/bold]",
-                border_style="green",
-                box=box.ROUNDED,
+                **_PANEL_GREEN,
                 padding=(1, 2)
             ))
             
             # Ask for what to do with the generated email
             console.print("[bold cyan]What would you like to do with this email?[/bold cyan]")
-            choices = {
-                "1": "Send as is",
-                "2": "Edit before sending",
-                "3": "Regenerate with new instructions",
-                "4": "Save as draft (not implemented)",
-                "5": "Cancel"
-            }
-            
-            # Display options with styling
-            for key, value in choices.items():
-                console.print(f"[bold blue]{key}.[/bold blue] {value}")
+            console.print(_EMAIL_AI_MENU)
                 
-            choice = Prompt.ask("[bold]Select an option[/bold]", choices=list(choices.keys()), default="2")
+            choice = Prompt.ask("[bold]Select an option[/bold]", choices=_EMAIL_AI_KEYS, default="2")
             
             if choice == "1":  # Send as is
                 console.print(f"[bold cyan]Sending email to {to_address}...[/bold cyan]")
-                success = await asyncio.to_thread(self.email_manager.send_email, to_address, subject, generated_body)
+                success = await self._send_email(to_address, subject, generated_body)
                 
                 if success:
                     self.display_success("Email sent successfully!")
                 else:
                     self.display_error(f"Failed to send email: {success}")
             elif choice == "2":  # Edit before sending
-                # Create a temporary file for editing in Notepad
-                with tempfile.NamedTemporaryFile(mode='w+', suffix='.txt', delete=False) as temp_file:
-                    temp_file.write(generated_body)
-                    temp_path = temp_file.name
-                
-                self.display_info(f"Opening email in Notepad for editing. Save and close Notepad when done.")
-                
-                # Use the appropriate command based on OS
-                if os.name == 'nt':  # Windows
-                    subprocess.run(['notepad.exe', temp_path], check=True)
-                else:
-                    # Use default editor on Unix systems
-                    editor = os.environ.get('EDITOR', 'nano')
-                    subprocess.run([editor, temp_path], check=True)
-                
-                # Read the edited content back
+                # Create a private temporary file for editing in Notepad, removed as soon as it is read back
+                fd, temp_path = tempfile.mkstemp(suffix='.txt')
+                os.close(fd)
                 try:
-                    with open(temp_path, 'r', encoding='utf-8') as edited_file:
-                        edited_body = edited_file.read()
+                    await self._in_io(_write_text, temp_path, generated_body)
                     
-                    # Clean up the temporary file
-                    os.unlink(temp_path)
+                    self.display_info(f"Opening email in Notepad for editing. Save and close Notepad when done.")
                     
-                    # Preview the edited email
-                    console.print(Panel(
-                        f"[bold]Subject:[/bold] {subject}\n\n"
-                        f"[bold]Body:[/bold]\n{edited_body}",
-                        title=f"[bold]Edited Email: {subject}[/bold]",
-                        border_style="green",
-                        box=box.ROUNDED,
-                        padding=(1, 2)
-                    ))
+                    # Use Notepad on Windows, the default editor on Unix systems
+                    editor = 'notepad.exe' if os.name == 'nt' else os.environ.get('EDITOR', 'nano')
                     
-                    # Confirm sending
-                    if Confirm.ask("Send this edited email?"):
-                        console.print(f"[bold cyan]Sending email to {to_address}...[/bold cyan]")
-                        success = await asyncio.to_thread(self.email_manager.send_email, to_address, subject, edited_body)
-                        
-                        if success:
-                            self.display_success("Email sent successfully!")
-                        else:
-                            self.display_error(f"Failed to send email: {success}")
+                    # Wait for the editor without freezing the event loop
+                    proc = await asyncio.create_subprocess_exec(editor, temp_path)
+                    if await proc.wait() != 0:
+                        raise subprocess.CalledProcessError(proc.returncode, [editor, temp_path])
+                    
+                    # Read the edited content back
+                    try:
+                        edited_body = await self._in_io(_read_text, temp_path)
+                    except Exception as e:
+                        self.display_error(f"Error reading edited file: {str(e)}")
+                        return
+                finally:
+                    os.unlink(temp_path)
+                
+                # Preview the edited email
+                console.print(Panel(
+                    f"[bold]Subject:[/bold] {subject}\n\n"
+                    f"[bold]Body:[/bold]\n{_preview_text(edited_body)}",
+                    title=f"[bold]Edited Email: {subject}[/bold]",
+                    **_PANEL_GREEN,
+                    padding=(1, 2)
+                ))
+                
+                # Confirm sending
+                if Confirm.ask("Send this edited email?"):
+                    console.print(f"[bold cyan]Sending email to {to_address}...[/bold cyan]")
+                    success = await self._send_email(to_address, subject, edited_body)
+                    
+                    if success:
+                        self.display_success("Email sent successfully!")
                     else:
-                        self.display_warning("Email sending canceled")
-                except Exception as e:
-                    self.display_error(f"Error reading edited file: {str(e)}")
-                    os.unlink(temp_path)  # Clean up even on error
+                        self.display_error(f"Failed to send email: {success}")
+                else:
+                    self.display_warning("Email sending canceled")
                             
             elif choice == "3":  # Regenerate
                 console.print("[bold cyan]New instructions for regenerating the email:[/bold cyan]")
@@ -2666,21 +2684,29 @@ class AIAssistantApp:
             self.display_error(f"Error in AI email composition: {str(e)}")
             logger.exception("Error in email_ai_write:")
 
+    async def _send_email(self, to_address, subject, body):
+        """Send an email in a worker thread and drop the cached inbox listing."""
+        self._email_cache = None
+        return await self._in_io(self.email_manager.send_email, to_address, subject, body)
+
     async def read_emails(self):
         """
         Read and display emails from the inbox.
         """
         try:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Checking emails...[/bold blue]"),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Connecting to mail server...", total=None)
+            # Reuse an inbox listing fetched in the last few seconds instead of reconnecting
+            now = time.monotonic()
+            if self._email_cache is not None and now - self._email_cache_ts < _EMAIL_CACHE_TTL:
+                emails = self._email_cache
+            else:
+                async with self._spin("Checking emails..."):
+                    # Check emails using the email manager
+                    emails = await self._in_io(self.email_manager.check_emails, limit=10)
                 
-                # Check emails using the email manager
-                emails = self.email_manager.check_emails(limit=10)
+                # Only cache real results, not error strings
+                if not isinstance(emails, str):
+                    self._email_cache = emails
+                    self._email_cache_ts = now
                 
             # Handle error messages (string responses)
             if isinstance(emails, str):
@@ -2696,28 +2722,24 @@ class AIAssistantApp:
             console.print(Panel(
                 f"Found [bold cyan]{len(emails)}[/bold cyan] emails in your inbox",
                 title="[bold]Email Inbox[/bold]",
-                border_style="cyan",
-                box=box.ROUNDED
+                **_PANEL_CYAN
             ))
             
+            # Headers can be missing, so every cell is stringified
+            rows = [
+                (f"{i}", str(email_data['from'] or ""), str(email_data['subject'] or "(No Subject)"), str(email_data['date'] or ""))
+                for i, email_data in enumerate(emails, 1)
+            ]
+            
             # Create a table for the emails
-            table = Table(title="Recent Emails", box=box.ROUNDED, border_style="blue")
+            table = Table(title="Recent Emails", **_PANEL_BLUE)
             table.add_column("#", style="dim", width=4)
             table.add_column("From", style="bold", width=30, overflow="fold")
             table.add_column("Subject", style="italic green", width=40, overflow="fold")
             table.add_column("Date", style="blue", width=25)
             
-            for i, email_data in enumerate(emails, 1):
-                from_addr = email_data['from']
-                subject = email_data['subject'] or "(No Subject)"
-                date = email_data['date']
-                
-                table.add_row(
-                    str(i),
-                    from_addr,
-                    subject,
-                    date
-                )
+            for row in rows:
+                table.add_row(*row)
                 
             # Display the table
             console.print(table)
@@ -2750,8 +2772,7 @@ class AIAssistantApp:
                     f"[bold]Subject:[/bold] {selected_email['subject']}\n\n"
                     f"{selected_email['body']}",
                     title=f"[bold]Email #{email_num}[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED,
+                    **_PANEL_GREEN,
                     padding=(1, 2),
                     expand=False
                 ))
@@ -2762,9 +2783,7 @@ class AIAssistantApp:
                     reply_subject = f"Re: {selected_email['subject']}"
                     
                     # Extract the email address from the From field if needed
-                    import re
-                    email_pattern = r'[\w\.-]+@[\w\.-]+\.[A-Z|a-z]{2,}'
-                    email_matches = re.findall(email_pattern, reply_to)
+                    email_matches = _EMAIL_RE.findall(reply_to)
                     if email_matches:
                         reply_to = email_matches[0]
                     
@@ -2800,21 +2819,11 @@ class AIAssistantApp:
             console.print(Panel(
                 "[bold]Fetching your GitHub repositories...[/bold]",
                 title="[bold]GitHub Repositories[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
             
             # Fetch repositories
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Connecting to GitHub API...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Fetching repositories...", total=None)
-                
+            async with self._spin("Connecting to GitHub API...", bar=True):
                 # Placeholder for actual GitHub API call
                 repositories = [
                     {"name": "project-alpha", "description": "A cool project", "stars": 12, "forks": 5, "language": "Python"},
@@ -2823,43 +2832,31 @@ class AIAssistantApp:
                 ]
             
             # Display repositories in a table
-            repo_table = Table(title="Your GitHub Repositories", box=box.ROUNDED, border_style="blue")
+            repo_table = Table(title="Your GitHub Repositories", **_PANEL_BLUE)
             repo_table.add_column("Name", style="cyan")
             repo_table.add_column("Description")
             repo_table.add_column("Stars", justify="right", style="yellow")
             repo_table.add_column("Forks", justify="right", style="green")
             repo_table.add_column("Language", style="magenta")
             
-            for repo in repositories:
-                repo_table.add_row(
-                    repo["name"],
-                    repo["description"] or "",
-                    str(repo["stars"]),
-                    str(repo["forks"]),
-                    repo["language"] or "Unknown"
-                )
+            rows = [
+                (name, description or "", f"{stars}", f"{forks}", language or "Unknown")
+                for name, description, stars, forks, language in map(_REPO_COLS, repositories)
+            ]
+            for row in rows:
+                repo_table.add_row(*row)
                 
             console.print(repo_table)
             
         elif operation == "list_issues" and repo:
             console.print(Panel(
                 f"[bold]Fetching issues for:[/bold] {repo}",
-                title="[bold]GitHub Issues[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                title=_TITLE_GITHUB_ISSUES,
+                **_PANEL_BLUE
             ))
             
             # Fetch issues
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Connecting to GitHub API...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Fetching issues...", total=None)
-                
+            async with self._spin("Connecting to GitHub API...", bar=True):
                 # Placeholder for actual GitHub API call
                 issues = [
                     {"number": 42, "title": "Fix login bug", "state": "open", "created_at": "2023-01-15", "comments": 3},
@@ -2872,65 +2869,46 @@ class AIAssistantApp:
                 return
                 
             # Display issues in a table
-            issue_table = Table(title=f"Issues for {repo}", box=box.ROUNDED, border_style="blue")
+            issue_table = Table(title=f"Issues for {repo}", **_PANEL_BLUE)
             issue_table.add_column("#", style="cyan", justify="right")
             issue_table.add_column("Title")
             issue_table.add_column("State", style="bold")
             issue_table.add_column("Created", style="yellow")
             issue_table.add_column("Comments", justify="right")
             
-            for issue in issues:
-                issue_table.add_row(
-                    str(issue["number"]),
-                    issue["title"],
-                    f"[green]{issue['state']}[/green]" if issue["state"] == "open" else f"[red]{issue['state']}[/red]",
-                    issue["created_at"],
-                    str(issue["comments"])
-                )
+            rows = [
+                (f"{number}", title, _STATE_STYLES.get(state, state), created_at, f"{comments}")
+                for number, title, state, created_at, comments in map(_ISSUE_COLS, issues)
+            ]
+            for row in rows:
+                issue_table.add_row(*row)
                 
             console.print(issue_table)
             
         elif operation == "create_issue" and repo:
             console.print(Panel(
                 f"[bold]Creating new issue in:[/bold] {repo}",
-                title="[bold]New GitHub Issue[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                title=_TITLE_NEW_ISSUE,
+                **_PANEL_BLUE
             ))
             
             title = Prompt.ask("[bold]Issue title[/bold]")
             console.print("[bold]Issue description:[/bold] (Type your message, press Enter then Ctrl+D to finish)")
             
-            # Collect body lines
-            body_lines = []
-            while True:
-                try:
-                    line = input()
-                    body_lines.append(line)
-                except EOFError:
-                    break
-                    
-            body = "\n".join(body_lines)
+            # Read the whole body up to Ctrl+D, draining pasted lines first
+            body = (await self._in_io(_read_stdin_body)).rstrip('\n')
             
             # Preview the issue
             console.print(Panel(
                 f"[bold]Title:[/bold] {title}\n\n"
                 f"[bold]Description:[/bold]\n{body}",
-                title="[bold]Issue Preview[/bold]",
-                border_style="green",
-                box=box.ROUNDED
+                title=_TITLE_ISSUE_PREVIEW,
+                **_PANEL_GREEN
             ))
             
             # Ask for confirmation
             if Confirm.ask("Create this issue?", default=True):
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Creating issue...[/bold blue]"),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Connecting to GitHub API...", total=None)
-                    
+                async with self._spin("Creating issue..."):
                     # Placeholder for actual GitHub API call
                     issue_number = 46  # This would be the actual issue number from the API response
                 
@@ -2945,31 +2923,65 @@ class AIAssistantApp:
             console.print(Panel(
                 f"[bold]Cloning repository:[/bold] {repo}\n"
                 f"[bold]Target directory:[/bold] {clone_dir}",
-                title="[bold]Git Clone Operation[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                title=_TITLE_GIT_CLONE,
+                **_PANEL_BLUE
             ))
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Cloning repository...[/bold blue]"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Cloning...", total=None)
-                
-                # Placeholder for actual git clone operation
-                # This would use subprocess to run git commands
-                import time
-                time.sleep(2)  # Simulate cloning process
+            async with self._spin("Cloning repository...", bar=True) as update:
+                error = await self._git_clone(repo, clone_dir, update)
             
-            self.display_success(f"Repository {repo} cloned successfully to {clone_dir}")
+            if error:
+                self.display_error(f"Failed to clone {repo}", error)
+            else:
+                self.display_success(f"Repository {repo} cloned successfully to {clone_dir}")
             
         else:
             self.display_error(f"Unsupported GitHub operation: {operation}")
             
+    async def _git_clone(self, repo, clone_dir, update):
+        """
+        Clone a repository with `git clone`, feeding its transfer progress to a progress bar.
+        
+        Args:
+            repo (str): "owner/repo" on GitHub, or any URL git accepts
+            clone_dir (str): Directory to clone into (created if missing)
+            update (callable): Progress updater yielded by _spin
+            
+        Returns:
+            str: Error detail, or None on success
+        """
+        url = repo if ("://" in repo or repo.startswith("git@")) else f"https://github.com/{repo.strip('/')}.git"
+        try:
+            await self._in_io(os.makedirs, clone_dir, exist_ok=True)
+            proc = await asyncio.create_subprocess_exec(
+                "git", "clone", "--progress", url,
+                cwd=clone_dir,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError:
+            return "git is not installed or not on PATH"
+        except OSError as e:
+            return str(e)
+        
+        # git redraws its progress with \r; other lines (hints, errors) are kept for reporting
+        messages = []
+        pending = b""
+        while chunk := await proc.stderr.read(4096):
+            *lines, pending = re.split(rb'[\r\n]', pending + chunk)
+            for line in lines:
+                match = _GIT_RECEIVING_RE.search(line)
+                if match:
+                    update(total=100, completed=int(match.group(1)))
+                elif line.strip() and b"%" not in line:
+                    messages.append(line)
+        if pending.strip():
+            messages.append(pending)
+        
+        if await proc.wait() != 0:
+            return b"\n".join(messages[-3:]).decode(errors="replace") or "git clone failed"
+        return None
+
     async def handle_file_operation(self, intent):
         """
         Handle file operations.
@@ -2986,7 +2998,7 @@ class AIAssistantApp:
         # Extract the file path if present
         file_path = params.get("path", "")
         
-        if operation == "list":
+        if operation in ("list", "list_directory"):
             # List files in a directory
             directory = file_path or os.getcwd()
             
@@ -2994,17 +3006,15 @@ class AIAssistantApp:
                 console.print(Panel(
                     f"[bold]Listing files in:[/bold] {directory}",
                     title="[bold]File Operation[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    **_PANEL_BLUE
                 ))
                 
-                files = os.listdir(directory)
+                entries = await self._in_io(_list_entries, directory, params.get("recursive", False))
                 
                 # Create a table to display files
                 file_table = Table(
                     title=f"Contents of {os.path.basename(directory)}",
-                    box=box.ROUNDED,
-                    border_style="blue"
+                    **_PANEL_BLUE
                 )
                 
                 file_table.add_column("Name", style="cyan")
@@ -3012,29 +3022,19 @@ class AIAssistantApp:
                 file_table.add_column("Size", style="magenta")
                 file_table.add_column("Modified", style="yellow")
                 
-                for file in files:
-                    full_path = os.path.join(directory, file)
-                    file_stat = os.stat(full_path)
-                    
+                for name, is_dir, st in entries:
                     # Determine file type
-                    file_type = "Directory" if os.path.isdir(full_path) else "File"
+                    file_type = "Directory" if is_dir else "File"
                     
-                    # Format file size
-                    size_bytes = file_stat.st_size
-                    if size_bytes < 1024:
-                        size_str = f"{size_bytes} B"
-                    elif size_bytes < 1024 * 1024:
-                        size_str = f"{size_bytes / 1024:.1f} KB"
-                    else:
-                        size_str = f"{size_bytes / (1024 * 1024):.1f} MB"
+                    size_str = _humansize(st.st_size)
                     
                     # Format modification time
-                    mod_time = datetime.fromtimestamp(file_stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+                    mod_time = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
                     
-                    file_table.add_row(file, file_type, size_str, mod_time)
+                    file_table.add_row(name, file_type, size_str, mod_time)
                 
                 console.print(file_table)
-                return f"Listed {len(files)} files in {directory}"
+                return f"Listed {len(entries)} files in {directory}"
                 
             except PermissionError:
                 self.display_error(f"Permission denied for: {directory}")
@@ -3055,18 +3055,12 @@ class AIAssistantApp:
                 return "No file path specified"
                 
             try:
-                # Create directory if it doesn't exist
-                os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
-                
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Creating file...[/bold blue]"),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Writing file...", total=None)
-                    with open(file_path, 'w') as f:
-                        f.write(content)
+                async with self._spin("Creating file..."):
+                    # Create the parent directory only if it doesn't exist yet
+                    parent = os.path.dirname(file_path)
+                    if parent and not os.path.isdir(parent):
+                        await self._in_io(os.makedirs, os.path.abspath(parent), exist_ok=True)
+                    await self._in_io(_write_text, file_path, content)
                 
                 self.display_success(f"File created: {file_path}")
                 return f"Successfully created file: {file_path}"
@@ -3090,17 +3084,11 @@ class AIAssistantApp:
                     self.display_warning("File deletion canceled")
                     return "File deletion canceled"
                     
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Deleting file...[/bold blue]"),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Removing file...", total=None)
+                async with self._spin("Deleting file..."):
                     if os.path.isdir(file_path):
-                        shutil.rmtree(file_path)
+                        await self._in_io(shutil.rmtree, file_path)
                     else:
-                        os.remove(file_path)
+                        await self._in_io(os.remove, file_path)
                 
                 self.display_success(f"Successfully deleted: {file_path}")
                 return f"Successfully deleted: {file_path}"
@@ -3122,57 +3110,32 @@ class AIAssistantApp:
                 return "No file path specified"
                 
             try:
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Reading file...[/bold blue]"),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Loading content...", total=None)
-                    
-                    # Check file size
-                    file_size = os.path.getsize(file_path)
-                    if file_size > 10 * 1024 * 1024:  # 10MB limit
-                        self.display_warning(f"File is too large ({file_size / (1024 * 1024):.1f} MB). Only the first 100 lines will be displayed.")
-                        with open(file_path, 'r') as f:
-                            content = "".join(f.readlines()[:100])
-                            content += "\n... (file truncated) ..."
-                    else:
-                        with open(file_path, 'r') as f:
-                            content = f.read()
+                async with self._spin("Reading file..."):
+                    # Size check and read share one worker thread
+                    file_size, content = await self._in_io(_read_capped, file_path)
+                    if content is None:
+                        self.display_error(f"Unable to read file: {file_path}. This might be a binary file.")
+                        return f"Unable to read file: {file_path}. This might be a binary file."
+                    if file_size > _READ_LIMIT:
+                        self.display_warning(f"File is too large ({_humansize(file_size)}). Only the first 100 lines will be displayed.")
+                        content += "\n... (file truncated) ..."
                 
                 # Determine syntax highlighting based on file extension
                 file_ext = os.path.splitext(file_path)[1].lower()
-                lexer_name = {
-                    ".py": "python",
-                    ".js": "javascript",
-                    ".html": "html",
-                    ".css": "css",
-                    ".json": "json",
-                    ".md": "markdown",
-                    ".xml": "xml",
-                    ".java": "java",
-                    ".c": "c",
-                    ".cpp": "cpp",
-                    ".cs": "csharp",
-                    ".go": "go",
-                    ".rb": "ruby",
-                    ".php": "php",
-                    ".sh": "bash",
-                    ".bat": "batch",
-                    ".ps1": "powershell",
-                    ".sql": "sql",
-                    ".yaml": "yaml",
-                    ".yml": "yaml",
-                    ".txt": None
-                }.get(file_ext, None)
+                lexer_name = _LEXER_BY_EXT.get(file_ext)
+                
+                # Size the panel to the longest line; large files are assumed to fill the console
+                max_width = console.width - 10
+                if len(content) > console.width * 200:
+                    panel_width = max_width
+                else:
+                    panel_width = min(max(map(len, content.splitlines()), default=0) + 10, max_width)
                 
                 file_panel = Panel(
                     Syntax(content, lexer_name) if lexer_name else content,
                     title=f"[bold]{os.path.basename(file_path)}[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED,
-                    width=min(len(max(content.split('\n'), key=len)) + 10, console.width - 10)
+                    **_PANEL_BLUE,
+                    width=panel_width
                 )
                 
                 console.print(file_panel)
@@ -3184,9 +3147,6 @@ class AIAssistantApp:
             except FileNotFoundError:
                 self.display_error(f"File not found: {file_path}")
                 return f"File not found: {file_path}"
-            except UnicodeDecodeError:
-                self.display_error(f"Unable to read file: {file_path}. This might be a binary file.")
-                return f"Unable to read file: {file_path}. This might be a binary file."
             except Exception as e:
                 self.display_error(f"Error reading file: {str(e)}")
                 return f"Error reading file: {str(e)}"
@@ -3243,9 +3203,9 @@ class AIAssistantApp:
 
     async def configure(self):
         """Configure the AI Assistant settings."""
-        console.print(Panel("[bold cyan]⚙️ Configuration[/bold cyan]", box=box.ROUNDED, border_style="cyan"))
+        console.print(Panel("[bold cyan]⚙️ Configuration[/bold cyan]", **_PANEL_CYAN))
         
-        config_table = Table(show_header=False, box=box.SIMPLE)
+        config_table = Table(show_header=False, box=_SIMPLE)
         config_table.add_column("Option", style="cyan")
         config_table.add_column("Description")
         config_table.add_row("1", "Change AI model")
@@ -3259,11 +3219,10 @@ class AIAssistantApp:
         console.print(Panel(
             config_table,
             title="[bold]Settings Menu[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
+            **_PANEL_BLUE
         ))
         
-        choice = Prompt.ask("Enter your choice", choices=["1", "2", "3", "4", "5", "6", "7"], default="7")
+        choice = Prompt.ask("Enter your choice", choices=_CONFIG_MENU_CHOICES, default="7")
         
         if choice == "1":
             await self.change_model()
@@ -3281,7 +3240,7 @@ class AIAssistantApp:
 
     async def change_model(self):
         """Change the AI model."""
-        model_table = Table(box=box.ROUNDED)
+        model_table = Table(box=_ROUNDED)
         model_table.add_column("Option", style="cyan")
         model_table.add_column("Model")
         model_table.add_column("Description")
@@ -3292,11 +3251,10 @@ class AIAssistantApp:
         console.print(Panel(
             model_table,
             title="[bold]Available AI Models[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
+            **_PANEL_BLUE
         ))
         
-        model_choice = Prompt.ask("Enter your choice", choices=["1", "2"], default="1")
+        model_choice = Prompt.ask("Enter your choice", choices=_MODEL_MENU_CHOICES, default="1")
         model_map = {"1": "Gemini", "2": "OpenAI"}
         
         if model_choice in model_map:
@@ -3309,32 +3267,14 @@ class AIAssistantApp:
 
     async def change_role(self):
         """Change the assistant role."""
-        from ..core.prompts import ROLE_PROMPTS
-        
-        role_table = Table(box=box.ROUNDED)
-        role_table.add_column("Option", style="cyan")
-        role_table.add_column("Role")
-        role_table.add_column("Description")
+        console.print(_role_panel())
         
-        for i, (role, description) in enumerate(ROLE_PROMPTS.items(), 1):
-            # Extract a short description from the full prompt
-            short_desc = description.split("\n")[0] if "\n" in description else description[:50] + "..."
-            role_table.add_row(str(i), role, short_desc)
-        
-        console.print(Panel(
-            role_table,
-            title="[bold]Assistant Roles[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
-        ))
-        
-        role_choices = [str(i) for i in range(1, len(ROLE_PROMPTS) + 1)]
-        role_choice = Prompt.ask("Enter your choice", choices=role_choices, default="1")
+        role_choice = Prompt.ask("Enter your choice", choices=ROLE_CHOICES_STR, default="1")
         
         try:
             role_idx = int(role_choice) - 1
-            if 0 <= role_idx < len(ROLE_PROMPTS):
-                self.config["role"] = list(ROLE_PROMPTS.keys())[role_idx]
+            if 0 <= role_idx < len(ROLE_KEYS):
+                self.config["role"] = ROLE_KEYS[role_idx]
                 save_config(self.config)
                 self.initialize_assistant()
                 console.print(f"[green]✅ Role changed to {self.config['role']}[/green]")
@@ -3350,12 +3290,10 @@ class AIAssistantApp:
         console.print(Panel(
             f"The current AI model is [bold cyan]{model}[/bold cyan].\nPlease provide a new API key for this model.",
             title="[bold]API Key Update[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
+            **_PANEL_BLUE
         ))
         
         # Use getpass for API keys for security
-        import getpass
         new_key = getpass.getpass(f"Enter new {model} API Key: ")
         
         if new_key.strip():
@@ -3375,7 +3313,7 @@ class AIAssistantApp:
 
     async def configure_github(self):
         """Configure GitHub integration settings."""
-        github_table = Table(show_header=False, box=box.SIMPLE)
+        github_table = Table(show_header=False, box=_SIMPLE)
         github_table.add_column("Option", style="cyan")
         github_table.add_column("Description")
         github_table.add_row("1", "Set GitHub Access Token")
@@ -3386,65 +3324,37 @@ class AIAssistantApp:
         console.print(Panel(
             github_table,
             title="[bold]GitHub Integration Configuration[/bold]",
-            border_style="blue",
-            box=box.ROUNDED
+            **_PANEL_BLUE
         ))
         
-        choice = Prompt.ask("Enter your choice", choices=["1", "2", "3", "4"], default="4")
+        choice = Prompt.ask("Enter your choice", choices=_GH_MENU_CHOICES, default="4")
         
         if choice == "1":
             # Use getpass for secret tokens
-            import getpass
             token = getpass.getpass("\nEnter your GitHub Personal Access Token: ")
             
             if token:
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Authenticating with GitHub...[/bold blue]"),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Connecting...", total=None)
-                    
-                    # Simulate a bit of waiting time for the authentication process
-                    import time
-                    time.sleep(1)
-                    
+                async with self._spin("Authenticating with GitHub..."):
                     if self.github.authenticate(token):
                         # Save token to environment variable
                         os.environ["GITHUB_TOKEN"] = token
                         
                         # Optionally save to .env file for persistence
                         try:
-                            with open(".env", "a+") as env_file:
-                                env_file.seek(0)
-                                content = env_file.read()
-                                if "GITHUB_TOKEN" not in content:
-                                    env_file.write(f"\nGITHUB_TOKEN={token}\n")
-                                else:
-                                    # Replace existing token
-                                    lines = content.splitlines()
-                                    with open(".env", "w") as new_env_file:
-                                        for line in lines:
-                                            if line.startswith("GITHUB_TOKEN="):
-                                                new_env_file.write(f"GITHUB_TOKEN={token}\n")
-                                            else:
-                                                new_env_file.write(f"{line}\n")
+                            _rewrite_env(".env", lambda content: _set_env_token(content, token))
                         except Exception as e:
                             logger.error(f"Error saving GitHub token to .env file: {e}")
                         
                         console.print(Panel(
                             f"[green]✅ GitHub token set successfully![/green]\nAuthenticated as: [bold]{self.github.username}[/bold]",
                             title="[bold]GitHub Authentication[/bold]",
-                            border_style="green",
-                            box=box.ROUNDED
+                            **_PANEL_GREEN
                         ))
                     else:
                         console.print(Panel(
                             "[bold red]❌ GitHub authentication failed.[/bold red]\nPlease check your token and try again.",
                             title="[bold]GitHub Authentication[/bold]",
-                            border_style="red",
-                            box=box.ROUNDED
+                            **_PANEL_RED
                         ))
             else:
                 console.print("[bold orange]⚠️ No token provided. GitHub integration will not be available.[/bold orange]")
@@ -3454,15 +3364,14 @@ class AIAssistantApp:
                 console.print(Panel(
                     f"[green]✅ GitHub Status: Authenticated[/green]\nUsername: [bold]{self.github.username}[/bold]\nGitHub integration is active and ready to use.",
                     title="[bold]GitHub Status[/bold]",
-                    border_style="green",
-                    box=box.ROUNDED
+                    **_PANEL_GREEN
                 ))
             else:
                 console.print(Panel(
                     "[bold orange]⚠️ GitHub Status: Not authenticated[/bold orange]\nYou need to set a GitHub access token to use GitHub features.",
                     title="[bold]GitHub Status[/bold]",
                     border_style="orange",
-                    box=box.ROUNDED
+                    box=_ROUNDED
                 ))
             
         elif choice == "3":
@@ -3470,18 +3379,12 @@ class AIAssistantApp:
                 confirm = Confirm.ask("Are you sure you want to remove your GitHub token?", default=False)
                 
                 if confirm:
-                    del os.environ["GITHUB_TOKEN"]
+                    os.environ.pop("GITHUB_TOKEN", None)
                     
                     # Remove from .env file if it exists
                     try:
                         if os.path.exists(".env"):
-                            with open(".env", "r") as env_file:
-                                lines = env_file.readlines()
-                            
-                            with open(".env", "w") as env_file:
-                                for line in lines:
-                                    if not line.startswith("GITHUB_TOKEN="):
-                                        env_file.write(line)
+                            _rewrite_env(".env", _drop_env_token)
                     except Exception as e:
                         logger.error(f"Error removing GitHub token from .env file: {e}")
                     
@@ -3497,16 +3400,14 @@ class AIAssistantApp:
 
     async def configure_whatsapp(self):
         """Configure WhatsApp integration settings."""
-        from rich.prompt import Confirm
+        console.print(Panel("[bold cyan]⚙️ WhatsApp Configuration[/bold cyan]", **_PANEL_CYAN))
         
-        console.print(Panel("[bold cyan]⚙️ WhatsApp Configuration[/bold cyan]", box=box.ROUNDED, border_style="cyan"))
-        
-        # Check if WhatsApp is already configured
-        whatsapp_config = self.whatsapp_manager.config if self.whatsapp_manager else {}
+        # Check if WhatsApp is already configured (config is parsed once by WhatsAppManager.__init__)
+        whatsapp_config = self.whatsapp_manager.config or {}
         
         if whatsapp_config:
             # Show current configuration
-            config_table = Table(show_header=False, box=box.SIMPLE)
+            config_table = Table(show_header=False, box=_SIMPLE)
             config_table.add_column("Setting", style="cyan")
             config_table.add_column("Value")
             
@@ -3516,18 +3417,13 @@ class AIAssistantApp:
             console.print(Panel(
                 config_table,
                 title="[bold]Current WhatsApp Configuration[/bold]",
-                border_style="blue",
-                box=box.ROUNDED
+                **_PANEL_BLUE
             ))
         
         # Ask for configuration options
         auto_login = Confirm.ask("Automatically connect to WhatsApp at startup?", default=False)
         remember_session = Confirm.ask("Remember WhatsApp session (avoids scanning QR code every time)?", default=True)
         
-        # Initialize WhatsApp manager if not already done
-        if not self.whatsapp_manager:
-            self.whatsapp_manager = WhatsAppManager(self.config_path)
-        
         # Update configuration
         success = self.whatsapp_manager.configure(auto_login, remember_session)
         
@@ -3538,7 +3434,7 @@ class AIAssistantApp:
             if auto_login:
                 connect_now = Confirm.ask("Connect to WhatsApp now?", default=True)
                 if connect_now:
-                    await self.handle_whatsapp_operation({'action': 'connect_whatsapp'})
+                    await self.handle_whatsapp_operation(_WA_CONNECT_INTENT)
         else:
             self.display_error("Failed to update WhatsApp configuration")
             
@@ -3549,90 +3445,64 @@ class AIAssistantApp:
         Args:
             args: Command arguments
         """
-        # Import intent parser
-        from ai_assistant.utils.whatsapp_intent import WhatsAppIntentParser
-        from ..core.prompts import ROLE_PROMPTS
-        
-        # Initialize WhatsApp manager if not already done
-        if not self.whatsapp_manager:
-            self.whatsapp_manager = WhatsAppManager(self.config_path)
-            
-        # Parse the arguments correctly - args might be a string or a list
-        if isinstance(args, str):
-            # If args is a string, split it into a list
-            args_list = args.strip().split()
-        else:
-            # If args is already a list or None, use it as is
-            args_list = args or []
+        # Normalise args to a string - args might be a string or a list
+        args = args.strip() if isinstance(args, str) else " ".join(args or [])
         
-        # Get the subcommand (if provided)
-        subcommand = args_list[0].lower() if args_list else ""
+        # Get the subcommand (if provided); each branch splits only as far as it needs
+        head = args.split(None, 1)
+        subcommand = head[0].lower() if head else ""
         
         # Show help if no arguments
         if not subcommand:
             # Show help for WhatsApp commands
-            console.print(Panel(
-                "WhatsApp Commands:\n\n"
-                "• [bold cyan]setup[/bold cyan] - Configure WhatsApp integration\n"
-                "• [bold cyan]connect[/bold cyan] - Connect to WhatsApp Web\n"
-                "• [bold cyan]disconnect[/bold cyan] - Disconnect from WhatsApp Web\n"
-                "• [bold cyan]send[/bold cyan] - Send a WhatsApp message\n"
-                "• [bold cyan]ai[/bold cyan] - Use AI to compose a message\n"
-                "• [bold cyan]contacts[/bold cyan] - List recent contacts\n\n"
-                "[bold cyan]Role-based message composition:[/bold cyan]\n"
-                "• [bold cyan]ai <recipient> [role] [instructions][/bold cyan] - Generate a message using a specific AI role\n"
-                "• Example: [bold cyan]/whatsapp ai +1234567890 Business \"Schedule a meeting for tomorrow\"[/bold cyan]",
-                title="[bold]WhatsApp Help[/bold]",
-                border_style="cyan",
-                box=box.ROUNDED
-            ))
+            console.print(_WHATSAPP_HELP_PANEL)
+            return
+        
+        # Argument-free subcommands map straight to an operation
+        intent = _WHATSAPP_SIMPLE_INTENTS.get(subcommand)
+        if intent:
+            result = await self.handle_whatsapp_operation(intent)
+            self.display_info(result)
             return
         
-        # Process WhatsApp subcommands
+        # Process the remaining WhatsApp subcommands
         if subcommand == "setup":
             await self.configure_whatsapp()
-        elif subcommand == "connect":
-            result = await self.handle_whatsapp_operation({'action': 'connect_whatsapp'})
-            self.display_info(result)
-        elif subcommand == "disconnect":
-            result = await self.handle_whatsapp_operation({'action': 'disconnect_whatsapp'})
-            self.display_info(result)
-        elif subcommand == "contacts":
-            result = await self.handle_whatsapp_operation({'action': 'list_contacts'})
-            self.display_info(result)
         elif subcommand == "ai":
             # AI-assisted message composition
-            if len(args_list) >= 2:
-                recipient = args_list[1]
+            # ai <recipient> [role] [instructions]
+            parts = args.split(None, 3)
+            if len(parts) >= 2:
+                recipient = parts[1]
                 
                 # Check if the third argument is a valid role
                 role = None
                 instruction = ""
                 
-                if len(args_list) >= 3:
-                    potential_role = args_list[2]
+                if len(parts) >= 3:
+                    potential_role = parts[2]
                     
                     # Check if it's a valid role
-                    if potential_role in ROLE_PROMPTS:
+                    if potential_role in ROLE_KEY_SET:
                         role = potential_role
-                        # Join the rest of the arguments as the instruction
-                        if len(args_list) >= 4:
-                            instruction = " ".join(args_list[3:])
+                        # The rest of the arguments are the instruction
+                        if len(parts) == 4:
+                            instruction = parts[3]
                     else:
                         # No valid role, treat everything after recipient as instruction
-                        instruction = " ".join(args_list[2:])
+                        instruction = args.split(None, 2)[2]
                 
                 # Show available roles if no instruction is provided
                 if not instruction:
                     console.print("[bold cyan]Available Roles:[/bold cyan]")
-                    for role_name in ROLE_PROMPTS.keys():
+                    for role_name in ROLE_KEYS:
                         console.print(f"• [bold]{role_name}[/bold]")
                     
                     # Prompt for role if not provided
                     if not role:
                         use_role = Confirm.ask("[bold]Do you want to use a specific AI role?[/bold]", default=False)
                         if use_role:
-                            role_options = list(ROLE_PROMPTS.keys())
+                            role_options = ROLE_KEYS
                             role_choice = Prompt.ask("[bold]Choose a role[/bold]", choices=role_options, default="General")
                             role = role_choice
                     
@@ -3657,7 +3527,7 @@ class AIAssistantApp:
                 
                 # Show available roles
                 console.print("[bold cyan]Available Roles:[/bold cyan]")
-                for role_name in ROLE_PROMPTS.keys():
+                for role_name in ROLE_KEYS:
                     console.print(f"• [bold]{role_name}[/bold]")
                 
                 # Ask if user wants to use a specific role
@@ -3665,7 +3535,7 @@ class AIAssistantApp:
                 role = None
                 
                 if use_role:
-                    role_options = list(ROLE_PROMPTS.keys())
+                    role_options = ROLE_KEYS
                     role_choice = Prompt.ask("[bold]Choose a role[/bold]", choices=role_options, default="General")
                     role = role_choice
                 
@@ -3686,9 +3556,9 @@ class AIAssistantApp:
                 self.display_info(result)
         elif subcommand == "send":
             # Extract recipient and message if provided
-            if len(args_list) >= 3:
-                recipient = args_list[1]
-                message = " ".join(args_list[2:])
+            parts = args.split(None, 2)
+            if len(parts) == 3:
+                _, recipient, message = parts
                 result = await self.handle_whatsapp_operation({
                     'action': 'send_whatsapp',
                     'recipient': recipient,
@@ -3697,8 +3567,6 @@ class AIAssistantApp:
                 self.display_info(result)
             else:
                 # Interactive mode for sending a message
-                from rich.prompt import Prompt
-                
                 recipient = Prompt.ask("Enter recipient (phone number with country code or contact name)")
                 message = Prompt.ask("Enter message")
                 
@@ -3714,6 +3582,43 @@ class AIAssistantApp:
         else:
             self.display_error(f"Unknown WhatsApp command: {subcommand}")
             
+    def _pick_role(self):
+        """
+        Show the role table and ask which role to compose with.
+        
+        Returns:
+            str: The selected role name
+        """
+        console.print(_role_panel())
+        role_choice = Prompt.ask("[bold]Select a role for message composition[/bold]", choices=ROLE_CHOICES_STR, default="1")
+        selected_role = ROLE_KEYS[int(role_choice) - 1]
+        console.print(f"[green]Using {selected_role} role for message composition[/green]")
+        return selected_role
+
+    async def _generate_whatsapp_message(self, recipient, instruction, role, fresh=False):
+        """
+        Ask the AI for a WhatsApp message in the given role.
+        
+        Args:
+            recipient (str): Recipient of the message
+            instruction (str): What the message should be about
+            role (str): Role whose system prompt frames the request
+            fresh (bool): Bypass the composition cache and always ask the AI
+            
+        Returns:
+            str: The generated message, stripped of surrounding quotes
+        """
+        # Use Rich progress bar for AI processing
+        async with self._spin("AI is composing your message..."):
+            # Create a prompt for the AI that includes the role context
+            ai_prompt = _whatsapp_prompt(role, recipient, instruction)
+            
+            # Generate the message
+            generated_message = await self._compose(ai_prompt, fresh=fresh)
+        
+        # Clean up the generated message
+        return _unquote(generated_message)
+
     async def whatsapp_ai_compose(self, recipient, instruction=None):
         """
         Use AI to compose a WhatsApp message.
@@ -3726,146 +3631,75 @@ class AIAssistantApp:
             str: Result of the operation
         """
         try:
-            # Import role prompts
-            from ..core.prompts import ROLE_PROMPTS
-            
-            # Ensure WhatsApp is initialized
-            if not self.whatsapp_manager:
-                self.display_warning("WhatsApp integration is not configured. Setting it up now.")
-                await self.whatsapp_command('setup')
-            
             # Get instructions for the AI if not provided
             if not instruction:
                 purpose = Prompt.ask("[bold]What is the purpose of this message?[/bold]")
-                tone = Prompt.ask("[bold]What tone should the message have?[/bold]", choices=["friendly", "formal", "casual", "professional"], default="friendly")
-                length = Prompt.ask("[bold]How long should the message be?[/bold]", choices=["short", "medium", "long"], default="medium")
+                tone = Prompt.ask("[bold]What tone should the message have?[/bold]", choices=_WA_TONE_CHOICES, default="friendly")
+                length = Prompt.ask("[bold]How long should the message be?[/bold]", choices=_WA_LENGTH_CHOICES, default="medium")
                 instruction = f"Write a {tone} WhatsApp message to {recipient} about {purpose}. The message should be {length} in length."
             
             # Ask if the user wants to use a specific role for composing
             use_role = Confirm.ask("[bold]Do you want to use a specific AI role for composing this message?[/bold]", default=False)
+            selected_role = self._pick_role() if use_role else "General"
             
-            selected_role = "General"  # Default role
-            
-            if use_role:
-                # Display available roles
-                role_table = Table(box=box.ROUNDED)
-                role_table.add_column("Option", style="cyan")
-                role_table.add_column("Role")
-                role_table.add_column("Description")
+            # Generate, then loop on regenerate choices instead of re-entering this method
+            fresh = False
+            while True:
+                generated_message = await self._generate_whatsapp_message(recipient, instruction, selected_role, fresh=fresh)
+                # Regenerating must produce a new message, not the cached one
+                fresh = True
                 
-                for i, (role, description) in enumerate(ROLE_PROMPTS.items(), 1):
-                    # Truncate description if too long
-                    short_desc = description.split("\n")[0][:50] + "..." if len(description) > 50 else description
-                    role_table.add_row(str(i), role, short_desc)
-                    
+                # Preview the message with improved formatting
                 console.print(Panel(
-                    role_table,
-                    title="[bold]Assistant Roles[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
+                    f"[bold]Generated message (using {selected_role} role):[/bold]\n\n{generated_message}",
+                    title="[bold]AI-Generated WhatsApp Message[/bold]",
+                    **_PANEL_CYAN
                 ))
                 
-                # Let user select role
-                role_choices = [str(i) for i in range(1, len(ROLE_PROMPTS) + 1)]
-                role_choice = Prompt.ask("[bold]Select a role for message composition[/bold]", choices=role_choices, default="1")
-                
-                # Get the selected role
-                role_idx = int(role_choice) - 1
-                if 0 <= role_idx < len(ROLE_PROMPTS):
-                    selected_role = list(ROLE_PROMPTS.keys())[role_idx]
-                    console.print(f"[green]Using {selected_role} role for message composition[/green]")
-            
-            # Use Rich progress bar for AI processing
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]AI is composing your message...[/bold blue]"),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[green]Thinking...", total=None)
-                
-                # Get the prompt for the selected role
-                role_prompt = ROLE_PROMPTS.get(selected_role, ROLE_PROMPTS["General"])
-                
-                # Create a prompt for the AI that includes the role context
-                ai_prompt = f"{role_prompt}\n\nNow, compose a WhatsApp message to {recipient}. The message should be about: {instruction}"
-                ai_prompt += "\nThe message should be concise and appropriate for WhatsApp. Don't include any introduction or explanation, just the message content."
-                
-                # Generate the message
-                generated_message = await self.assistant.answer_async(ai_prompt)
-            
-            # Clean up the generated message
-            generated_message = generated_message.strip()
-            
-            # If message starts with a quote or similar, clean it up
-            if generated_message.startswith('"') and generated_message.endswith('"'):
-                generated_message = generated_message[1:-1]
-            
-            # Preview the message with improved formatting
-            console.print(Panel(
-                f"[bold]Generated message (using {selected_role} role):[/bold]\n\n{generated_message}",
-                title="[bold]AI-Generated WhatsApp Message[/bold]",
-                border_style="cyan",
-                box=box.ROUNDED
-            ))
-            
-            # Ask for what to do with the message
-            console.print("[bold cyan]What would you like to do with this message?[/bold cyan]")
-            choices = {
-                "1": "Send as is",
-                "2": "Edit before sending",
-                "3": "Regenerate with new instructions",
-                "4": "Regenerate with different role",
-                "5": "Save as draft (not implemented)",
-                "6": "Cancel"
-            }
-            
-            # Display options with styling
-            for key, value in choices.items():
-                console.print(f"[bold blue]{key}.[/bold blue] {value}")
-                
-            choice = Prompt.ask("[bold]Select an option[/bold]", choices=list(choices.keys()), default="2")
-            
-            if choice == "1":  # Send as is
-                console.print(f"[bold cyan]Sending message to {recipient}...[/bold cyan]")
-                success = await asyncio.to_thread(self.whatsapp_manager.send_message, recipient, generated_message)
-                
-                if success:
-                    self.display_success(f"Message sent to {recipient}")
-                    return f"Message sent to {recipient}"
-                else:
-                    self.display_error(f"Failed to send message to {recipient}")
-                    return f"Failed to send message to {recipient}"
+                # Ask for what to do with the message
+                console.print("[bold cyan]What would you like to do with this message?[/bold cyan]")
+                console.print(_WHATSAPP_AI_MENU)
                     
-            elif choice == "2":  # Edit before sending
-                edited_message = Prompt.ask("[bold]Edit the message[/bold]", default=generated_message)
-                console.print(f"[bold cyan]Sending edited message to {recipient}...[/bold cyan]")
-                success = await asyncio.to_thread(self.whatsapp_manager.send_message, recipient, edited_message)
+                choice = Prompt.ask("[bold]Select an option[/bold]", choices=_WHATSAPP_AI_KEYS, default="2")
                 
-                if success:
-                    self.display_success(f"Edited message sent to {recipient}")
-                    return f"Edited message sent to {recipient}"
-                else:
-                    self.display_error(f"Failed to send edited message to {recipient}")
-                    return f"Failed to send edited message to {recipient}"
-                
-            elif choice == "3":  # Regenerate with new instructions
-                console.print("[bold cyan]New instructions for regenerating the message:[/bold cyan]")
-                new_instructions = Prompt.ask("[bold]New instructions[/bold]")
-                return await self.whatsapp_ai_compose(recipient, new_instructions)
-                
-            elif choice == "4":  # Regenerate with different role
-                # Call the method again but force role selection
-                console.print("[bold cyan]Select a different role for message composition:[/bold cyan]")
-                return await self.whatsapp_ai_compose(recipient, instruction)
-                
-            elif choice == "5":  # Save as draft
-                self.display_warning("Draft saving is not implemented yet")
-                return "Draft saving is not implemented yet"
-                
-            elif choice == "6":  # Cancel
-                self.display_warning("Message sending canceled")
-                return "Message sending canceled"
+                if choice == "1":  # Send as is
+                    console.print(f"[bold cyan]Sending message to {recipient}...[/bold cyan]")
+                    success = await self._in_whatsapp(self.whatsapp_manager.send_message, recipient, generated_message)
+                    
+                    if success:
+                        self.display_success(f"Message sent to {recipient}")
+                        return f"Message sent to {recipient}"
+                    else:
+                        self.display_error(f"Failed to send message to {recipient}")
+                        return f"Failed to send message to {recipient}"
+                        
+                elif choice == "2":  # Edit before sending
+                    edited_message = Prompt.ask("[bold]Edit the message[/bold]", default=generated_message)
+                    console.print(f"[bold cyan]Sending edited message to {recipient}...[/bold cyan]")
+                    success = await self._in_whatsapp(self.whatsapp_manager.send_message, recipient, edited_message)
+                    
+                    if success:
+                        self.display_success(f"Edited message sent to {recipient}")
+                        return f"Edited message sent to {recipient}"
+                    else:
+                        self.display_error(f"Failed to send edited message to {recipient}")
+                        return f"Failed to send edited message to {recipient}"
+                    
+                elif choice == "3":  # Regenerate with new instructions
+                    console.print("[bold cyan]New instructions for regenerating the message:[/bold cyan]")
+                    instruction = Prompt.ask("[bold]New instructions[/bold]")
+                    
+                elif choice == "4":  # Regenerate with different role
+                    console.print("[bold cyan]Select a different role for message composition:[/bold cyan]")
+                    selected_role = self._pick_role()
+                    
+                elif choice == "5":  # Save as draft
+                    self.display_warning("Draft saving is not implemented yet")
+                    return "Draft saving is not implemented yet"
+                    
+                elif choice == "6":  # Cancel
+                    self.display_warning("Message sending canceled")
+                    return "Message sending canceled"
                 
         except Exception as e:
             logger.exception("Error in WhatsApp AI compose")
@@ -3882,181 +3716,164 @@ class AIAssistantApp:
         Returns:
             String describing the result
         """
-        # Initialize WhatsApp manager if not already done
-        if not self.whatsapp_manager:
-            self.whatsapp_manager = WhatsAppManager(self.config_path)
-        
         action = intent.get('action')
         
-        if action == 'setup_whatsapp':
-            await self.configure_whatsapp()
-            return "WhatsApp configuration completed"
+        handler = self._whatsapp_ops.get(action)
+        if handler:
+            return await handler(intent)
+        
+        self.display_error(f"Unknown WhatsApp action: {action}")
+        return f"Unknown WhatsApp action: {action}"
+
+    async def _wa_setup(self, intent):
+        """Run the interactive WhatsApp configuration."""
+        await self.configure_whatsapp()
+        return "WhatsApp configuration completed"
+
+    async def _wa_connect(self, intent):
+        """Connect to WhatsApp Web."""
+        console.print("[bold cyan]Connecting to WhatsApp Web...[/bold cyan]")
+        console.print("If prompted, scan the QR code with your phone to log in.")
+        
+        # Connect in a non-blocking way
+        success = await self._in_whatsapp(self.whatsapp_manager.connect)
+        
+        if success:
+            self.display_success("Connected to WhatsApp Web")
+            return "Connected to WhatsApp Web"
+        else:
+            self.display_error("Failed to connect to WhatsApp Web")
+            return "Failed to connect to WhatsApp Web"
+
+    async def _wa_disconnect(self, intent):
+        """Disconnect from WhatsApp Web."""
+        success = await self._in_whatsapp(self.whatsapp_manager.disconnect)
+        
+        if success:
+            self.display_success("Disconnected from WhatsApp Web")
+            return "Disconnected from WhatsApp Web"
+        else:
+            self.display_error("Failed to disconnect from WhatsApp Web")
+            return "Failed to disconnect from WhatsApp Web"
+
+    async def _wa_list_contacts(self, intent):
+        """Show a table of recent WhatsApp contacts."""
+        # Start fetching contacts and set up the table while the browser works
+        fetch = asyncio.create_task(self._in_whatsapp(self.whatsapp_manager.get_recent_contacts))
+        contact_table = Table(title="Recent WhatsApp Contacts")
+        contact_table.add_column("#", style="cyan")
+        contact_table.add_column("Contact Name")
+        contacts = await fetch
+        
+        if contacts:
+            for i, contact in enumerate(contacts, 1):
+                contact_table.add_row(str(i), contact)
             
-        elif action == 'connect_whatsapp':
-            console.print("[bold cyan]Connecting to WhatsApp Web...[/bold cyan]")
-            console.print("If prompted, scan the QR code with your phone to log in.")
+            console.print(contact_table)
+            return f"Found {len(contacts)} recent contacts"
+        else:
+            self.display_warning("No recent contacts found or not connected to WhatsApp Web")
+            return "No recent contacts found or not connected to WhatsApp Web"
+
+    async def _wa_send(self, intent):
+        """Send a WhatsApp message, generating it first when the intent carries an AI instruction."""
+        recipient = intent.get('recipient', '')
+        message = intent.get('message', '')
+        
+        # If we have an AI instruction, use the assistant to generate the message
+        if 'ai_instruction' in intent:
+            instruction = intent.get('ai_instruction', '')
+            tone = intent.get('tone', 'neutral')
             
-            # Connect in a non-blocking way
-            success = await asyncio.to_thread(self.whatsapp_manager.connect)
+            # Check if a specific role is requested
+            role = intent.get('role', 'General')
+            if role not in ROLE_KEY_SET:
+                role = 'General'
             
-            if success:
-                self.display_success("Connected to WhatsApp Web")
-                return "Connected to WhatsApp Web"
-            else:
-                self.display_error("Failed to connect to WhatsApp Web")
-                return "Failed to connect to WhatsApp Web"
-                
-        elif action == 'disconnect_whatsapp':
-            success = await asyncio.to_thread(self.whatsapp_manager.disconnect)
+            # Generate a message using the AI assistant with the selected role
+            ai_prompt = _whatsapp_prompt(role, recipient, instruction, tone)
             
-            if success:
-                self.display_success("Disconnected from WhatsApp Web")
-                return "Disconnected from WhatsApp Web"
-            else:
-                self.display_error("Failed to disconnect from WhatsApp Web")
-                return "Failed to disconnect from WhatsApp Web"
-                
-        elif action == 'list_contacts':
-            contacts = await asyncio.to_thread(self.whatsapp_manager.get_recent_contacts)
+            generated_message = await self._compose(ai_prompt)
             
-            if contacts:
-                contact_table = Table(title="Recent WhatsApp Contacts")
-                contact_table.add_column("#", style="cyan")
-                contact_table.add_column("Contact Name")
-                
-                for i, contact in enumerate(contacts, 1):
-                    contact_table.add_row(str(i), contact)
-                
-                console.print(contact_table)
-                return f"Found {len(contacts)} recent contacts"
-            else:
-                self.display_warning("No recent contacts found or not connected to WhatsApp Web")
-                return "No recent contacts found or not connected to WhatsApp Web"
-                
-        elif action == 'send_whatsapp':
-            recipient = intent.get('recipient', '')
-            message = intent.get('message', '')
+            # Use the generated message if it's not empty
+            if generated_message:
+                message = generated_message
+                console.print(Panel(
+                    f"[bold]Generated message (using {role} role):[/bold]\n\n{message}",
+                    title="[bold]AI-Generated Message[/bold]",
+                    **_PANEL_CYAN
+                ))
+        
+        if not recipient:
+            self.display_error("Recipient is required")
+            return "Recipient is required"
             
-            # If we have an AI instruction, use the assistant to generate the message
-            if 'ai_instruction' in intent:
-                instruction = intent.get('ai_instruction', '')
-                tone = intent.get('tone', 'neutral')
-                
-                # Import role prompts
-                from ..core.prompts import ROLE_PROMPTS
-                
-                # Check if a specific role is requested
-                role = intent.get('role', 'General')
-                if role not in ROLE_PROMPTS:
-                    role = 'General'
-                
-                # Get the role prompt
-                role_prompt = ROLE_PROMPTS.get(role, ROLE_PROMPTS['General'])
-                
-                # Generate a message using the AI assistant with the selected role
-                ai_prompt = f"{role_prompt}\n\nNow, compose a WhatsApp message to {recipient} with a {tone} tone. The message should be about: {instruction}"
-                ai_prompt += "\nThe message should be concise and appropriate for WhatsApp. Don't include any introduction or explanation, just the message content."
+        if not message:
+            self.display_error("Message is required")
+            return "Message is required"
+        
+        # Send the message
+        console.print(f"[bold cyan]Sending message to {recipient}...[/bold cyan]")
+        success = await self._in_whatsapp(self.whatsapp_manager.send_message, recipient, message)
+        
+        if success:
+            self.display_success(f"Message sent to {recipient}")
+            return f"Message sent to {recipient}"
+        else:
+            self.display_error(f"Failed to send message to {recipient}")
+            return f"Failed to send message to {recipient}"
+
+    async def _wa_ai_compose(self, intent):
+        """Compose a WhatsApp message with AI, directly in the requested role or via the full composer."""
+        recipient = intent.get('recipient', '')
+        instruction = intent.get('instruction', '')
+        role = intent.get('role', None)  # Check if a specific role is requested
+        
+        if not recipient:
+            self.display_error("Recipient is required")
+            return "Recipient is required"
+        
+        # If a role is specified in the intent, we'll set up a special handler
+        if role:
+            if role in ROLE_KEY_SET:
+                # Modify the instruction to include the role
+                console.print(f"[green]Using {role} role for message composition[/green]")
+                
+                # Use Rich progress bar for AI processing
+                async with self._spin(f"AI is composing your message using {role} role..."):
+                    # Create a prompt for the AI that includes the role context
+                    ai_prompt = _whatsapp_prompt(role, recipient, instruction)
+                    
+                    # Generate the message
+                    generated_message = await self._compose(ai_prompt)
                 
-                generated_message = await self.assistant.answer_async(ai_prompt)
+                # Clean up the generated message
+                generated_message = _unquote(generated_message)
                 
-                # Use the generated message if it's not empty
-                if generated_message:
-                    message = generated_message
-                    console.print(Panel(
-                        f"[bold]Generated message (using {role} role):[/bold]\n\n{message}",
-                        title="[bold]AI-Generated Message[/bold]",
-                        border_style="cyan",
-                        box=box.ROUNDED
-                    ))
-            
-            if not recipient:
-                self.display_error("Recipient is required")
-                return "Recipient is required"
+                # Preview the message with improved formatting
+                console.print(Panel(
+                    f"[bold]Generated message (using {role} role):[/bold]\n\n{generated_message}",
+                    title="[bold]AI-Generated WhatsApp Message[/bold]",
+                    **_PANEL_CYAN
+                ))
                 
-            if not message:
-                self.display_error("Message is required")
-                return "Message is required"
-            
-            # Send the message
-            console.print(f"[bold cyan]Sending message to {recipient}...[/bold cyan]")
-            success = await asyncio.to_thread(self.whatsapp_manager.send_message, recipient, message)
-            
-            if success:
-                self.display_success(f"Message sent to {recipient}")
-                return f"Message sent to {recipient}"
-            else:
-                self.display_error(f"Failed to send message to {recipient}")
-                return f"Failed to send message to {recipient}"
-                
-        elif action == 'ai_compose_whatsapp':
-            recipient = intent.get('recipient', '')
-            instruction = intent.get('instruction', '')
-            role = intent.get('role', None)  # Check if a specific role is requested
-            
-            if not recipient:
-                self.display_error("Recipient is required")
-                return "Recipient is required"
-            
-            # If a role is specified in the intent, we'll set up a special handler
-            if role:
-                from ..core.prompts import ROLE_PROMPTS
-                if role in ROLE_PROMPTS:
-                    # Modify the instruction to include the role
-                    console.print(f"[green]Using {role} role for message composition[/green]")
+                # Ask to send the message
+                if Confirm.ask("[bold]Send this message?[/bold]", default=True):
+                    console.print(f"[bold cyan]Sending message to {recipient}...[/bold cyan]")
+                    success = await self._in_whatsapp(self.whatsapp_manager.send_message, recipient, generated_message)
                     
-                    # We'll use the existing method but pre-select the role
-                    role_prompt = ROLE_PROMPTS.get(role, ROLE_PROMPTS["General"])
-                    
-                    # Use Rich progress bar for AI processing
-                    with Progress(
-                        SpinnerColumn(),
-                        TextColumn(f"[bold blue]AI is composing your message using {role} role...[/bold blue]"),
-                        console=console,
-                        transient=True
-                    ) as progress:
-                        task = progress.add_task("[green]Thinking...", total=None)
-                        
-                        # Create a prompt for the AI that includes the role context
-                        ai_prompt = f"{role_prompt}\n\nNow, compose a WhatsApp message to {recipient}. The message should be about: {instruction}"
-                        ai_prompt += "\nThe message should be concise and appropriate for WhatsApp. Don't include any introduction or explanation, just the message content."
-                        
-                        # Generate the message
-                        generated_message = await self.assistant.answer_async(ai_prompt)
-                    
-                    # Clean up the generated message
-                    generated_message = generated_message.strip()
-                    if generated_message.startswith('"') and generated_message.endswith('"'):
-                        generated_message = generated_message[1:-1]
-                    
-                    # Preview the message with improved formatting
-                    console.print(Panel(
-                        f"[bold]Generated message (using {role} role):[/bold]\n\n{generated_message}",
-                        title="[bold]AI-Generated WhatsApp Message[/bold]",
-                        border_style="cyan",
-                        box=box.ROUNDED
-                    ))
-                    
-                    # Ask to send the message
-                    if Confirm.ask("[bold]Send this message?[/bold]", default=True):
-                        console.print(f"[bold cyan]Sending message to {recipient}...[/bold cyan]")
-                        success = await asyncio.to_thread(self.whatsapp_manager.send_message, recipient, generated_message)
-                        
-                        if success:
-                            self.display_success(f"Message sent to {recipient}")
-                            return f"Message sent to {recipient}"
-                        else:
-                            self.display_error(f"Failed to send message to {recipient}")
-                            return f"Failed to send message to {recipient}"
+                    if success:
+                        self.display_success(f"Message sent to {recipient}")
+                        return f"Message sent to {recipient}"
                     else:
-                        # Use the standard composer for more options
-                        console.print("[cyan]Using the full message composer for more options...[/cyan]")
-            
-            # Use the dedicated AI compose function
-            return await self.whatsapp_ai_compose(recipient, instruction)
-            
-        else:
-            self.display_error(f"Unknown WhatsApp action: {action}")
-            return f"Unknown WhatsApp action: {action}"
+                        self.display_error(f"Failed to send message to {recipient}")
+                        return f"Failed to send message to {recipient}"
+                else:
+                    # Use the standard composer for more options
+                    console.print("[cyan]Using the full message composer for more options...[/cyan]")
+        
+        # Use the dedicated AI compose function
+        return await self.whatsapp_ai_compose(recipient, instruction)
 
     async def handle_email_operation(self, intent, prompt=None):
         """
@@ -4069,148 +3886,135 @@ class AIAssistantApp:
         Returns:
             str: Result message
         """
-        logger.info(f"Handling email operation: {intent}")
+        logger.info("Handling email operation: %s", intent)
         operation = intent.get('operation', '')
         
         try:
-            # Handle AI email composition
-            if operation == 'ai_compose_email':
-                to_address = intent.get('to_address')
-                await self.email_ai_write(to_address, prompt=prompt)
-                return "Email composition initiated"
-                
-            # Handle email reading
-            elif operation == 'read_email' or operation == 'list_emails':
-                email_id = intent.get('email_id')
-                if email_id:
-                    await self.email_command(f"read {email_id}")
-                else:
-                    await self.email_command("read")
-                return "Displaying emails"
-                
-            # Handle email sending
-            elif operation == 'send_email':
-                to_address = intent.get('to_address')
-                if not to_address:
-                    return "Please specify a recipient email address"
-                
-                subject = intent.get('subject', '')
-                content = intent.get('content', '')
-                await self.email_command(f"send {to_address} {subject} {content}")
-                return f"Email sent to {to_address}"
-                
-            # Handle email setup
-            elif operation == 'setup_email':
-                await self.email_command("setup")
-                return "Email setup initiated"
-                
-            # Handle email reply
-            elif operation == 'reply_to_email':
-                email_id = intent.get('email_id')
-                if not email_id:
-                    return "Please specify an email ID to reply to"
-                
-                await self.email_command(f"reply {email_id}")
-                return f"Replying to email #{email_id}"
-                
-            # Handle email forwarding
-            elif operation == 'forward_email':
-                email_id = intent.get('email_id')
-                to_address = intent.get('to_address')
-                if not email_id:
-                    return "Please specify an email ID to forward"
-                
-                command = f"forward {email_id}"
-                if to_address:
-                    command += f" {to_address}"
-                
-                await self.email_command(command)
-                return f"Forwarding email #{email_id}"
-                
-            # Handle email deletion
-            elif operation == 'delete_email':
-                email_id = intent.get('email_id')
-                if not email_id:
-                    return "Please specify an email ID to delete"
-                
-                await self.email_command(f"delete {email_id}")
-                return f"Deleted email #{email_id}"
-                
-            # Handle generic email operations
-            else:
-                await self.email_command("")
-                return "Email command executed"
+            # Unrecognized operations fall back to the generic email command
+            handler = self._email_ops.get(operation, self._email_generic)
+            try:
+                return await handler(intent, prompt)
+            finally:
+                # Delete, reply, forward, compose and setup can all change what the inbox shows
+                if operation not in _EMAIL_READ_OPS:
+                    self._email_cache = None
                 
         except Exception as e:
             logger.error(f"Error in handle_email_operation: {str(e)}")
             return f"Error processing email operation: {str(e)}"
+
+    async def _email_ai_compose(self, intent, prompt):
+        """Start AI email composition."""
+        to_address = intent.get('to_address')
+        await self.email_ai_write(to_address, prompt=prompt)
+        return "Email composition initiated"
+
+    async def _email_read(self, intent, prompt):
+        """Read one email, or list the inbox when no ID is given."""
+        email_id = intent.get('email_id')
+        if email_id:
+            await self.email_command(f"read {email_id}")
+        else:
+            await self.email_command("read")
+        return "Displaying emails"
+
+    async def _email_send(self, intent, prompt):
+        """Send an email to the address in the intent."""
+        to_address = intent.get('to_address')
+        if not to_address:
+            return "Please specify a recipient email address"
+        
+        subject = intent.get('subject', '')
+        content = intent.get('content', '')
+        await self.email_command(" ".join(filter(None, ("send", to_address, subject, content))))
+        return f"Email sent to {to_address}"
+
+    async def _email_setup(self, intent, prompt):
+        """Start the email setup flow."""
+        await self.email_command("setup")
+        return "Email setup initiated"
+
+    async def _email_reply(self, intent, prompt):
+        """Reply to the email with the given ID."""
+        email_id = intent.get('email_id')
+        if not email_id:
+            return "Please specify an email ID to reply to"
+        
+        await self.email_command(f"reply {email_id}")
+        return f"Replying to email #{email_id}"
+
+    async def _email_forward(self, intent, prompt):
+        """Forward the email with the given ID, optionally to a known address."""
+        email_id = intent.get('email_id')
+        to_address = intent.get('to_address')
+        if not email_id:
+            return "Please specify an email ID to forward"
+        
+        parts = ("forward", str(email_id)) + ((to_address,) if to_address else ())
+        await self.email_command(" ".join(parts))
+        return f"Forwarding email #{email_id}"
+
+    async def _email_delete(self, intent, prompt):
+        """Delete the email with the given ID."""
+        email_id = intent.get('email_id')
+        if not email_id:
+            return "Please specify an email ID to delete"
+        
+        await self.email_command(f"delete {email_id}")
+        return f"Deleted email #{email_id}"
+
+    async def _email_generic(self, intent, prompt):
+        """Fall back to the bare email command, which lists the available subcommands."""
+        await self.email_command("")
+        return "Email command executed"
             #Welcome message
     async def run(self):
         """Run the QuackQuery application."""
         console.clear()
-        console.print(Panel.fit(
-            "🦆 [bold cyan]QuackQuery AI Assistant[/bold cyan] [green]initialized for your service[/green]",
-            box=box.ROUNDED,
-            border_style="cyan",
-            title="Welcome",
-            subtitle="v5.0"
-        ))
+        console.print(_WELCOME_PANEL)
         
         # If WhatsApp auto-login is enabled, connect now that we have a running event loop
         if hasattr(self, 'whatsapp_auto_login') and self.whatsapp_auto_login:
             try:
-                await self.handle_whatsapp_operation({'action': 'connect_whatsapp'})
+                await self.handle_whatsapp_operation(_WA_CONNECT_INTENT)
             except Exception as e:
                 logger.error(f"Error during WhatsApp auto-login: {str(e)}")
                 self.display_warning("WhatsApp auto-connection failed. You can try connecting manually later.")
         
-        while True:
-            try:
-                # Display menu in a styled panel
-                menu_table = Table(show_header=False, box=box.SIMPLE)
-                menu_table.add_column("Option", style="cyan")
-                menu_table.add_column("Description")
-                menu_table.add_row("S", "Speak to the assistant")
-                menu_table.add_row("T", "Type a question")
-                menu_table.add_row("C", "Configure settings")
-                menu_table.add_row("Q", "Quit")
-                
-                console.print(Panel(
-                    menu_table,
-                    title="[bold]Main Menu[/bold]",
-                    border_style="blue",
-                    box=box.ROUNDED
-                ))
-                
-                # Use Rich prompt for input
-                user_input = Prompt.ask("\nEnter your choice", choices=["s", "t", "c", "q"], default="t").lower()
-                
-                if user_input == 's':
-                    await self.handle_speech_input()
-                    console.print("\n[green]✅ Ready for next command...[/green]")
-                elif user_input == 't':
-                    await self.handle_text_input()
-                    console.print("\n[green]✅ Ready for next command...[/green]")
-                elif user_input == 'c':
-                    await self.configure()
-                    console.print("\n[green]✅ Settings updated. Ready for next command...[/green]")
-                elif user_input == 'q':
-                    console.print("\n[yellow]Exiting assistant. Goodbye! 👋[/yellow]")
-                    break
-                else:
-                    console.print("\n[bold red]❌ Invalid input. Please choose S, T, C, or Q.[/bold red]")
-            except Exception as e:
-                logger.error(f"Error in main loop: {str(e)}")
-                self.display_error(f"An error occurred: {str(e)}")
+        try:
+            while True:
+                try:
+                    # Display menu in a styled panel
+                    console.print(_main_menu_panel())
+                    
+                    # Use Rich prompt for input
+                    user_input = Prompt.ask("\nEnter your choice", choices=_MAIN_MENU_CHOICES, default="t").lower()
+                    
+                    if user_input == 's':
+                        await self.handle_speech_input()
+                        console.print("\n[green]✅ Ready for next command...[/green]")
+                    elif user_input == 't':
+                        await self.handle_text_input()
+                        console.print("\n[green]✅ Ready for next command...[/green]")
+                    elif user_input == 'c':
+                        await self.configure()
+                        console.print("\n[green]✅ Settings updated. Ready for next command...[/green]")
+                    elif user_input == 'q':
+                        console.print("\n[yellow]Exiting assistant. Goodbye! 👋[/yellow]")
+                        break
+                    else:
+                        console.print("\n[bold red]❌ Invalid input. Please choose S, T, C, or Q.[/bold red]")
+                except Exception as e:
+                    logger.error(f"Error in main loop: {str(e)}")
+                    self.display_error(f"An error occurred: {str(e)}")
+        finally:
+            # Release the worker threads; a call that is still running is joined at interpreter exit
+            self._io_pool.shutdown(wait=False)
+            if self._wa_executor is not None:
+                self._wa_executor.shutdown(wait=False)
 
     async def handle_speech_input(self):
         """Handle speech input from the user."""
-        from ai_assistant.utils.github_intent import GitHubIntentParser
-        from ai_assistant.utils.file_intent import FileIntentParser
-        from ai_assistant.utils.app_intent import AppIntentParser
-        from ai_assistant.utils.email_intent import EmailIntentParser
-        from ai_assistant.utils.whatsapp_intent import WhatsAppIntentParser
-        
         if not self.speech_recognizer:
             self.display_error("Speech recognition component not initialized.")
             self.display_info("You might need to configure speech services using '/configure speech' or ensure necessary libraries are installed.")
@@ -4219,16 +4023,17 @@ class AIAssistantApp:
         console.print("\n🎙️  Listening for your command (say 'stop listening' to cancel)...")
         try:
             # Use the existing listen_and_recognize method
-            recognized_text = await asyncio.to_thread(self.speech_recognizer.listen_and_recognize)
+            recognized_text = await self._in_io(self.speech_recognizer.listen_and_recognize)
             
             if recognized_text:
                 console.print(f"[dim]Heard:[/dim] [italic]'{recognized_text}'[/italic]")
-                if recognized_text.lower() == "stop listening":
+                low = recognized_text.lower()
+                if low == "stop listening":
                     self.display_info("Speech input cancelled.")
                     return
                     
                 # Check for exit command
-                if recognized_text.lower() in ["exit", "quit", "/exit", "/quit"]:
+                if low in _EXIT_COMMANDS:
                     console.print("[bold green]Goodbye![/bold green]")
                     raise KeyboardInterrupt()
                 
@@ -4237,111 +4042,20 @@ class AIAssistantApp:
                     if await self.process_command(recognized_text):
                         return
                 
-                # Initialize intent parsers if not already done
-                github_intent_parser = GitHubIntentParser()
-                file_intent_parser = FileIntentParser()
-                app_intent_parser = AppIntentParser()
-                email_intent_parser = EmailIntentParser()
-                whatsapp_intent_parser = WhatsAppIntentParser()
-                
-                # Check for GitHub operations
-                github_intent = github_intent_parser.parse_intent(recognized_text)
-                if github_intent:
-                    result = await self.handle_github_operation(github_intent)
-                    self._format_and_display_response(result)
-                    return
-
-                # Check for WhatsApp operations
-                whatsapp_intent = whatsapp_intent_parser.parse_intent(recognized_text)
-                logger.info(f"WhatsApp intent detection result: {whatsapp_intent}")
-                
-                if whatsapp_intent:
-                    result = await self.handle_whatsapp_operation(whatsapp_intent)
-                    # Format the response to make it visible
-                    self._format_and_display_response(result)
-                    return
-                    
-                # If the shared text appears to be a WhatsApp-related request with a phone number
-                if ("message" in recognized_text.lower() or "whatsapp" in recognized_text.lower()) and re.search(r'[+=]?\d{10,}', recognized_text):
-                    logger.info("Detected potential WhatsApp message to phone number")
-                    # Try to extract recipient (phone number) and message content
-                    phone_match = re.search(r'(?:to\s+)?([+=]?\d{10,})', recognized_text)
-                    if phone_match:
-                        recipient = phone_match.group(1)
-                        instruction = recognized_text  # Use full text as instruction
-                        
-                        logger.info(f"Creating manual WhatsApp intent for phone: {recipient}")
-                        # Create a WhatsApp intent
-                        whatsapp_intent = {
-                            'action': 'ai_compose_whatsapp',
-                            'recipient': recipient.strip(),
-                            'instruction': instruction
-                        }
-                        
-                        result = await self.handle_whatsapp_operation(whatsapp_intent)
-                        self._format_and_display_response(result)
-                        return
-                    
-                # Direct pattern match for AI write message with phone number
-                ai_whatsapp_phone_match = re.search(r'(?:ai|assistant|help)\s+(?:write|compose|draft|create)\s+(?:a\s+)?(?:message|msg)(?:\s+to\s+|\s+for\s+)?([+=]?\d{10,})', recognized_text.lower())
-                if ai_whatsapp_phone_match:
-                    logger.info("Direct pattern match for AI WhatsApp message to phone")
-                    recipient = ai_whatsapp_phone_match.group(1)
-                    
-                    # Create a WhatsApp intent
-                    whatsapp_intent = {
-                        'action': 'ai_compose_whatsapp',
-                        'recipient': recipient.strip(),
-                        'instruction': recognized_text
-                    }
-                    
-                    result = await self.handle_whatsapp_operation(whatsapp_intent)
-                    self._format_and_display_response(result)
-                    return
-                
-                # Check for Email operations
-                email_intent = email_intent_parser.parse_intent(recognized_text)
-                if email_intent:
-                    result = await self.handle_email_operation(email_intent, prompt=recognized_text)
-                    self._format_and_display_response(result)
-                    return
-                    
-                # Check for File operations
-                file_intent = file_intent_parser.parse_intent(recognized_text)
-                if file_intent:
-                    result = await self.handle_file_operation(file_intent)
-                    self._format_and_display_response(result)
-                    return
-                    
-                # Check for App operations
-                app_intent = app_intent_parser.parse_intent(recognized_text)
-                if app_intent:
-                    result = await self.handle_app_operation(app_intent)
-                    self._format_and_display_response(result)
+                # Run the shared intent pipeline (parsers are built once in initialize_core_components)
+                if await self._dispatch_intent(recognized_text):
                     return
                 
                 # Process as a regular question
                 include_screenshot = False  # For speech commands, don't include screenshot by default
                 
-                # Use Rich progress bar
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[bold blue]Processing...[/bold blue]"),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("[green]Thinking...", total=None)
+                try:
+                    screenshot_encoded = self.desktop_screenshot.capture() if include_screenshot else None
+                    await self._stream_and_display_response(recognized_text, screenshot_encoded)
                     
-                    try:
-                        screenshot_encoded = self.desktop_screenshot.capture() if include_screenshot else None
-                        response = await self.assistant.answer_async(recognized_text, screenshot_encoded)
-                        
-                        # Display response with syntax highlighting for code blocks
-                        self._format_and_display_response(response)
-                        
-                    except Exception as e:
-                        logger.error(f"Question processing error: {e}")
-                        console.print(f"\n[bold red]❌ Error processing question: {e}[/bold red]")
+                except Exception as e:
+                    logger.error(f"Question processing error: {e}")
+                    console.print(f"\n[bold red]❌ Error processing question: {e}[/bold red]")
             else:
                 # listen_and_recognize handles displaying the error internally
                 pass # Error/warning already displayed by SpeechRecognizer
@@ -4350,6 +4064,44 @@ class AIAssistantApp:
             self.display_error(f"An error occurred during speech recognition: {e}")
 
 
+    async def _stream_and_display_response(self, prompt, image=None):
+        """
+        Stream an answer, rendering it live as chunks arrive, then show the formatted response.
+        
+        Args:
+            prompt (str): User's query
+            image (str, optional): Base64-encoded screenshot
+            
+        Returns:
+            str: The full response
+        """
+        stream = self.assistant.answer_stream(prompt, image)
+        parts = []
+        try:
+            # Spinner until the first chunk arrives; rich allows only one live display at a time
+            async with self._spin("Processing..."):
+                async for chunk in stream:
+                    parts.append(chunk)
+                    break
+            
+            if parts:
+                # Transient preview, replaced below by the syntax-highlighted rendering
+                with Live(Markdown(parts[0]), console=console, transient=True, refresh_per_second=8) as live:
+                    async for chunk in stream:
+                        parts.append(chunk)
+                        live.update(Markdown("".join(parts)))
+            response = "".join(parts).strip()
+        except Exception as e:
+            await stream.aclose()
+            # Same wording answer_async uses for failed requests
+            error_msg = f"Error with {self.assistant.model_choice}: {str(e)}"
+            logger.error(error_msg)
+            response = f"I encountered an error: {error_msg}"
+        
+        # Display response with syntax highlighting for code blocks
+        self._format_and_display_response(response)
+        return response
+
     def _format_and_display_response(self, response):
         """Format and display AI response with Rich UI enhancements."""
         # Check if response is None or empty
@@ -4358,37 +4110,40 @@ class AIAssistantApp:
             console.print("[yellow]No response received from assistant.[/yellow]")
             return
             
-        # Check for code blocks in the response
-        if "```" in response:
-            # Split the response by code blocks
-            parts = response.split("```")
-            
-            # Display each part with appropriate formatting
-            for i, part in enumerate(parts):
-                if i == 0:
-                    # First part is always text before the first code block
-                    if part.strip():
-                        console.print(Markdown(part.strip()))
-                elif i % 2 == 1:
-                    # Odd-indexed parts are code blocks
-                    # Extract language if specified (e.g., ```python)
-                    code_lines = part.strip().split('\n')
-                    if code_lines and not code_lines[0].isspace() and len(code_lines[0].strip()) > 0:
-                        lang = code_lines[0].strip().lower()
-                        code = '\n'.join(code_lines[1:])
-                    else:
-                        lang = "text"
-                        code = part.strip()
-                    
-                    # Display code with syntax highlighting
-                    console.print(Syntax(code, lang, theme="monokai", line_numbers=True, word_wrap=True))
-                else:
-                    # Even-indexed parts (except 0) are text between code blocks
-                    if part.strip():
-                        console.print(Markdown(part.strip()))
-        else:
-            # No code blocks, display as markdown
-            console.print(Markdown(response))
+        # Plain answers without any fence skip the regex scan entirely
+        if response.find("```") == -1:
+            console.print(_md(response))
+            return
+            
+        # Walk the fenced code blocks in place instead of splitting the whole response
+        pos = 0
+        for match in _FENCE_RE.finditer(response):
+            # Text before this code block
+            text = response[pos:match.start()].strip()
+            if text:
+                console.print(_md(text))
+                
+            # Language comes from the opening fence (e.g., ```python)
+            lang = match.group(1).strip().lower() or "text"
+            console.print(_syn(match.group(2), lang))
+            pos = match.end()
+            
+        if pos == 0:
+            # Only unterminated fences, display as markdown
+            console.print(_md(response))
+            return
+            
+        # Text after the last code block
+        tail = response[pos:].strip()
+        if tail:
+            console.print(_md(tail))
+
+@functools.lru_cache(maxsize=4)
+def _read_json_cached(path, mtime_ns, size):
+    """Parse a JSON config file; mtime_ns and size only key the cache so an edited file is re-read."""
+    with open(path, 'rb') as f:
+        logger.info("Loading config from %s", path)
+        return _jloads(f.read())
 
 def load_config(config_path="config.json"):
     """
@@ -4403,23 +4158,29 @@ def load_config(config_path="config.json"):
         config_dir = os.path.join(home_dir, ".quackquery")
         abs_config_path = os.path.join(config_dir, "config.json")
         
-        # Check for the config in the home directory first
-        if os.path.exists(abs_config_path):
-            with open(abs_config_path, 'r') as f:
-                logger.info(f"Loading config from {abs_config_path}")
-                return json.load(f)
-        
-        # Fallback to the provided path (legacy support)
-        elif os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                logger.info(f"Loading config from {config_path}")
-                return json.load(f)
+        # Check for the config in the home directory first, then the provided path (legacy support)
+        for path in (abs_config_path, config_path):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            # Hand out a copy so callers can't mutate the cached parse
+            return copy.deepcopy(_read_json_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size))
                 
         return {"model": "Gemini", "role": "General"}
     except Exception as e:
         logger.error(f"Error loading config: {e}")
         return {"model": "Gemini", "role": "General"}
 
+def _write_atomic(path, data):
+    """Write bytes to a sibling temp file, fsync it and rename it over path."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
 def save_config(config):
     """
     Save configuration to disk.
@@ -4431,20 +4192,22 @@ def save_config(config):
         # Create a dedicated configuration directory in the user's home
         home_dir = os.path.expanduser("~")
         config_dir = os.path.join(home_dir, ".quackquery")
+        os.makedirs(config_dir, exist_ok=True)
         
-        # Create directory if it doesn't exist
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-            
-        # Save to the absolute path
+        # Serialize once; each copy is written to a temp file and swapped in, so a crash
+        # never leaves a torn config
+        data = _jdumps(config)
         abs_config_path = os.path.join(config_dir, "config.json")
-        with open(abs_config_path, 'w') as f:
-            logger.info(f"Saving config to {abs_config_path}")
-            json.dump(config, f)
-            
-        # Also save to the current directory for backward compatibility
-        with open("config.json", 'w') as f:
-            json.dump(config, f)
+        logger.info("Saving config to %s", abs_config_path)
+        _write_atomic(abs_config_path, data)
+        
+        # Also save to the current directory for backward compatibility (unless that is the
+        # config directory itself)
+        if os.path.abspath("config.json") != abs_config_path:
+            _write_atomic("config.json", data)
+        
+        # Drop parses of the files just rewritten
+        _read_json_cached.cache_clear()
             
     except Exception as e:
         logger.error(f"Error saving config: {e}")
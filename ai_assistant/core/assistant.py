@@ -3,6 +3,7 @@ Core AI Assistant implementation with multi-model support.
 """
 
 import os
+import asyncio
 import logging
 import google.generativeai as genai
 import openai
@@ -11,6 +12,14 @@ from ..core.conversation import ConversationHistory
 
 logger = logging.getLogger("ai_assistant")
 
+# Cheaper models used to fold old exchanges into the rolling summary
+SUMMARY_MODELS = {"Gemini": "gemini-1.5-flash", "OpenAI": "gpt-4o-mini"}
+
+# Context windows (in tokens) of the answering models, used to budget the history
+CONTEXT_TOKENS = {"Gemini": 1_000_000, "OpenAI": 128_000}
+# Conservative characters-per-token estimate (code and non-English text run low)
+CHARS_PER_TOKEN = 3
+
 class Assistant:
     """
     AI Assistant with multi-model support.
@@ -38,15 +47,23 @@ class Assistant:
         self.model_choice = model_choice
         self.api_key = api_key or os.getenv(f"{model_choice.upper()}_API_KEY")
         self.role = role
-        self.prompt_prefix = ROLE_PROMPTS.get(role, ROLE_PROMPTS["General"])
+        self.prompt_prefix = ROLE_PROMPTS.get(role) or ROLE_PROMPTS["General"]
         self.history = ConversationHistory()
+        self._summary_task = None
         
         try:
             if model_choice == "Gemini":
                 genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel("gemini-2.5-pro-exp-03-25")
+                # Role prompt goes in as the system instruction so the static prefix stays cacheable
+                self.model = genai.GenerativeModel(
+                    "gemini-2.5-pro-exp-03-25",
+                    system_instruction=self.prompt_prefix
+                )
+                self.summary_model = genai.GenerativeModel(SUMMARY_MODELS["Gemini"])
             elif model_choice == "OpenAI":
-                openai.api_key = self.api_key
+                # One async client per Assistant so its HTTP connection pool is reused
+                self.client = openai.AsyncOpenAI(api_key=self.api_key)
+                self._system_message = {"role": "system", "content": self.prompt_prefix}
             logger.info(f"Initialized {model_choice} assistant with role: {role}")
         except Exception as e:
             logger.error(f"Failed to initialize {model_choice}: {e}")
@@ -63,54 +80,148 @@ class Assistant:
         Returns:
             str: AI model's response
         """
+        try:
+            chunks = [chunk async for chunk in self.answer_stream(prompt, image)]
+        except Exception as e:
+            error_msg = f"Error with {self.model_choice}: {str(e)}"
+            logger.error(error_msg)
+            return f"I encountered an error: {error_msg}"
+        return "".join(chunks).strip()
+
+    async def answer_stream(self, prompt, image=None):
+        """
+        Stream an answer from the AI model as it is generated.
+        
+        The exchange is added to the conversation history once the stream
+        has been fully consumed.
+        
+        Args:
+            prompt (str): User's query
+            image (str, optional): Base64-encoded image data
+            
+        Yields:
+            str: Chunks of the AI model's response
+            
+        Raises:
+            Exception: If the model request fails
+        """
         if not prompt:
-            return "No input provided."
+            yield "No input provided."
+            return
 
-        # Include conversation history for context
-        context = self.history.get_context()
-        final_prompt = f"{self.prompt_prefix}\n\nConversation History:\n{context}\n\nUser Request: {prompt}\n"
+        # Include conversation history for context; the role prompt is sent
+        # separately as the system message so it stays a stable prefix
+        context = self.history.get_context(self._history_budget(prompt))
+        final_prompt = f"Conversation History:\n{context}\n\nUser Request: {prompt}\n"
         logger.info(f"User Query ({self.model_choice}): {prompt}")
 
-        try:
-            if self.model_choice == "Gemini":
-                image_data = {
-                    "mime_type": "image/jpeg",
-                    "data": image
-                } if image else None
+        chunks = []
+        if self.model_choice == "Gemini":
+            image_data = {
+                "mime_type": "image/jpeg",
+                "data": image
+            } if image else None
 
-                response = self.model.generate_content([final_prompt, image_data] if image else [final_prompt])
-                response_text = response.text.strip() if response and response.text else "I couldn't understand."
+            response = await self.model.generate_content_async(
+                [final_prompt, image_data] if image else [final_prompt],
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            if not "".join(chunks).strip():
+                chunks = ["I couldn't understand."]
+                yield chunks[0]
 
-            elif self.model_choice == "OpenAI":
-                messages = [{"role": "user", "content": final_prompt}]
-                
-                # Add image if provided
-                if image:
-                    messages = [
-                        {"role": "user", 
-                         "content": [
-                             {"type": "text", "text": final_prompt},
-                             {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image}"}}
-                         ]}
-                    ]
-                
-                response = openai.ChatCompletion.create(
-                    model="gpt-4-turbo",
-                    messages=messages
-                )
-                response_text = response["choices"][0]["message"]["content"].strip()
+        elif self.model_choice == "OpenAI":
+            # Plain text, or a text + image block when a screenshot is attached
+            content = final_prompt if not image else [
+                {"type": "text", "text": final_prompt},
+                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image}"}}
+            ]
+            messages = [self._system_message, {"role": "user", "content": content}]
+            
+            response = await self.client.chat.completions.create(
+                model="gpt-4-turbo",
+                messages=messages,
+                stream=True
+            )
+            async for chunk in response:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    chunks.append(text)
+                    yield text
 
-            else:
-                response_text = "Invalid AI model selected. Please use Gemini or OpenAI."
+        else:
+            chunks = ["Invalid AI model selected. Please use Gemini or OpenAI."]
+            yield chunks[0]
 
-            self.history.add(prompt, response_text)
-            
-            # Log the response
-            logger.info(f"AI Response ({self.model_choice}): {response_text[:100]}...")
-            
-            return response_text
+        response_text = "".join(chunks).strip()
+        self.history.add(prompt, response_text)
+        self._maybe_summarize()
+        
+        # Log the response
+        logger.info(f"AI Response ({self.model_choice}): {response_text[:100]}...")
+
+    def _history_budget(self, prompt):
+        """
+        Get how many characters of recent history fit alongside the prompt.
+        
+        Keeps 10% of the model's context window as headroom so an oversized
+        history is trimmed locally instead of failing at the provider.
+        
+        Args:
+            prompt (str): User's query
             
+        Returns:
+            int: Character budget for the recent exchanges
+        """
+        window = CONTEXT_TOKENS.get(self.model_choice, CONTEXT_TOKENS["OpenAI"])
+        budget = int(window * 0.9) * CHARS_PER_TOKEN
+        return max(budget - len(self.prompt_prefix) - len(self.history.summary) - len(prompt), 0)
+
+    def _maybe_summarize(self):
+        """Fold exchanges that left the recent window into the summary in the background."""
+        if self._summary_task and not self._summary_task.done():
+            return
+        turns = self.history.pending_summary()
+        if turns:
+            up_to = self.history.total - self.history.KEEP_RECENT
+            self._summary_task = asyncio.create_task(self._summarize(turns, up_to))
+
+    async def _summarize(self, turns, up_to):
+        """
+        Summarize older exchanges together with the previous summary.
+        
+        Args:
+            turns (list): Exchanges to fold into the summary
+            up_to (int): Number of exchanges the new summary covers
+        """
+        transcript = "\n".join(f"User: {item['user']}\nAssistant: {item['assistant']}" for item in turns)
+        summary_prompt = (
+            "Summarize this conversation in a short paragraph. Keep names, facts and decisions "
+            "the user may refer back to.\n\n"
+            f"Earlier summary:\n{self.history.summary or 'None'}\n\nNew exchanges:\n{transcript}\n"
+        )
+        try:
+            if self.model_choice == "Gemini":
+                response = await self.summary_model.generate_content_async(
+                    summary_prompt,
+                    generation_config={"temperature": 0.3, "max_output_tokens": 250}
+                )
+                summary = response.text
+            elif self.model_choice == "OpenAI":
+                response = await self.client.chat.completions.create(
+                    model=SUMMARY_MODELS["OpenAI"],
+                    messages=[{"role": "user", "content": summary_prompt}],
+                    temperature=0.3,
+                    max_tokens=250
+                )
+                summary = response.choices[0].message.content or ""
+            else:
+                return
         except Exception as e:
-            error_msg = f"Error with {self.model_choice}: {str(e)}"
-            logger.error(error_msg)
-            return f"I encountered an error: {error_msg}"
+            logger.warning(f"Failed to summarize conversation history: {e}")
+            return
+        self.history.fold_summary(summary.strip(), up_to)
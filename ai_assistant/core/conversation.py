@@ -15,8 +15,16 @@ class ConversationHistory:
     Attributes:
         history (list): List of conversation exchanges
         max_history (int): Maximum number of exchanges to store
+        summary (str): Rolling summary of exchanges older than the recent window
+        summarized_up_to (int): Number of exchanges folded into the summary
+        total (int): Number of exchanges added so far
     """
     
+    # Exchanges sent verbatim with each prompt
+    KEEP_RECENT = 3
+    # Exchanges outside the recent window before they get summarized
+    SUMMARIZE_THRESHOLD = 4
+    
     def __init__(self, max_history=10):
         """
         Initialize conversation history.
@@ -26,6 +34,9 @@ class ConversationHistory:
         """
         self.history = []
         self.max_history = max_history
+        self.summary = ""
+        self.summarized_up_to = 0
+        self.total = 0
     
     def add(self, user_input, ai_response):
         """
@@ -36,17 +47,55 @@ class ConversationHistory:
             ai_response (str): AI's response
         """
         self.history.append({"user": user_input, "assistant": ai_response})
+        self.total += 1
         if len(self.history) > self.max_history:
             self.history.pop(0)
     
-    def get_context(self):
+    def pending_summary(self):
+        """
+        Get the exchanges that have left the recent window but are not summarized yet.
+        
+        Returns:
+            list: Exchanges to fold into the summary, empty until the threshold is reached
         """
-        Get a formatted string of recent conversation history.
+        offset = self.total - len(self.history)
+        start = max(self.summarized_up_to, offset)
+        end = self.total - self.KEEP_RECENT
+        if end - start < self.SUMMARIZE_THRESHOLD:
+            return []
+        return self.history[start - offset:end - offset]
+    
+    def fold_summary(self, summary, up_to):
+        """
+        Replace the rolling summary once older exchanges have been summarized.
+        
+        Args:
+            summary (str): New summary covering everything up to ``up_to``
+            up_to (int): Number of exchanges the summary covers
+        """
+        if summary and up_to > self.summarized_up_to:
+            self.summary = summary
+            self.summarized_up_to = up_to
+    
+    def get_context(self, max_chars=None):
+        """
+        Get the rolling summary followed by the most recent exchanges.
+        
+        Args:
+            max_chars (int, optional): Budget for the exchanges; the oldest are dropped until they fit
         
         Returns:
             str: Formatted conversation history
         """
-        return "\n".join([f"User: {item['user']}\nAssistant: {item['assistant']}" for item in self.history[-3:]])
+        turns = [f"User: {item['user']}\nAssistant: {item['assistant']}" for item in self.history[-self.KEEP_RECENT:]]
+        if max_chars is not None:
+            size = sum(map(len, turns))
+            while turns and size > max_chars:
+                size -= len(turns.pop(0))
+        recent = "\n".join(turns)
+        if self.summary:
+            return f"Summary of earlier conversation: {self.summary}\n\n{recent}"
+        return recent
 
 
 class PersistentConversationHistory(ConversationHistory):
@@ -77,6 +126,7 @@ class PersistentConversationHistory(ConversationHistory):
                     saved_history = json.load(f)
                     if isinstance(saved_history, list):
                         self.history = saved_history[-self.max_history:]
+                        self.total = len(self.history)
                         logger.info(f"Loaded {len(self.history)} conversation items from history file")
         except Exception as e:
             logger.error(f"Error loading conversation history: {e}")
@@ -103,5 +153,7 @@ class PersistentConversationHistory(ConversationHistory):
     def clear(self):
         """Clear conversation history and save the empty history to disk."""
         self.history = []
+        self.summary = ""
+        self.summarized_up_to = self.total = 0
         self.save_history()
         logger.info("Conversation history cleared")
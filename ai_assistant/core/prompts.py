@@ -164,3 +164,15 @@ When advising on sales and bargaining:
 6. Suggest data-driven approaches when possible
 7. Provide specific examples and templates when helpful"""
 }
+
+# Role menu data, derived once from ROLE_PROMPTS
+ROLE_KEYS = tuple(ROLE_PROMPTS)
+ROLE_KEY_SET = frozenset(ROLE_PROMPTS)
+ROLE_CHOICES_STR = tuple(str(i) for i in range(1, len(ROLE_KEYS) + 1))
+ROLE_SHORT_DESCS = {
+    role: description.split("\n", 1)[0] if "\n" in description else description[:50] + "..."
+    for role, description in ROLE_PROMPTS.items()
+}
+ROLE_TABLE_ROWS = tuple(
+    (choice, role, ROLE_SHORT_DESCS[role]) for choice, role in zip(ROLE_CHOICES_STR, ROLE_KEYS)
+)
@@ -10,6 +10,12 @@ import requests
 from datetime import datetime
 import re
 
+# orjson parses the response bytes directly and is several times faster on large pages
+try:
+    from orjson import loads as _jloads
+except ImportError:
+    from json import loads as _jloads
+
 logger = logging.getLogger("ai_assistant")
 
 class GitHubIntegration:
@@ -29,6 +35,9 @@ class GitHubIntegration:
         self.api_base = "https://api.github.com"
         self.authenticated = False
         
+        # Keep-alive session so consecutive API calls reuse one connection
+        self.session = requests.Session()
+        
         # Try to load token from environment
         self._load_token()
         
@@ -85,10 +94,10 @@ class GitHubIntegration:
                 "Accept": "application/vnd.github.v3+json"
             }
             
-            response = requests.get(f"{self.api_base}/user", headers=headers)
+            response = self.session.get(f"{self.api_base}/user", headers=headers)
             
             if response.status_code == 200:
-                user_data = response.json()
+                user_data = _jloads(response.content)
                 self.username = user_data["login"]
                 self.authenticated = True
                 logger.info(f"Authenticated with GitHub as {self.username}")
@@ -120,13 +129,13 @@ class GitHubIntegration:
                 "Accept": "application/vnd.github.v3+json"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_base}/user/repos?sort=updated&per_page={limit}",
                 headers=headers
             )
             
             if response.status_code == 200:
-                repos = response.json()
+                repos = _jloads(response.content)
                 
                 if not repos:
                     return "No repositories found."
@@ -179,17 +188,17 @@ class GitHubIntegration:
             if description:
                 data["description"] = description
                 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base}/user/repos",
                 headers=headers,
                 json=data
             )
             
             if response.status_code == 201:
-                repo_data = response.json()
+                repo_data = _jloads(response.content)
                 return f"✅ Repository created successfully: {repo_data['html_url']}"
             else:
-                error_msg = response.json().get("message", f"Status code: {response.status_code}")
+                error_msg = _jloads(response.content).get("message", f"Status code: {response.status_code}")
                 return f"Error creating repository: {error_msg}"
                 
         except Exception as e:
@@ -232,17 +241,17 @@ class GitHubIntegration:
             if labels:
                 data["labels"] = labels
                 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base}/repos/{repo}/issues",
                 headers=headers,
                 json=data
             )
             
             if response.status_code == 201:
-                issue_data = response.json()
+                issue_data = _jloads(response.content)
                 return f"✅ Issue created successfully: {issue_data['html_url']}"
             else:
-                error_msg = response.json().get("message", f"Status code: {response.status_code}")
+                error_msg = _jloads(response.content).get("message", f"Status code: {response.status_code}")
                 return f"Error creating issue: {error_msg}"
                 
         except Exception as e:
@@ -274,13 +283,13 @@ class GitHubIntegration:
                 "Accept": "application/vnd.github.v3+json"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_base}/repos/{repo}/issues?state={state}&per_page={limit}",
                 headers=headers
             )
             
             if response.status_code == 200:
-                issues = response.json()
+                issues = _jloads(response.content)
                 
                 if not issues:
                     return f"No {state} issues found in {repo}."
@@ -302,7 +311,7 @@ class GitHubIntegration:
                     
                 return result
             else:
-                error_msg = response.json().get("message", f"Status code: {response.status_code}")
+                error_msg = _jloads(response.content).get("message", f"Status code: {response.status_code}")
                 return f"Error listing issues: {error_msg}"
                 
         except Exception as e:
@@ -337,13 +346,13 @@ class GitHubIntegration:
             
             # Check if file exists to get the SHA
             sha = None
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_base}/repos/{repo}/contents/{path}",
                 headers=headers
             )
             
             if response.status_code == 200:
-                sha = response.json().get("sha")
+                sha = _jloads(response.content).get("sha")
                 
             # Prepare the data for creating/updating the file
             data = {
@@ -354,18 +363,18 @@ class GitHubIntegration:
             if sha:
                 data["sha"] = sha
                 
-            response = requests.put(
+            response = self.session.put(
                 f"{self.api_base}/repos/{repo}/contents/{path}",
                 headers=headers,
                 json=data
             )
             
             if response.status_code in (200, 201):
-                file_data = response.json()
+                file_data = _jloads(response.content)
                 action = "updated" if sha else "created"
                 return f"✅ File {action} successfully: {file_data['content']['html_url']}"
             else:
-                error_msg = response.json().get("message", f"Status code: {response.status_code}")
+                error_msg = _jloads(response.content).get("message", f"Status code: {response.status_code}")
                 return f"Error creating/updating file: {error_msg}"
                 
         except Exception as e:
@@ -396,7 +405,7 @@ class GitHubIntegration:
             }
             
             # Delete repository
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.api_base}/repos/{repo}",
                 headers=headers
             )
@@ -406,7 +415,7 @@ class GitHubIntegration:
             else:
                 error_msg = ""
                 try:
-                    error_data = response.json()
+                    error_data = _jloads(response.content)
                     error_msg = error_data.get("message", f"Status code: {response.status_code}")
                 except:
                     error_msg = f"Status code: {response.status_code}"
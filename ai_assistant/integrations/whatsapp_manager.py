@@ -10,7 +10,7 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, SessionNotCreatedException
 from webdriver_manager.chrome import ChromeDriverManager
 import urllib.parse
 from selenium.webdriver import ActionChains
@@ -117,7 +117,7 @@ class WhatsAppManager:
             
             # Directory for user data - used to remember login sessions
             user_data_dir = os.path.join(os.path.expanduser('~'), '.aiassistant', 'whatsapp_data')
-            logger.info(f"Using Chrome user data directory: {user_data_dir}")
+            logger.info("Using Chrome user data directory: %s", user_data_dir)
             os.makedirs(user_data_dir, exist_ok=True)
             
             # Add Chrome options for better compatibility
@@ -139,17 +139,26 @@ class WhatsAppManager:
             logger.info("Initializing Chrome driver...")
             
             # Try using a direct path for chromedriver if available
-            chromedriver_path = self.config.get('chromedriver_path')
+            chromedriver_path = os.environ.get('CHROMEDRIVER_PATH') or self.config.get('chromedriver_path')
             if chromedriver_path and os.path.exists(chromedriver_path):
-                logger.info(f"Using custom ChromeDriver path: {chromedriver_path}")
+                logger.info("Using custom ChromeDriver path: %s", chromedriver_path)
                 service = Service(executable_path=chromedriver_path)
             else:
-                # Otherwise let webdriver_manager download it
+                # Otherwise let webdriver_manager download it; it caches drivers per
+                # Chrome version, so this only downloads after Chrome updates
                 logger.info("Using webdriver_manager to get ChromeDriver")
+                chromedriver_path = None
                 service = Service(ChromeDriverManager().install())
             
             # Initialize the Chrome driver
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            try:
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            except SessionNotCreatedException as e:
+                if not chromedriver_path:
+                    raise
+                # A custom driver goes stale when Chrome auto-updates; fall back to a matching one
+                logger.warning("ChromeDriver at %s failed to start a session (%s); using webdriver_manager", chromedriver_path, e.msg)
+                self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
             logger.info("Chrome driver initialized successfully")
             
             # Open WhatsApp Web
@@ -210,7 +219,7 @@ class WhatsAppManager:
                     try:
                         qr_element = self.driver.find_element(By.XPATH, selector)
                         if qr_element:
-                            logger.info(f"Found QR code or landing element with selector: {selector}")
+                            logger.info("Found QR code or landing element with selector: %s", selector)
                             logger.info("QR code found. Please scan the QR code to log in to WhatsApp Web")
                             qr_found = True
                             
@@ -235,20 +244,23 @@ class WhatsAppManager:
                     logger.error("Could not find QR code or landing page element with any known selector")
                     error_msg = "Could not find QR code or landing page. WhatsApp Web interface may have changed."
                     
-                # Check for other elements to diagnose the state of WhatsApp Web
-                page_source = self.driver.page_source
+                # Check for other elements to diagnose the state of WhatsApp Web. Only the
+                # rendered text is pulled over the driver, not the multi-MB serialized DOM
+                page_text = (self.driver.execute_script(
+                    "return document.body ? document.body.innerText : '';"
+                ) or "").lower()
                 
                 # More comprehensive diagnostic checks
-                if any(text in page_source.lower() for text in ["use whatsapp on your computer", "to use whatsapp on your computer"]):
+                if any(text in page_text for text in ["use whatsapp on your computer", "to use whatsapp on your computer"]):
                     logger.info("WhatsApp Web landing page detected")
                     error_msg = "WhatsApp landing page found, but couldn't interact with it automatically. Try manually at https://web.whatsapp.com/"
-                elif any(text in page_source.lower() for text in ["reload the page", "try reloading", "connection problem"]):
+                elif any(text in page_text for text in ["reload the page", "try reloading", "connection problem"]):
                     logger.error("WhatsApp Web is asking to reload the page")
                     error_msg = "WhatsApp Web needs to be reloaded. Please try again."
-                elif any(text in page_source.lower() for text in ["multidevice", "multi-device", "multiple device"]):
+                elif any(text in page_text for text in ["multidevice", "multi-device", "multiple device"]):
                     logger.info("Multi-device beta screen detected")
                     error_msg = "WhatsApp multi-device screen detected. Try enabling multi-device in your WhatsApp settings."
-                elif "blocked" in page_source.lower() or "suspicious" in page_source.lower():
+                elif "blocked" in page_text or "suspicious" in page_text:
                     logger.error("WhatsApp Web may be detecting automation")
                     error_msg = "WhatsApp Web might be detecting automation tools. Try connecting manually first."
                 
@@ -263,7 +275,7 @@ class WhatsAppManager:
                 for chat_selector in chat_list_selectors:
                     try:
                         if self.driver.find_element(By.XPATH, chat_selector):
-                            logger.info(f"Found chat list with selector: {chat_selector}")
+                            logger.info("Found chat list with selector: %s", chat_selector)
                             self.is_connected = True
                             return True
                     except:
@@ -273,7 +285,7 @@ class WhatsAppManager:
                 try:
                     screenshot_path = os.path.join(os.path.expanduser('~'), '.aiassistant', 'whatsapp_error.png')
                     self.driver.save_screenshot(screenshot_path)
-                    logger.info(f"Saved error screenshot to {screenshot_path}")
+                    logger.info("Saved error screenshot to %s", screenshot_path)
                     error_msg += f"\nScreenshot saved to: {screenshot_path}"
                 except Exception as ss_error:
                     logger.error(f"Failed to save error screenshot: {str(ss_error)}")
@@ -284,7 +296,7 @@ class WhatsAppManager:
                     if console_logs:
                         logger.info("Browser console logs:")
                         for log in console_logs[-10:]:  # Last 10 logs
-                            logger.info(f"  {log}")
+                            logger.info("  %s", log)
                 except Exception as log_error:
                     logger.error(f"Error getting console logs: {str(log_error)}")
                 
@@ -356,7 +368,7 @@ class WhatsAppManager:
                 
                 # First try using the direct link approach
                 try:
-                    logger.info(f"Sending message to phone number: {recipient}")
+                    logger.info("Sending message to phone number: %s", recipient)
                     # Open chat using WhatsApp Web API
                     message_encoded = urllib.parse.quote(message)
                     self.driver.get(f"https://web.whatsapp.com/send?phone={recipient}&text={message_encoded}")
@@ -377,7 +389,7 @@ class WhatsAppManager:
                                 WebDriverWait(self.driver, 30).until(
                                     EC.presence_of_element_located((By.XPATH, selector))
                                 )
-                                logger.info(f"Found message input using selector: {selector}")
+                                logger.info("Found message input using selector: %s", selector)
                                 break
                             except TimeoutException:
                                 continue
@@ -402,7 +414,7 @@ class WhatsAppManager:
                                     EC.element_to_be_clickable((By.XPATH, selector))
                                 )
                                 send_button.click()
-                                logger.info(f"Clicked send button using standard approach: {selector}")
+                                logger.info("Clicked send button using standard approach: %s", selector)
                                 send_clicked = True
                                 break
                             except Exception as e:
@@ -417,7 +429,7 @@ class WhatsAppManager:
                                     if buttons:
                                         # Try JavaScript click first (most reliable)
                                         self.driver.execute_script("arguments[0].click();", buttons[0])
-                                        logger.info(f"Clicked send button using JavaScript: {selector}")
+                                        logger.info("Clicked send button using JavaScript: %s", selector)
                                         send_clicked = True
                                         break
                                 except Exception as e:
@@ -436,7 +448,7 @@ class WhatsAppManager:
                                 logger.error(f"Error using keyboard shortcut to send: {str(key_error)}")
                         
                         if send_clicked:
-                            logger.info(f"Message sent to {recipient}")
+                            logger.info("Message sent to %s", recipient)
                             return True
                         else:
                             logger.error("Send button not found or not clickable using all methods")
@@ -450,7 +462,7 @@ class WhatsAppManager:
             
             # Search approach (used for contacts or as fallback)
             try:
-                logger.info(f"Trying to send message to {recipient} using search approach")
+                logger.info("Trying to send message to %s using search approach", recipient)
                 # Click on the new chat button
                 new_chat_selectors = [
                     "//div[@data-testid='chat-list-search']",
@@ -493,7 +505,7 @@ class WhatsAppManager:
                                     # Check if element is visible and enabled
                                     if element.is_displayed() and element.is_enabled():
                                         search_input = element
-                                        logger.info(f"Found search input with selector: {selector}")
+                                        logger.info("Found search input with selector: %s", selector)
                                         break
                                 except:
                                     continue
@@ -519,7 +531,7 @@ class WhatsAppManager:
                         search_input.send_keys(char)
                         time.sleep(0.1)
                         
-                    logger.info(f"Entered search text for recipient: {recipient}")
+                    logger.info("Entered search text for recipient: %s", recipient)
                     
                     # Wait for search results to populate
                     time.sleep(2)
@@ -532,7 +544,7 @@ class WhatsAppManager:
                             "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));",
                             search_input, recipient
                         )
-                        logger.info(f"Entered search text using JavaScript: {recipient}")
+                        logger.info("Entered search text using JavaScript: %s", recipient)
                         time.sleep(2)
                     except Exception as js_error:
                         logger.error(f"Error entering search text with JavaScript: {str(js_error)}")
@@ -551,7 +563,7 @@ class WhatsAppManager:
                 ]
                 
                 # First try to find an exact match with the recipient name
-                logger.info(f"Looking for exact match contact: {recipient}")
+                logger.info("Looking for exact match contact: %s", recipient)
                 exact_match_found = False
                 
                 for selector in exact_match_selectors:
@@ -562,11 +574,11 @@ class WhatsAppManager:
                                 if element.is_displayed():
                                     # Verify this is actually the contact we want
                                     element_text = element.text.strip()
-                                    logger.info(f"Found potential exact match: '{element_text}'")
+                                    logger.info("Found potential exact match: '%s'", element_text)
                                     
                                     # Check if it's an exact match or close match
                                     if element_text.lower() == recipient.lower() or recipient.lower() in element_text.lower():
-                                        logger.info(f"Confirmed exact match for contact: {recipient}")
+                                        logger.info("Confirmed exact match for contact: %s", recipient)
                                         
                                         # Try to click using JavaScript (more reliable)
                                         self.driver.execute_script("arguments[0].click();", element)
@@ -597,7 +609,7 @@ class WhatsAppManager:
                             list_items = self.driver.find_elements(By.XPATH, list_selector)
                             
                             if list_items:
-                                logger.info(f"Found {len(list_items)} potential contacts in search results")
+                                logger.info("Found %s potential contacts in search results", len(list_items))
                                 
                                 # Only use the first result if we have a very close match
                                 # or if there's only one result
@@ -608,7 +620,7 @@ class WhatsAppManager:
                                     try:
                                         screenshot_path = os.path.join(os.path.expanduser('~'), '.aiassistant', 'whatsapp_contact_selection.png')
                                         self.driver.save_screenshot(screenshot_path)
-                                        logger.info(f"Saved contact selection screenshot to {screenshot_path}")
+                                        logger.info("Saved contact selection screenshot to %s", screenshot_path)
                                     except Exception:
                                         pass
                                         
@@ -624,17 +636,17 @@ class WhatsAppManager:
                                         try:
                                             # Try to get text from the list item
                                             item_text = item.text.strip()
-                                            logger.info(f"Checking list item: '{item_text}'")
+                                            logger.info("Checking list item: '%s'", item_text)
                                             
                                             # If item text contains our recipient name, select it
                                             if recipient.lower() in item_text.lower():
-                                                logger.info(f"Found matching contact in results: '{item_text}'")
+                                                logger.info("Found matching contact in results: '%s'", item_text)
                                                 
                                                 # Take screenshot before clicking
                                                 try:
                                                     screenshot_path = os.path.join(os.path.expanduser('~'), '.aiassistant', 'whatsapp_contact_match.png')
                                                     self.driver.save_screenshot(screenshot_path)
-                                                    logger.info(f"Saved contact match screenshot to {screenshot_path}")
+                                                    logger.info("Saved contact match screenshot to %s", screenshot_path)
                                                 except Exception:
                                                     pass
                                                     
@@ -672,7 +684,7 @@ class WhatsAppManager:
                             try:
                                 screenshot_path = os.path.join(os.path.expanduser('~'), '.aiassistant', 'whatsapp_contact_fallback.png')
                                 self.driver.save_screenshot(screenshot_path)
-                                logger.info(f"Saved fallback screenshot to {screenshot_path}")
+                                logger.info("Saved fallback screenshot to %s", screenshot_path)
                             except Exception:
                                 pass
                                 
@@ -689,13 +701,13 @@ class WhatsAppManager:
                     # Try to go directly to chat with phone number if it looks like one
                     phone_pattern = re.compile(r'^\+?[0-9\s\-\(\)]+$')
                     if phone_pattern.match(recipient):
-                        logger.info(f"Recipient looks like a phone number, trying direct approach: {recipient}")
+                        logger.info("Recipient looks like a phone number, trying direct approach: %s", recipient)
                         try:
                             # Clean up phone number - remove spaces, dashes, parentheses
                             clean_phone = re.sub(r'[\s\-\(\)]', '', recipient)
                             # Go directly to chat
                             self.driver.get(f"https://web.whatsapp.com/send?phone={clean_phone}&text={quote(message, safe='')}")
-                            logger.info(f"Navigating directly to chat with phone: {clean_phone}")
+                            logger.info("Navigating directly to chat with phone: %s", clean_phone)
                             
                             # Wait for the page to load
                             time.sleep(5)
@@ -766,7 +778,7 @@ class WhatsAppManager:
                     try:
                         if self.driver.find_elements(By.XPATH, indicator):
                             in_chat = True
-                            logger.info(f"Detected we are in a chat view with indicator: {indicator}")
+                            logger.info("Detected we are in a chat view with indicator: %s", indicator)
                             break
                     except:
                         continue
@@ -813,7 +825,7 @@ class WhatsAppManager:
                                             continue
                                             
                                         message_input = element
-                                        logger.info(f"Found message input in chat view with selector: {selector}")
+                                        logger.info("Found message input in chat view with selector: %s", selector)
                                         break
                                 except:
                                     continue
@@ -830,7 +842,7 @@ class WhatsAppManager:
                     try:
                         screenshot_path = os.path.join(os.path.expanduser('~'), '.aiassistant', 'whatsapp_input_error.png')
                         self.driver.save_screenshot(screenshot_path)
-                        logger.info(f"Saved error screenshot to {screenshot_path}")
+                        logger.info("Saved error screenshot to %s", screenshot_path)
                     except Exception:
                         pass
                         
@@ -897,7 +909,7 @@ class WhatsAppManager:
                             EC.element_to_be_clickable((By.XPATH, selector))
                         )
                         send_button.click()
-                        logger.info(f"Clicked send button using standard approach: {selector}")
+                        logger.info("Clicked send button using standard approach: %s", selector)
                         send_clicked = True
                         break
                     except Exception as e:
@@ -912,7 +924,7 @@ class WhatsAppManager:
                             if buttons:
                                 # Try JavaScript click first (most reliable)
                                 self.driver.execute_script("arguments[0].click();", buttons[0])
-                                logger.info(f"Clicked send button using JavaScript: {selector}")
+                                logger.info("Clicked send button using JavaScript: %s", selector)
                                 send_clicked = True
                                 break
                         except Exception as e:
@@ -931,7 +943,7 @@ class WhatsAppManager:
                         logger.error(f"Error using keyboard shortcut to send: {str(key_error)}")
                 
                 if send_clicked:
-                    logger.info(f"Message sent to {recipient}")
+                    logger.info("Message sent to %s", recipient)
                     return True
                 else:
                     logger.error("Send button not found or not clickable using all methods")
@@ -50,13 +50,13 @@ class AppIntentParser:
         text = text.lower().strip()
         
         # Debug: Log the text being parsed
-        logger.info(f"Parsing app intent from: '{text}'")
+        logger.info("Parsing app intent from: '%s'", text)
         
         # Special case for simple "open X" commands
         simple_open_match = re.match(r"^(?:open|launch|start|run)\s+([a-zA-Z0-9\s\.]+)$", text, re.IGNORECASE)
         if simple_open_match:
             app_name = simple_open_match.group(1).strip()
-            logger.info(f"Matched simple app launch: {app_name}")
+            logger.info("Matched simple app launch: %s", app_name)
             return {
                 "operation": "launch_app",
                 "params": {"app_name": app_name}
@@ -85,7 +85,7 @@ class AppIntentParser:
             for pattern in patterns:
                 match = re.search(pattern, text, re.IGNORECASE)
                 if match:
-                    logger.info(f"Matched app intent: {operation} with pattern: {pattern}")
+                    logger.info("Matched app intent: %s with pattern: %s", operation, pattern)
                     
                     # Extract parameters based on the operation
                     params = {}
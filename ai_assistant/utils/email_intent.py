@@ -53,8 +53,7 @@ class EmailIntentParser:
         
         # Check for AI compose email FIRST (before regular send email)
         # This is important because "ai write email" could also match the send_email pattern
-        ai_compose_pattern = re.compile(r'(?:ai|assistant|help me)\s+(?:write|compose|draft|create)\s+(?:an\s+)?(?:email|mail|message)(?:\s+(?:to\s+)?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}))?', re.IGNORECASE)
-        match = ai_compose_pattern.search(normalized_input)
+        match = self.ai_compose_email_pattern.search(normalized_input)
         if match:
             to_address = match.group(1) if match.groups() else None
             return {
@@ -63,16 +62,14 @@ class EmailIntentParser:
             }
         
         # Check for setup email
-        setup_pattern = re.compile(r'(?:set\s*up|configure|add)\s+(?:my\s+)?email', re.IGNORECASE)
-        match = setup_pattern.search(normalized_input)
+        match = self.setup_email_pattern.search(normalized_input)
         if match:
             return {
                 'operation': 'setup_email'
             }
         
         # Check for send email
-        send_pattern = re.compile(r'(?:send|write|compose)\s+(?:an\s+)?(?:email|mail|message)\s+(?:to\s+)?([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', re.IGNORECASE)
-        match = send_pattern.search(normalized_input)
+        match = self.send_email_pattern.search(normalized_input)
         if match:
             to_address = match.group(1) if match.groups() else None
             return {
@@ -81,8 +78,7 @@ class EmailIntentParser:
             }
         
         # Check for list emails
-        list_pattern = re.compile(r'(?:list|show|check|get|view)\s+(?:my\s+)?(?:emails|mail|inbox|messages)', re.IGNORECASE)
-        match = list_pattern.search(normalized_input)
+        match = self.list_emails_pattern.search(normalized_input)
         if match:
             from_address = None
             from_match = re.search(r'from\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', normalized_input)
@@ -95,8 +91,7 @@ class EmailIntentParser:
             }
         
         # Check for read email
-        read_pattern = re.compile(r'(?:read|open|view|show)\s+email\s+(?:number\s+)?(\d+)', re.IGNORECASE)
-        match = read_pattern.search(normalized_input)
+        match = self.read_email_pattern.search(normalized_input)
         if match:
             email_id = match.group(1) if match.groups() else None
             return {
@@ -105,8 +100,7 @@ class EmailIntentParser:
             }
         
         # Check for reply to email
-        reply_pattern = re.compile(r'(?:reply|respond)\s+(?:to\s+)?email\s+(?:number\s+)?(\d+)', re.IGNORECASE)
-        match = reply_pattern.search(normalized_input)
+        match = self.reply_to_email_pattern.search(normalized_input)
         if match:
             email_id = match.group(1) if match.groups() else None
             return {
@@ -115,8 +109,7 @@ class EmailIntentParser:
             }
         
         # Check for forward email
-        forward_pattern = re.compile(r'(?:forward)\s+email\s+(?:number\s+)?(\d+)(?:\s+to\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}))?', re.IGNORECASE)
-        match = forward_pattern.search(normalized_input)
+        match = self.forward_email_pattern.search(normalized_input)
         if match:
             email_id = match.group(1) if match.groups() else None
             to_address = match.group(2) if len(match.groups()) > 1 else None
@@ -127,8 +120,7 @@ class EmailIntentParser:
             }
         
         # Check for delete email
-        delete_pattern = re.compile(r'(?:delete|remove)\s+email\s+(?:number\s+)?(\d+)', re.IGNORECASE)
-        match = delete_pattern.search(normalized_input)
+        match = self.delete_email_pattern.search(normalized_input)
         if match:
             email_id = match.group(1) if match.groups() else None
             return {
@@ -1,16 +1,150 @@
+import io
 import os
+import re
 import logging
+import zipfile
+from xml.etree import ElementTree
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Optional, List, Dict, Any, Tuple, Union
+from matplotlib.figure import Figure
+from typing import Optional, List, Dict, Any, Tuple, Union, Iterator
 import openpyxl
+from openpyxl.utils import column_index_from_string
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.chart import BarChart, Reference, LineChart, PieChart
 import xlwings as xw
 
 logger = logging.getLogger("ai_assistant")
 
+# Prefer the Rust calamine reader (pandas >= 2.2) over openpyxl when it is installed
+try:
+    import python_calamine  # noqa: F401
+    _READ_ENGINE = "calamine" if tuple(map(int, pd.__version__.split(".")[:2])) >= (2, 2) else None
+except ImportError:
+    _READ_ENGINE = None
+
+# Cell ranges like "A1:B10" or "$A$1:$B$10" for chart data
+_RANGE_RE = re.compile(r"\$?([A-Z]+)\$?(\d+):\$?([A-Z]+)\$?(\d+)")
+
+# SpreadsheetML namespaces for reading sheet dimensions straight from the archive
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_DOC_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DIMENSION_END_RE = re.compile(r"([A-Z]+)(\d+)$")
+_CELL_COLUMN_RE = re.compile(r"[A-Z]+")
+
+# Header cell style matching what pandas' to_excel applied
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style="thin"),) * 4)
+_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+_EXCEL_EXTENSIONS = frozenset(("xlsx", "xls", "xlsm"))
+
+# Parsed workbooks keyed by absolute path, reused while the file's mtime and size are unchanged.
+# Each is parsed from an in-memory copy, so no file handle stays open between commands
+_WB_CACHE_SIZE = 4
+_wb_cache = OrderedDict()
+
+
+def _excel_file(abs_path: str) -> pd.ExcelFile:
+    """
+    Get a pd.ExcelFile for a workbook, parsing it only when it changed on disk.
+    
+    The workbook is read into memory and the file closed straight away, so a cached
+    entry never locks the file (e.g. against saving it from Excel on Windows).
+    """
+    st = os.stat(abs_path)
+    key = (st.st_mtime_ns, st.st_size)
+    entry = _wb_cache.get(abs_path)
+    if entry and entry[0] == key:
+        _wb_cache.move_to_end(abs_path)
+        return entry[1]
+    
+    _release_excel_file(abs_path)
+    with open(abs_path, "rb") as f:
+        # Key on the state of the bytes actually read
+        st = os.fstat(f.fileno())
+        key = (st.st_mtime_ns, st.st_size)
+        data = f.read()
+    xls = pd.ExcelFile(io.BytesIO(data), engine=_READ_ENGINE)
+    _wb_cache[abs_path] = (key, xls)
+    if len(_wb_cache) > _WB_CACHE_SIZE:
+        _, (_, oldest) = _wb_cache.popitem(last=False)
+        oldest.close()
+    return xls
+
+
+def _read_sheet_dimensions(abs_path: str) -> List[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    Read each sheet's used-range size from the <dimension> header of its XML.
+    
+    Only the workbook manifest and the first few elements of each sheet are parsed;
+    shared strings and styles are never loaded. Sheets written without a dimension
+    record (e.g. by openpyxl's write-only mode) have their cell references scanned instead.
+    
+    Returns:
+        (name, max_row, max_column) per sheet, with None sizes for empty sheets.
+    """
+    with zipfile.ZipFile(abs_path) as archive:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{_NS_PKG_REL}Relationship")}
+        
+        sheets = []
+        for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+            target = targets[sheet.get(f"{_NS_DOC_REL}id")]
+            part = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+            
+            ref = None
+            with archive.open(part) as stream:
+                for _, elem in ElementTree.iterparse(stream, events=("start",)):
+                    if elem.tag == f"{_NS_MAIN}dimension":
+                        ref = elem.get("ref")
+                        break
+                    if elem.tag == f"{_NS_MAIN}sheetData":
+                        break
+                        
+            end = _DIMENSION_END_RE.search(ref or "")
+            if end:
+                sheets.append((sheet.get("name"), int(end.group(2)), column_index_from_string(end.group(1))))
+            else:
+                with archive.open(part) as stream:
+                    sheets.append((sheet.get("name"),) + _scan_sheet_extent(stream))
+                
+    if not sheets:
+        raise ValueError("No worksheets found in workbook manifest")
+    return sheets
+
+
+def _scan_sheet_extent(stream) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Find a sheet's last used row and column from the row/cell references in its XML.
+    
+    Returns:
+        (max_row, max_column), or (None, None) when the sheet has no cells.
+    """
+    max_row = max_column = 0
+    for _, elem in ElementTree.iterparse(stream):
+        if elem.tag == f"{_NS_MAIN}c":
+            column = _CELL_COLUMN_RE.match(elem.get("r", ""))
+            if column:
+                max_column = max(max_column, column_index_from_string(column.group()))
+        elif elem.tag == f"{_NS_MAIN}row":
+            max_row = max(max_row, int(elem.get("r", 0)))
+            elem.clear()
+    return (max_row or None, max_column or None)
+
+
+def _release_excel_file(abs_path: str) -> None:
+    """Drop a cached workbook before the file is rewritten, freeing its parsed copy."""
+    entry = _wb_cache.pop(abs_path, None)
+    if entry:
+        entry[1].close()
+
 class ExcelHandler:
     """A class for handling Excel file operations."""
     
@@ -40,20 +174,38 @@ class ExcelHandler:
             List of Excel file paths.
         """
         try:
-            dir_path = self.resolve_path(directory)
-            excel_files = []
-            
-            for root, _, files in os.walk(dir_path):
-                for file in files:
-                    if file.endswith(('.xlsx', '.xls', '.xlsm')):
-                        rel_path = os.path.relpath(os.path.join(root, file), self.workspace_root)
-                        excel_files.append(rel_path)
-                        
-            return excel_files
+            return list(self.iter_excel_files(directory))
         except Exception as e:
             logger.error(f"Error listing Excel files: {e}")
             return []
     
+    def iter_excel_files(self, directory: str = "") -> Iterator[str]:
+        """
+        Lazily walk a directory tree for Excel files, in the same order as os.walk.
+        
+        Args:
+            directory: Directory to search in (relative to workspace root).
+            
+        Yields:
+            Excel file paths relative to the workspace root.
+        """
+        stack = [self.resolve_path(directory)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        if entry.is_dir():
+                            # Like os.walk, don't descend into symlinked directories
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif entry.name.rpartition(".")[2].lower() in _EXCEL_EXTENSIONS:
+                            yield os.path.relpath(entry.path, self.workspace_root)
+            except OSError:
+                # Unreadable directories are skipped, as os.walk does
+                continue
+            stack.extend(reversed(subdirs))
+    
     def read_excel_file(self, file_path: str, sheet_name: Optional[Union[str, int]] = 0) -> Optional[pd.DataFrame]:
         """
         Read an Excel file and return its contents as a DataFrame.
@@ -67,7 +219,7 @@ class ExcelHandler:
         """
         try:
             abs_path = self.resolve_path(file_path)
-            return pd.read_excel(abs_path, sheet_name=sheet_name)
+            return _excel_file(abs_path).parse(sheet_name=sheet_name)
         except Exception as e:
             logger.error(f"Error reading Excel file {file_path}: {e}")
             return None
@@ -84,8 +236,7 @@ class ExcelHandler:
         """
         try:
             abs_path = self.resolve_path(file_path)
-            xls = pd.ExcelFile(abs_path)
-            return xls.sheet_names
+            return _excel_file(abs_path).sheet_names
         except Exception as e:
             logger.error(f"Error getting sheet names from {file_path}: {e}")
             return []
@@ -109,14 +260,20 @@ class ExcelHandler:
                 "last_modified": os.path.getmtime(abs_path)
             }
             
-            # Get sheet information
-            workbook = openpyxl.load_workbook(abs_path, read_only=True)
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
+            # Get sheet information from the sheet XML headers; fall back to a
+            # read-only openpyxl load for anything that isn't a plain xlsx package
+            try:
+                dimensions = _read_sheet_dimensions(abs_path)
+            except Exception:
+                workbook = openpyxl.load_workbook(abs_path, read_only=True)
+                dimensions = [(name, workbook[name].max_row, workbook[name].max_column) for name in workbook.sheetnames]
+                workbook.close()
+                
+            for sheet_name, rows, columns in dimensions:
                 sheet_info = {
                     "name": sheet_name,
-                    "rows": sheet.max_row,
-                    "columns": sheet.max_column
+                    "rows": rows,
+                    "columns": columns
                 }
                 file_info["sheets"].append(sheet_info)
                 
@@ -125,6 +282,25 @@ class ExcelHandler:
             logger.error(f"Error getting Excel info for {file_path}: {e}")
             return {"error": str(e)}
     
+    def get_many_excel_infos(self, file_paths: List[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Get information about several Excel files concurrently.
+        
+        Opening a workbook is mostly zip I/O and XML parsing, so the files are
+        read on a thread pool and their latencies overlap.
+        
+        Args:
+            file_paths: Paths to the Excel files.
+            max_workers: Maximum number of files read at once.
+            
+        Returns:
+            List of file information dictionaries, in the same order as file_paths.
+        """
+        if len(file_paths) < 2:
+            return [self.get_excel_info(path) for path in file_paths]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+            return list(executor.map(self.get_excel_info, file_paths))
+    
     def save_dataframe_to_excel(self, df: pd.DataFrame, file_path: str, sheet_name: str = "Sheet1") -> bool:
         """
         Save a DataFrame to an Excel file.
@@ -139,7 +315,23 @@ class ExcelHandler:
         """
         try:
             abs_path = self.resolve_path(file_path)
-            df.to_excel(abs_path, sheet_name=sheet_name, index=False)
+            _release_excel_file(abs_path)
+            
+            # Stream rows through a write-only workbook; df.to_excel goes through
+            # pandas' per-cell styling formatter, which dominates on large frames
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet(sheet_name)
+            header = []
+            for name in df.columns:
+                cell = WriteOnlyCell(ws, value=name)
+                cell.font = _HEADER_FONT
+                cell.border = _HEADER_BORDER
+                cell.alignment = _HEADER_ALIGNMENT
+                header.append(cell)
+            ws.append(header)
+            for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+                ws.append(row)
+            wb.save(abs_path)
             logger.info(f"Successfully saved DataFrame to {file_path}")
             return True
         except Exception as e:
@@ -183,6 +375,7 @@ class ExcelHandler:
         """
         try:
             abs_path = self.resolve_path(file_path)
+            _release_excel_file(abs_path)
             wb = openpyxl.load_workbook(abs_path)
             
             if sheet_name not in wb.sheetnames:
@@ -204,19 +397,14 @@ class ExcelHandler:
                 
             # Parse data range
             try:
-                # Simple parsing for ranges like "A1:B10"
-                data_parts = data_range.split(":")
-                if len(data_parts) != 2:
+                # Simple parsing for ranges like "A1:B10" (absolute "$A$1" refs allowed)
+                range_match = _RANGE_RE.fullmatch(data_range.strip().upper())
+                if not range_match:
                     raise ValueError(f"Invalid data range format: {data_range}")
                     
-                from openpyxl.utils import column_index_from_string
-                
                 # Extract column letters and row numbers
-                start_col_letter = ''.join(c for c in data_parts[0] if c.isalpha())
-                start_row = int(''.join(c for c in data_parts[0] if c.isdigit()))
-                
-                end_col_letter = ''.join(c for c in data_parts[1] if c.isalpha())
-                end_row = int(''.join(c for c in data_parts[1] if c.isdigit()))
+                start_col_letter, start_row, end_col_letter, end_row = range_match.groups()
+                start_row, end_row = int(start_row), int(end_row)
                 
                 # Convert column letters to indices
                 start_col = column_index_from_string(start_col_letter)
@@ -265,6 +453,7 @@ class ExcelHandler:
         """
         try:
             # Connect to Excel application
+            _release_excel_file(self.resolve_path(file_path))
             book = self.connect_to_excel_app(file_path)
             if not book:
                 return None
@@ -272,11 +461,17 @@ class ExcelHandler:
             # Get the worksheet
             sheet = book.sheets[sheet_name]
             
-            # Apply formula to cell
-            sheet.range(cell).formula = formula
-            
-            # Get the result
-            result = sheet.range(cell).value
+            # Suspend redraws and automatic recalculation while writing, then
+            # calculate once; each property access is a COM round trip
+            app = book.app
+            with app.properties(screen_updating=False, calculation="manual"):
+                # Apply formula to cell
+                target = sheet.range(cell)
+                target.formula = formula
+                app.calculate()
+                
+                # Get the result
+                result = target.value
             
             # Save and close
             book.save()
@@ -288,6 +483,38 @@ class ExcelHandler:
             logger.error(f"Error running Excel formula: {e}")
             return None
 
+    def read_range_2d(self, book: xw.Book, sheet_name: str, cell_range: str) -> List[List[Any]]:
+        """
+        Read a block of cells in a single call to Excel.
+        
+        Per-cell reads through xlwings cost one cross-process round trip each;
+        reading the whole range as a 2-D list costs one.
+        
+        Args:
+            book: Open xlwings Book.
+            sheet_name: Name of the sheet.
+            cell_range: Range to read (e.g., "A1:D100").
+            
+        Returns:
+            Rows of cell values, always as a list of lists.
+        """
+        return book.sheets[sheet_name].range(cell_range).options(ndim=2).value
+    
+    def write_range_2d(self, book: xw.Book, sheet_name: str, cell_range: str, data: List[List[Any]]) -> None:
+        """
+        Write a block of cells in a single call to Excel.
+        
+        Screen updating and automatic recalculation are suspended for the write.
+        
+        Args:
+            book: Open xlwings Book.
+            sheet_name: Name of the sheet.
+            cell_range: Top-left cell or full range to write (e.g., "A1").
+            data: Rows of values to write.
+        """
+        with book.app.properties(screen_updating=False, calculation="manual"):
+            book.sheets[sheet_name].range(cell_range).options(ndim=2).value = data
+
     def analyze_excel_data(self, df: pd.DataFrame, analysis_type: str = "summary") -> Dict[str, Any]:
         """
         Analyze Excel data with various statistical methods.
@@ -324,35 +551,60 @@ class ExcelHandler:
                     result["error"] = "No numeric columns available for correlation analysis"
                     return result
                     
-                result["correlation"] = numeric_cols.corr().to_dict()
+                # Complete data goes straight to NumPy's BLAS-backed corrcoef;
+                # pandas' pairwise path is only needed to skip missing values
+                values = numeric_cols.to_numpy(dtype=np.float64, na_value=np.nan)
+                if len(values) > 1 and not np.isnan(values).any():
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        matrix = np.atleast_2d(np.corrcoef(values, rowvar=False))
+                    corr = pd.DataFrame(matrix, index=numeric_cols.columns, columns=numeric_cols.columns)
+                else:
+                    corr = numeric_cols.corr()
+                    
+                result["correlation"] = corr.to_dict()
                 
             elif analysis_type == "descriptive":
-                # Descriptive statistics for each column
+                # Descriptive statistics for each column, computed frame-wide in
+                # one pass per statistic instead of once per column
                 result["descriptive"] = {}
                 
+                null_counts = df.isnull().sum()
+                unique_counts = df.nunique()
+                
+                numeric_df = df.select_dtypes(include=["number"])
+                numeric_stats = numeric_df.agg(["min", "max", "mean", "median", "std"])
+                
+                object_df = df.select_dtypes(include=[object])
+                avg_lengths = object_df.astype(str).apply(lambda col: col.str.len().mean())
+                
                 for column in df.columns:
-                    col_data = df[column]
-                    col_stats = {}
-                    
                     # Basic statistics
-                    col_stats["count"] = len(col_data)
-                    col_stats["null_count"] = col_data.isnull().sum()
-                    col_stats["unique_values"] = col_data.nunique()
+                    col_stats = {
+                        "count": len(df),
+                        "null_count": null_counts[column],
+                        "unique_values": unique_counts[column]
+                    }
                     
                     # For numeric columns
-                    if np.issubdtype(col_data.dtype, np.number):
-                        col_stats["min"] = col_data.min()
-                        col_stats["max"] = col_data.max()
-                        col_stats["mean"] = col_data.mean()
-                        col_stats["median"] = col_data.median()
-                        col_stats["std_dev"] = col_data.std()
+                    if column in numeric_stats.columns:
+                        stats = numeric_stats[column]
+                        # min/max keep the column's own type (agg upcasts int columns to float);
+                        # an empty or all-NA column has no value to cast
+                        dtype = numeric_df[column].dtype
+                        int_type = dtype.type if dtype.kind in "iu" else None
+                        for key in ("min", "max"):
+                            value = stats[key]
+                            col_stats[key] = int_type(value) if int_type and pd.notna(value) else value
+                        col_stats["mean"] = stats["mean"]
+                        col_stats["median"] = stats["median"]
+                        col_stats["std_dev"] = stats["std"]
                         
                     # For string columns
-                    elif col_data.dtype == object:
+                    elif column in avg_lengths.index:
                         # Sample of unique values (up to 5)
-                        unique_vals = col_data.dropna().unique()
+                        unique_vals = df[column].dropna().unique()
                         col_stats["sample_values"] = list(unique_vals[:5])
-                        col_stats["avg_length"] = col_data.astype(str).str.len().mean()
+                        col_stats["avg_length"] = avg_lengths[column]
                         
                     result["descriptive"][column] = col_stats
                     
@@ -400,8 +652,10 @@ class ExcelHandler:
             Path to the saved chart image or error message.
         """
         try:
-            # Create figure and axes
-            plt.figure(figsize=(10, 6))
+            # Create figure and axes. A standalone Figure renders straight to Agg and
+            # never enters pyplot's global figure registry, so nothing leaks between calls
+            fig = Figure(figsize=(10, 6))
+            ax = fig.subplots()
             
             # Ensure x_column and y_column exist in the DataFrame
             if x_column not in df.columns:
@@ -409,8 +663,8 @@ class ExcelHandler:
             if y_column not in df.columns:
                 return f"Error: Column '{y_column}' not found in DataFrame"
                 
-            # Make a copy to avoid modifying the original DataFrame
-            plot_df = df.copy()
+            # Copy only the plotted columns to avoid modifying the original DataFrame
+            plot_df = df[list(dict.fromkeys((x_column, y_column)))].copy()
             
             # Convert y_column to numeric, handling errors
             plot_df[y_column] = pd.to_numeric(plot_df[y_column], errors='coerce')
@@ -420,45 +674,58 @@ class ExcelHandler:
             if plot_df.empty:
                 return f"Error: No valid data points remain after processing. Check if '{y_column}' contains valid numeric values."
             
-            # Convert x_column to string to avoid comparison issues in pie charts
-            plot_df[x_column] = plot_df[x_column].astype(str)
+            # Categorical axes (bar, pie) and mixed-type columns are stringified to avoid
+            # comparison issues; numeric and datetime x values stay native so matplotlib
+            # plots them vectorized and in their natural order
+            x_values = plot_df[x_column]
+            if chart_type in ("bar", "pie") or not (
+                pd.api.types.is_numeric_dtype(x_values) or pd.api.types.is_datetime64_any_dtype(x_values)
+            ):
+                plot_df[x_column] = x_values.astype(str)
             
             # Generate the chart based on type
             if chart_type == "bar":
                 # Group data for bar charts to handle duplicate x values
                 if len(plot_df) > 1:
-                    grouped_df = plot_df.groupby(x_column)[y_column].sum().reset_index()
-                    grouped_df.plot(kind='bar', x=x_column, y=y_column, title=title, legend=True)
+                    grouped_df = plot_df.groupby(x_column, sort=False)[y_column].sum().reset_index()
+                    grouped_df.plot(kind='bar', x=x_column, y=y_column, title=title, legend=True, ax=ax)
                 else:
-                    plot_df.plot(kind='bar', x=x_column, y=y_column, title=title, legend=True)
+                    plot_df.plot(kind='bar', x=x_column, y=y_column, title=title, legend=True, ax=ax)
             elif chart_type == "line":
-                # Sort data for line charts by x_column if it's date-like
+                # Sort data for line charts by x_column if it's numeric or date-like (these
+                # keep their native dtype, so unsorted rows would zigzag along the x axis)
                 try:
-                    if pd.api.types.is_datetime64_any_dtype(df[x_column]):
+                    x_values = plot_df[x_column]
+                    if pd.api.types.is_numeric_dtype(x_values) or pd.api.types.is_datetime64_any_dtype(x_values):
                         plot_df = plot_df.sort_values(by=x_column)
                 except:
                     pass  # If sorting fails, continue with unsorted data
-                plot_df.plot(kind='line', x=x_column, y=y_column, title=title, legend=True)
+                plot_df.plot(kind='line', x=x_column, y=y_column, title=title, legend=True, ax=ax)
             elif chart_type == "scatter":
-                plot_df.plot(kind='scatter', x=x_column, y=y_column, title=title, legend=True)
+                plot_df.plot(kind='scatter', x=x_column, y=y_column, title=title, legend=True, ax=ax)
             elif chart_type == "pie":
                 # For pie charts, we need to group by x_column and sum y_column
-                pie_data = plot_df.groupby(x_column)[y_column].sum()
+                pie_data = plot_df.groupby(x_column, sort=False)[y_column].sum()
                 if pie_data.empty:
                     return f"Error: No data to plot after grouping. Check if data contains valid groups."
-                pie_data.plot(kind='pie', autopct='%1.1f%%', title=title)
+                pie_data.plot(kind='pie', autopct='%1.1f%%', title=title, ax=ax)
             elif chart_type == "hist":
                 if plot_df[y_column].dropna().empty:
                     return f"Error: No valid data points for histogram. Column '{y_column}' has no valid numeric values."
-                plot_df[y_column].plot(kind='hist', title=title, legend=True)
+                plot_df[y_column].plot(kind='hist', title=title, legend=True, ax=ax)
             else:
                 return f"Error: Unsupported chart type '{chart_type}'"
             
             # Add labels and title
-            plt.xlabel(x_column)
-            plt.ylabel(y_column)
-            plt.title(title)
-            plt.tight_layout()
+            ax.set_xlabel(x_column)
+            ax.set_ylabel(y_column)
+            ax.set_title(title)
+            if chart_type in ("bar", "pie"):
+                # Category labels vary in length, so let the layout solver fit them
+                fig.tight_layout()
+            else:
+                # Numeric/date tick labels fit fixed margins; skips the iterative solver
+                fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15)
             
             # Save the chart to a file
             import tempfile
@@ -469,8 +736,7 @@ class ExcelHandler:
             chart_file = os.path.join(temp_dir, f"excel_chart_{os.getpid()}.png")
             
             # Save the chart
-            plt.savefig(chart_file)
-            plt.close()
+            fig.savefig(chart_file)
             
             logger.info(f"Chart saved to {chart_file}")
             return chart_file
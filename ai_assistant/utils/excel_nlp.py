@@ -1,36 +1,98 @@
 import re
+import copy
 import logging
+from collections import OrderedDict
 import pandas as pd
 from typing import Dict, Any, List, Tuple, Optional
 from .excel_handler import ExcelHandler
 
 logger = logging.getLogger("ai_assistant")
 
+# Patterns for common operations, compiled once at import since the app builds a
+# new processor for every /excel command
+_PATTERNS = {
+    "show_file": re.compile(r"(?:show|open|display|view)\s+(?:the\s+)?(?:excel|spreadsheet|file)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
+    "list_files": re.compile(r"(?:list|show|find)\s+(?:all\s+)?(?:excel|spreadsheet)s?(?:\s+in\s+([^\n]+?))?(?:\s|$)", re.I),
+    "extract_data": re.compile(r"(?:extract|get|find|show)\s+(?:data|information|rows|columns)\s+(?:from|in)\s+(?:the\s+)?(?:excel|spreadsheet|file)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
+    "analyze": re.compile(r"(?:analyze|summarize|describe)\s+(?:the\s+)?(?:excel|spreadsheet|file|data)\s+(?:(?:in|from)\s+)?(?:the\s+)?(?:excel|spreadsheet|file)?\s*(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
+    "create_chart": re.compile(r"(?:create|make|generate|plot)\s+(?:a\s+)?(\w+)(?:\s+chart|\s+graph|\s+plot)(?:\s+(?:from|in|of|using)\s+)?(?:the\s+)?(?:excel|spreadsheet|file|data)?\s*(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
+    "filter_data": re.compile(r"(?:filter|query|find|show)\s+(?:rows|data|information)(?:\s+(?:where|with)\s+)?(.+?)(?:\s+(?:from|in)\s+)?(?:the\s+)?(?:excel|spreadsheet|file)?\s*(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
+}
+
+# Sub-patterns used while filling in the details of a matched operation
+_SHEET_RE = re.compile(r"(?:sheet|tab)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I)
+_COLUMNS_RE = re.compile(r"(?:columns?|fields?)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I)
+_ROW_LIMIT_RE = re.compile(r"(?:top|first)\s+(\d+)(?:\s+rows?)?", re.I)
+_X_COL_RE = re.compile(r"(?:x(?:-axis)?|horizontal)\s+(?:is|as|with|using)\s+(?:the\s+)?(?:column\s+)?[\"\']?([^\"\'\n,]+(?:\s+[^\"\'\n,]+)*)[\"\']?(?:\s|$)", re.I)
+_Y_COL_RE = re.compile(r"(?:y(?:-axis)?|vertical)\s+(?:is|as|with|using)\s+(?:the\s+)?(?:column\s+)?[\"\']?([^\"\'\n,]+(?:\s+[^\"\'\n,]+)*)[\"\']?(?:\s|$)", re.I)
+_TITLE_RE = re.compile(r"(?:title|named|called)\s+[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I)
+# Keyword checks for general queries. Each is one scan over the query with the same
+# substring semantics as chained `in` tests ("spreadsheet" is covered by "sheet")
+_EXCEL_KEYWORD_RE = re.compile(r"excel|sheet|workbook|cell")
+_CREATE_WORD_RE = re.compile(r"create|new")
+_SHOW_WORD_RE = re.compile(r"open|show|display")
+_DELETE_WORD_RE = re.compile(r"delete|remove")
+_FILE_NAME_RE = re.compile(r"[\w\-\s]+\.xlsx?")
+# Map common phrases to operators. They are matched longest first in a single
+# alternation so "greater than or equal to" isn't half-rewritten by "greater than"
+_OPERATOR_MAP = {
+    "greater than": ">",
+    "less than": "<",
+    "equal to": "==",
+    "equals": "==",
+    "equal": "==",
+    "not equal to": "!=",
+    "not equals": "!=",
+    "at least": ">=",
+    "greater than or equal to": ">=",
+    "at most": "<=",
+    "less than or equal to": "<="
+}
+_OPERATOR_RE = re.compile("|".join(map(re.escape, sorted(_OPERATOR_MAP, key=len, reverse=True))))
+_AND_RE = re.compile(r'\band\b')
+_OR_RE = re.compile(r'\bor\b')
+_COL_OP_RE = re.compile(r'([a-zA-Z0-9_\s]+)\s*([<>=!]+)')
+
+# Parsed commands keyed by query string, shared by all processor instances
+_PARSE_CACHE_SIZE = 256
+_parse_cache = OrderedDict()
+
 class ExcelNLProcessor:
     """Process natural language commands for Excel operations."""
     
     def __init__(self):
         """Initialize the Excel NL processor."""
         # Patterns for common operations
-        self.patterns = {
-            "show_file": re.compile(r"(?:show|open|display|view)\s+(?:the\s+)?(?:excel|spreadsheet|file)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
-            "list_files": re.compile(r"(?:list|show|find)\s+(?:all\s+)?(?:excel|spreadsheet)s?(?:\s+in\s+([^\n]+?))?(?:\s|$)", re.I),
-            "extract_data": re.compile(r"(?:extract|get|find|show)\s+(?:data|information|rows|columns)\s+(?:from|in)\s+(?:the\s+)?(?:excel|spreadsheet|file)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
-            "analyze": re.compile(r"(?:analyze|summarize|describe)\s+(?:the\s+)?(?:excel|spreadsheet|file|data)\s+(?:(?:in|from)\s+)?(?:the\s+)?(?:excel|spreadsheet|file)?\s*(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
-            "create_chart": re.compile(r"(?:create|make|generate|plot)\s+(?:a\s+)?(\w+)(?:\s+chart|\s+graph|\s+plot)(?:\s+(?:from|in|of|using)\s+)?(?:the\s+)?(?:excel|spreadsheet|file|data)?\s*(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
-            "filter_data": re.compile(r"(?:filter|query|find|show)\s+(?:rows|data|information)(?:\s+(?:where|with)\s+)?(.+?)(?:\s+(?:from|in)\s+)?(?:the\s+)?(?:excel|spreadsheet|file)?\s*(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", re.I),
-        }
+        self.patterns = _PATTERNS
         
     def parse_command(self, query: str) -> Dict[str, Any]:
         """
         Parse a natural language query into an Excel operation.
         
+        Results are memoized per query string, since parsing is deterministic
+        and commands are often repeated within a session.
+        
         Args:
             query: Natural language query.
             
         Returns:
             Dictionary with the parsed operation details.
         """
+        cached = _parse_cache.get(query)
+        if cached is None:
+            cached = self._parse_command(query)
+            if cached["operation"] == "error":
+                return cached
+            _parse_cache[query] = cached
+            if len(_parse_cache) > _PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        else:
+            _parse_cache.move_to_end(query)
+        # Callers get their own copy so they can't alter the cached result
+        return copy.deepcopy(cached)
+        
+    def _parse_command(self, query: str) -> Dict[str, Any]:
+        """Parse a query without consulting the cache."""
         try:
             # Check for list files pattern
             list_match = self.patterns["list_files"].search(query)
@@ -46,7 +108,7 @@ class ExcelNLProcessor:
             if show_match:
                 file_name = show_match.group(1)
                 # Check for sheet specification
-                sheet_match = re.search(r"(?:sheet|tab)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", query, re.I)
+                sheet_match = _SHEET_RE.search(query)
                 sheet_name = sheet_match.group(1) if sheet_match else None
                 
                 return {
@@ -61,11 +123,11 @@ class ExcelNLProcessor:
                 file_name = extract_match.group(1)
                 
                 # Look for column specification
-                columns_match = re.search(r"(?:columns?|fields?)\s+(?:called\s+)?[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", query, re.I)
+                columns_match = _COLUMNS_RE.search(query)
                 columns = columns_match.group(1).split(",") if columns_match else None
                 
                 # Look for row limits
-                row_limit_match = re.search(r"(?:top|first)\s+(\d+)(?:\s+rows?)?", query, re.I)
+                row_limit_match = _ROW_LIMIT_RE.search(query)
                 row_limit = int(row_limit_match.group(1)) if row_limit_match else None
                 
                 return {
@@ -82,9 +144,10 @@ class ExcelNLProcessor:
                 
                 # Determine analysis type
                 analysis_type = "summary"  # Default
-                if "correlat" in query.lower():
+                query_lower = query.lower()
+                if "correlat" in query_lower:
                     analysis_type = "correlation"
-                elif "descri" in query.lower():
+                elif "descri" in query_lower:
                     analysis_type = "descriptive"
                     
                 return {
@@ -100,14 +163,14 @@ class ExcelNLProcessor:
                 file_name = chart_match.group(2)
                 
                 # Look for column specifications (improved pattern to handle spaces and special characters)
-                x_col_match = re.search(r"(?:x(?:-axis)?|horizontal)\s+(?:is|as|with|using)\s+(?:the\s+)?(?:column\s+)?[\"\']?([^\"\'\n,]+(?:\s+[^\"\'\n,]+)*)[\"\']?(?:\s|$)", query, re.I)
-                y_col_match = re.search(r"(?:y(?:-axis)?|vertical)\s+(?:is|as|with|using)\s+(?:the\s+)?(?:column\s+)?[\"\']?([^\"\'\n,]+(?:\s+[^\"\'\n,]+)*)[\"\']?(?:\s|$)", query, re.I)
+                x_col_match = _X_COL_RE.search(query)
+                y_col_match = _Y_COL_RE.search(query)
                 
                 x_column = x_col_match.group(1).strip() if x_col_match else None
                 y_column = y_col_match.group(1).strip() if y_col_match else None
                 
                 # Look for title
-                title_match = re.search(r"(?:title|named|called)\s+[\"\']?([^\"\'\n]+?)[\"\']?(?:\s|$)", query, re.I)
+                title_match = _TITLE_RE.search(query)
                 title = title_match.group(1) if title_match else f"{chart_type.capitalize()} Chart"
                 
                 return {
@@ -154,22 +217,22 @@ class ExcelNLProcessor:
         query_lower = query.lower()
         
         # Check for Excel-related keywords
-        if any(word in query_lower for word in ["excel", "spreadsheet", "workbook", "sheet", "cell"]):
+        if _EXCEL_KEYWORD_RE.search(query_lower):
             # Extract potential file names
-            file_matches = re.findall(r"[\w\-\s]+\.xlsx?", query)
+            file_matches = _FILE_NAME_RE.findall(query)
             file_name = file_matches[0] if file_matches else None
             
-            if "create" in query_lower or "new" in query_lower:
+            if _CREATE_WORD_RE.search(query_lower):
                 return {
                     "operation": "create_file",
                     "file_name": file_name
                 }
-            elif "open" in query_lower or "show" in query_lower or "display" in query_lower:
+            elif _SHOW_WORD_RE.search(query_lower):
                 return {
                     "operation": "show_file",
                     "file_name": file_name
                 }
-            elif "delete" in query_lower or "remove" in query_lower:
+            elif _DELETE_WORD_RE.search(query_lower):
                 return {
                     "operation": "delete_file",
                     "file_name": file_name
@@ -199,33 +262,15 @@ class ExcelNLProcessor:
             Pandas query string.
         """
         try:
-            # Map common phrases to operators
-            operator_map = {
-                "greater than": ">",
-                "less than": "<",
-                "equal to": "==",
-                "equals": "==",
-                "equal": "==",
-                "not equal to": "!=",
-                "not equals": "!=",
-                "at least": ">=",
-                "greater than or equal to": ">=",
-                "at most": "<=",
-                "less than or equal to": "<="
-            }
-            
-            # Replace phrases with operators
-            query = conditions
-            for phrase, operator in operator_map.items():
-                query = query.replace(phrase, operator)
+            # Replace phrases with operators in one pass
+            query = _OPERATOR_RE.sub(lambda m: _OPERATOR_MAP[m.group(0)], conditions)
                 
             # Replace "and" with "&" and "or" with "|"
-            query = re.sub(r'\band\b', '&', query)
-            query = re.sub(r'\bor\b', '|', query)
+            query = _AND_RE.sub('&', query)
+            query = _OR_RE.sub('|', query)
             
             # Ensure column names with spaces are properly quoted
-            col_pattern = re.compile(r'([a-zA-Z0-9_\s]+)\s*([<>=!]+)')
-            query = col_pattern.sub(r'`\1` \2', query)
+            query = _COL_OP_RE.sub(r'`\1` \2', query)
             
             return query
             
@@ -9,6 +9,9 @@ import os
 # Define the logger
 logger = logging.getLogger("ai_assistant")
 
+# Trailing recursion keywords that the list_directory patterns capture into the path
+_RECURSIVE_SUFFIX_RE = re.compile(r"(?:^|\s+)(?:recursively|recursive|(?:and|with|including)\s+subfolders)$")
+
 class FileIntentParser:
     """
     Parse natural language requests for file operations.
@@ -99,25 +102,32 @@ class FileIntentParser:
             return None
             
         # Debug: Log the text being parsed
-        logger.info(f"Parsing file intent from: '{text}'")
+        logger.info("Parsing file intent from: '%s'", text)
             
         # Try to match patterns for different operations
         for operation, patterns in self.patterns.items():
             for pattern in patterns:
                 match = re.search(pattern, text, re.IGNORECASE)
                 if match:
-                    logger.info(f"Matched file intent: {operation} with pattern: {pattern}")
+                    logger.info("Matched file intent: %s with pattern: %s", operation, pattern)
                     
                     # Extract parameters based on the operation
                     params = {}
                     
                     if operation == "list_directory":
                         # Check if it's for current directory
+                        # Only a trailing keyword asks for recursion, not one inside a folder name
                         if "current" in match.group(0) or "this" in match.group(0):
                             params["path"] = None
+                            params["recursive"] = bool(_RECURSIVE_SUFFIX_RE.search(text.strip()))
                         else:
                             path = match.group(1).strip() if match.groups() else None
+                            stripped = 0
+                            if path:
+                                path, stripped = _RECURSIVE_SUFFIX_RE.subn("", path)
+                                path = path.strip()
                             params["path"] = path if path else None
+                            params["recursive"] = bool(stripped)
                     
                     elif operation == "create_directory":
                         params["path"] = match.group(1).strip()
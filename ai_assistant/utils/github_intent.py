@@ -77,14 +77,14 @@ class GitHubIntentParser:
             return None
             
         # Debug: Log the text being parsed
-        logger.info(f"Parsing GitHub intent from: '{text}'")
+        logger.info("Parsing GitHub intent from: '%s'", text)
             
         # Try to match patterns for different operations
         for operation, patterns in self.patterns.items():
             for pattern in patterns:
                 match = re.search(pattern, text, re.IGNORECASE)
                 if match:
-                    logger.info(f"Matched GitHub intent: {operation} with pattern: {pattern}")
+                    logger.info("Matched GitHub intent: %s with pattern: %s", operation, pattern)
                     
                     # Extract parameters based on the operation
                     params = {}
@@ -3,43 +3,81 @@ Desktop screenshot utility for the AI Assistant.
 """
 
 import time
+import zlib
+import atexit
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from PIL import ImageGrab
-import base64
+import binascii
 from cv2 import imencode
 
+# mss grabs straight into a BGRA buffer, skipping PIL's RGB image and the
+# RGB->BGR conversion; fall back to ImageGrab when it isn't installed
+try:
+    import mss
+except ImportError:
+    mss = None
+
+# pybase64 dispatches to SIMD kernels at runtime, well ahead of the stdlib codec
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 logger = logging.getLogger("ai_assistant")
 
-def encode_image(image):
+def encode_image(image, quality=80):
     """
     Encode an image to base64 for use with AI models.
     
     Args:
         image (numpy.ndarray): Image as a numpy array
+        quality (int): JPEG quality (0-100)
         
     Returns:
-        str: Base64-encoded image
+        str: Base64-encoded JPEG image
     """
-    _, buffer = imencode(".jpeg", image)
-    return base64.b64encode(buffer).decode()
+    # The models receive this as image/jpeg; optimized Huffman tables trim the
+    # payload further at no quality cost
+    _, buffer = imencode(".jpeg", image, [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1])
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(buffer)
+    # b2a_base64 reads the encoder's array through the buffer protocol; ASCII decode
+    # is the cheapest str conversion for base64 output
+    return binascii.b2a_base64(buffer, newline=False).decode("ascii")
 
 class DesktopScreenshot:
     """
     Utility for capturing and managing desktop screenshots.
     
     Attributes:
-        screenshot (numpy.ndarray): The captured screenshot
+        screenshot (numpy.ndarray): The captured screenshot (BGR, or BGRA when grabbed with mss)
         cached_image (str): Base64-encoded cached screenshot
         last_capture_time (float): Timestamp of the last capture
+        jpeg_quality (int): JPEG quality used when encoding captures
     """
     
-    def __init__(self):
-        """Initialize the desktop screenshot utility."""
+    def __init__(self, jpeg_quality=80):
+        """
+        Initialize the desktop screenshot utility.
+        
+        Args:
+            jpeg_quality (int): JPEG quality (0-100) for encoded captures
+        """
+        self.jpeg_quality = jpeg_quality
         self.screenshot = None
         self.cached_image = None
         self.last_capture_time = 0
+        self._frame_crc = None
+        # mss grabbers hold OS handles (device contexts) that must stay on the thread
+        # that opened them, so each capturing thread keeps its own
+        self._local = threading.local()
+        self._grabbers = []
+        self._executor = None
+        atexit.register(self.close)
         
     def capture(self, force_new=False):
         """
@@ -58,18 +96,65 @@ class DesktopScreenshot:
             
         try:
             # Capture the screenshot
-            pil_screenshot = ImageGrab.grab()
+            self.screenshot = self._grab()
             
-            # Convert to numpy array and store the raw screenshot
-            self.screenshot = np.array(pil_screenshot)
-            
-            # Convert to BGR for OpenCV operations
-            screenshot_bgr = cv2.cvtColor(self.screenshot, cv2.COLOR_RGB2BGR)
-            
-            # Encode for API usage
-            self.cached_image = encode_image(screenshot_bgr)
+            # An idle desktop yields identical frames; a CRC over the pixels costs far
+            # less than the JPEG encode it lets us skip
+            frame_crc = zlib.crc32(self.screenshot)
+            if frame_crc != self._frame_crc or not self.cached_image:
+                # Encode for API usage (the JPEG encoder drops the alpha channel itself)
+                self.cached_image = encode_image(self.screenshot, self.jpeg_quality)
+                self._frame_crc = frame_crc
             self.last_capture_time = current_time
             return self.cached_image
         except Exception as e:
             logger.error(f"Screenshot capture error: {e}")
             return None
+
+    def capture_async(self, force_new=False):
+        """
+        Start a capture in the background, e.g. while waiting on user input.
+        
+        Captures run on a single worker thread, so they serialize cleanly.
+        
+        Args:
+            force_new (bool): Force a new capture even if a recent one exists
+            
+        Returns:
+            concurrent.futures.Future: Resolves to the base64-encoded screenshot
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+        return self._executor.submit(self.capture, force_new)
+
+    def _grab(self):
+        """
+        Grab the primary screen as an OpenCV-ordered array.
+        
+        Returns:
+            numpy.ndarray: BGRA frame from mss, or BGR frame from PIL's ImageGrab
+        """
+        if mss is not None:
+            sct = getattr(self._local, "sct", None)
+            if sct is None:
+                sct = self._local.sct = mss.mss()
+                self._local.monitor = sct.monitors[1]
+                self._grabbers.append(sct)
+            shot = sct.grab(self._local.monitor)
+            # Wrap the grab's own pixel buffer; .bgra would make a bytes copy
+            return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        
+        # Convert PIL's RGB capture to BGR for OpenCV operations
+        return cv2.cvtColor(np.array(ImageGrab.grab()), cv2.COLOR_RGB2BGR)
+
+    def close(self):
+        """Release the capture worker and the screen grabbers' OS handles."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        while self._grabbers:
+            try:
+                self._grabbers.pop().close()
+            except Exception as e:
+                logger.debug(f"Error closing screen grabber: {e}")
+        self._local = threading.local()
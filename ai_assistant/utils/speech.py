@@ -2,17 +2,33 @@
 Speech recognition utility for the AI Assistant.
 """
 
+import io
 import speech_recognition as sr
 import logging
 
+# Optional offline transcription (CTranslate2 int8 kernels); without it we use
+# Google's web recognizer
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
 logger = logging.getLogger("ai_assistant")
 
+WHISPER_MODEL = "base.en"
+
 class SpeechRecognizer:
     """Class for handling speech recognition."""
     
     def __init__(self):
         """Initialize the speech recognizer."""
         self.recognizer = sr.Recognizer()
+        # Built once so the default input device is only probed once; each listen still opens a new PyAudio stream
+        self.microphone = None
+        self.calibrated = False
+        self.whisper_model = None
+        # Cleared after the first local failure so later calls go straight to Google
+        self.use_whisper = WhisperModel is not None
     
     def listen(self):
         """
@@ -22,15 +38,24 @@ class SpeechRecognizer:
             str: Recognized speech text or None if not recognized
         """
         try:
-            with sr.Microphone() as source:
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source)
+            if self.microphone is None:
+                self.microphone = sr.Microphone()
+                
+            with self.microphone as source:
+                # Calibrate for ambient noise once; the dynamic threshold keeps
+                # adapting during later listens without blocking on a sample
+                if not self.calibrated:
+                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                    self.recognizer.dynamic_energy_threshold = True
+                    self.calibrated = True
                 
                 # Listen for audio input
                 audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
                 
-                # Recognize speech using Google Speech Recognition
-                text = self.recognizer.recognize_google(audio)
+                # Recognize speech offline when possible, else via Google
+                text = self._transcribe(audio)
+                if not text:
+                    return None
                 
                 # Improve GitHub term recognition
                 text = text.replace("get hub", "github")
@@ -53,6 +78,28 @@ class SpeechRecognizer:
             logger.error(f"Speech recognition error: {e}")
             return None
     
+    def _transcribe(self, audio):
+        """
+        Transcribe captured audio, preferring the local Whisper model.
+        
+        Args:
+            audio (sr.AudioData): Audio captured from the microphone
+            
+        Returns:
+            str: Transcribed text
+        """
+        if self.use_whisper:
+            try:
+                if self.whisper_model is None:
+                    self.whisper_model = WhisperModel(WHISPER_MODEL, compute_type="int8")
+                segments, _ = self.whisper_model.transcribe(io.BytesIO(audio.get_wav_data()), vad_filter=True)
+                return " ".join(segment.text.strip() for segment in segments)
+            except Exception as e:
+                logger.warning(f"Offline transcription failed, using Google from now on: {e}")
+                self.use_whisper = False
+        
+        return self.recognizer.recognize_google(audio)
+    
     def listen_and_recognize(self):
         """
         Listen for speech and recognize it.
@@ -63,6 +110,9 @@ class SpeechRecognizer:
         """
         return self.listen()
 
+# Shared recognizer for the standalone function, so its calibration carries over
+_speech_recognizer = None
+
 # Keep the standalone function for backward compatibility
 def listen_for_speech():
     """
@@ -71,5 +121,7 @@ def listen_for_speech():
     Returns:
         str: Recognized speech text or None if not recognized
     """
-    recognizer = SpeechRecognizer()
-    return recognizer.listen()
+    global _speech_recognizer
+    if _speech_recognizer is None:
+        _speech_recognizer = SpeechRecognizer()
+    return _speech_recognizer.listen()
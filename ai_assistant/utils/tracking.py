@@ -6,26 +6,56 @@ Tracks the number of systems where QuackQuery is installed.
 import os
 import uuid
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import platform
 import logging
 import json
 from pathlib import Path
 import threading
+from .. import __version__
 
 logger = logging.getLogger("ai_assistant")
 
 # Configuration
 TRACKING_URL = "https://api.quackquery.com/track"  # Replace with your actual tracking endpoint
 BACKUP_TRACKING_URL = "https://quackquery-tracking.herokuapp.com/track"  # Backup URL
+# (connect, read) timeouts: fail fast on unreachable hosts, allow a slower reply
+TRACKING_TIMEOUT = (1.0, 3.0)
+STATS_TIMEOUT = (1.0, 5.0)
+# Upper bound on how much of a response body we read
+MAX_RESPONSE_BYTES = 64 * 1024
 
 class InstallationTracker:
     """Tracks installations of QuackQuery."""
     
     def __init__(self):
         """Initialize the installation tracker."""
-        self.installation_id = self._get_or_create_installation_id()
         self.user_home = str(Path.home())
         self.config_dir = os.path.join(self.user_home, ".quackquery")
+        self.installation_id = self._get_or_create_installation_id()
+        self._session = self._create_session()
+        
+    def _create_session(self):
+        """
+        Create a pooled HTTP session for the tracking endpoints.
+        
+        Returns:
+            requests.Session: Session with keep-alive connections and a single retry
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=1, backoff_factor=0.1)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "Content-Type": "application/json",
+            "User-Agent": f"quackquery/{__version__}"
+        })
+        return session
         
     def _get_or_create_installation_id(self):
         """
@@ -34,25 +64,27 @@ class InstallationTracker:
         Returns:
             str: Installation ID
         """
+        # Installation ID file
+        id_file = os.path.join(self.config_dir, "installation_id")
         try:
-            # Create config directory if it doesn't exist
-            user_home = str(Path.home())
-            config_dir = os.path.join(user_home, ".quackquery")
-            if not os.path.exists(config_dir):
-                os.makedirs(config_dir)
-                
-            # Installation ID file
-            id_file = os.path.join(config_dir, "installation_id")
-            
-            # Check if ID already exists
-            if os.path.exists(id_file):
-                with open(id_file, 'r') as f:
-                    return f.read().strip()
+            # Every run after the first takes this path: a single open + read
+            try:
+                installation_id = Path(id_file).read_text().strip()
+                if installation_id:
+                    return installation_id
+            except FileNotFoundError:
+                pass
             
             # Create new ID if it doesn't exist
+            os.makedirs(self.config_dir, exist_ok=True)
             installation_id = str(uuid.uuid4())
-            with open(id_file, 'w') as f:
+            
+            # Write to a temp file and rename so a concurrent or interrupted run
+            # never sees a partial ID
+            tmp_file = f"{id_file}.tmp"
+            with open(tmp_file, 'w') as f:
                 f.write(installation_id)
+            os.replace(tmp_file, id_file)
                 
             return installation_id
                 
@@ -83,16 +115,15 @@ class InstallationTracker:
             
             # Try primary URL first
             try:
-                response = requests.post(
+                with self._session.post(
                     TRACKING_URL,
                     json=system_info,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5  # Short timeout to prevent slowing down startup
-                )
-                
-                if response.status_code == 200:
-                    logger.debug("Installation tracking successful")
-                    return
+                    timeout=TRACKING_TIMEOUT,  # Short timeouts to keep the background thread brief
+                    stream=True  # Only the status matters; the body is never downloaded
+                ) as response:
+                    if response.status_code == 200:
+                        logger.debug("Installation tracking successful")
+                        return
                     
             except requests.RequestException:
                 # If primary URL fails, try backup
@@ -100,12 +131,12 @@ class InstallationTracker:
                 
             # Try backup URL if primary failed
             try:
-                requests.post(
+                self._session.post(
                     BACKUP_TRACKING_URL,
                     json=system_info,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5
-                )
+                    timeout=TRACKING_TIMEOUT,
+                    stream=True
+                ).close()
                 logger.debug("Installation tracking successful (backup)")
             except requests.RequestException as e:
                 logger.debug(f"Tracking request failed: {str(e)}")
@@ -120,38 +151,65 @@ class InstallationTracker:
         Returns:
             dict: Statistics about installations, or None if request fails
         """
-        try:
-            response = requests.get(
-                f"{TRACKING_URL}/stats",
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-                
-            # Try backup URL if primary failed
-            response = requests.get(
-                f"{BACKUP_TRACKING_URL}/stats",
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return response.json()
+        # Try the primary URL, then the backup if it fails or is unreachable
+        for url in (TRACKING_URL, BACKUP_TRACKING_URL):
+            try:
+                stats = self._fetch_stats(f"{url}/stats")
+                if stats is not None:
+                    return stats
+            except requests.RequestException as e:
+                logger.debug(f"Stats request to {url} failed: {e}")
+            except Exception as e:
+                logger.error(f"Error getting installation stats: {e}")
+                return None
+        
+        return None
+    
+    def _fetch_stats(self, url):
+        """
+        Fetch and decode a stats response, reading at most MAX_RESPONSE_BYTES.
+        
+        Args:
+            url (str): Stats endpoint
             
-            return None
-                
-        except Exception as e:
-            logger.error(f"Error getting installation stats: {e}")
-            return None
+        Returns:
+            dict: Decoded statistics, or None on a non-200 or oversized response
+        """
+        with self._session.get(url, timeout=STATS_TIMEOUT, stream=True) as response:
+            if response.status_code != 200:
+                return None
+            # iter_content wraps urllib3 read errors in requests exceptions for the caller
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=8192):
+                body += chunk
+                if len(body) > MAX_RESPONSE_BYTES:
+                    logger.debug(f"Stats response from {url} exceeds {MAX_RESPONSE_BYTES} bytes")
+                    return None
+            return json.loads(body)
+
 
+# Singleton instance, created on first use so importing this module does no disk I/O
+_tracker = None
+_tracker_lock = threading.Lock()
 
-# Singleton instance
-tracker = InstallationTracker()
+def _get_tracker():
+    """
+    Get the shared installation tracker, creating it on first call.
+    
+    Returns:
+        InstallationTracker: The tracker singleton
+    """
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = InstallationTracker()
+    return _tracker
 
 def track_installation():
     """Track a new installation or update."""
-    tracker.track_installation()
+    _get_tracker().track_installation()
 
 def get_installation_stats():
     """Get installation statistics."""
-    return tracker.get_installation_stats() 
\ No newline at end of file
+    return _get_tracker().get_installation_stats() 
\ No newline at end of file
@@ -21,6 +21,16 @@ class WhatsAppIntentParser:
         self.list_contacts_pattern = re.compile(r'(?:list|show|get|view)\s+(?:my\s+)?(?:whatsapp\s+)?(?:contacts|recent contacts)', re.IGNORECASE)
         self.ai_compose_whatsapp_pattern = re.compile(r'(?:ai|assistant|help me)\s+(?:write|compose|draft|create)\s+(?:a\s+)?(?:whatsapp|message|whatsapp message|whatsapp msg|msg)\s+(?:to\s+)?([+]?\d+|[a-zA-Z0-9\s]+)(?:\s+(?:about|regarding|on|for).*)?', re.IGNORECASE)
         
+        # Helper patterns used inside parse_intent, compiled once here rather than per call
+        self.ai_request_pattern = re.compile(r'(?:ai|assistant|help)\s+(?:write|compose|draft|create)', re.IGNORECASE)
+        self.phone_pattern = re.compile(r'(?:to\s+)?([+=]?\d{10,})')
+        self.explicit_send_pattern = re.compile(r'(?:send|write|compose)\s+(?:a\s+)?whatsapp\s+(?:message|msg)\s+(?:to\s+)?([^\s]+)', re.IGNORECASE)
+        self.message_patterns = (
+            re.compile(r'(?:saying|with message|that says)\s+(.+)$', re.IGNORECASE),
+            re.compile(r'(?:with text|with content)\s+(.+)$', re.IGNORECASE),
+            re.compile(r'(?::" |:" |:\s*")(.+?)(?:"|\n|$)', re.IGNORECASE)
+        )
+        
         # Store patterns in a dictionary for easy reference
         self.patterns = {
             'setup_whatsapp': self.setup_whatsapp_pattern,
@@ -46,15 +56,15 @@ class WhatsAppIntentParser:
             
         # Special handling for AI message composition with phone numbers
         # This should be checked FIRST to prioritize it
-        if re.search(r'(?:ai|assistant|help)\s+(?:write|compose|draft|create)', text.lower()):
+        if self.ai_request_pattern.search(text):
             # Check if there's a phone number in the text
-            phone_match = re.search(r'(?:to\s+)?([+=]?\d{10,})', text)
+            phone_match = self.phone_pattern.search(text)
             if phone_match:
                 recipient = phone_match.group(1)
-                logger.info(f"Detected intent: AI compose WhatsApp message to phone number {recipient}")
+                logger.info("Detected intent: AI compose WhatsApp message to phone number %s", recipient)
                 return {
                     'action': 'ai_compose_whatsapp',
-                    'recipient': recipient.strip(),
+                    'recipient': recipient,
                     'instruction': text
                 }
         
@@ -66,8 +76,7 @@ class WhatsAppIntentParser:
             }
         
         # More explicit pattern for sending WhatsApp messages
-        explicit_send_pattern = re.compile(r'(?:send|write|compose)\s+(?:a\s+)?whatsapp\s+(?:message|msg)\s+(?:to\s+)?([^\s]+)', re.IGNORECASE)
-        explicit_match = explicit_send_pattern.search(text)
+        explicit_match = self.explicit_send_pattern.search(text)
         if explicit_match:
             recipient = explicit_match.group(1)
             # Try to find a message content after the recipient
@@ -75,7 +84,7 @@ class WhatsAppIntentParser:
             message_match = message_pattern.search(text)
             message = message_match.group(1) if message_match else ""
             
-            logger.info(f"Detected explicit intent: send WhatsApp message to {recipient}")
+            logger.info("Detected explicit intent: send WhatsApp message to %s", recipient)
             return {
                 'action': 'send_whatsapp',
                 'recipient': recipient.strip(),
@@ -91,19 +100,13 @@ class WhatsAppIntentParser:
             # If we have a recipient but no message, extract it from the full text
             if recipient and not message:
                 # Try to extract message if it's in a different format
-                message_patterns = [
-                    re.compile(r'(?:saying|with message|that says)\s+(.+)$', re.IGNORECASE),
-                    re.compile(r'(?:with text|with content)\s+(.+)$', re.IGNORECASE),
-                    re.compile(r'(?::" |:" |:\s*")(.+?)(?:"|\n|$)', re.IGNORECASE)
-                ]
-                
-                for pattern in message_patterns:
+                for pattern in self.message_patterns:
                     message_match = pattern.search(text)
                     if message_match:
                         message = message_match.group(1)
                         break
             
-            logger.info(f"Detected intent: send WhatsApp message to {recipient}")
+            logger.info("Detected intent: send WhatsApp message to %s", recipient)
             return {
                 'action': 'send_whatsapp',
                 'recipient': recipient.strip(),
@@ -137,7 +140,7 @@ class WhatsAppIntentParser:
             recipient = ai_compose_match.group(1) if ai_compose_match.groups() else None
             
             if recipient:
-                logger.info(f"Detected intent: AI compose WhatsApp message to {recipient}")
+                logger.info("Detected intent: AI compose WhatsApp message to %s", recipient)
                 return {
                     'action': 'ai_compose_whatsapp',
                     'recipient': recipient.strip(),
@@ -32,9 +32,11 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "google-generativeai",
-        "openai",
+        "openai>=1.0",
         "SpeechRecognition",
         "pillow",
+        "mss",                # Fast screen capture
+        "pybase64",           # SIMD base64 for screenshot payloads
         "opencv-python",
         "python-dotenv>=0.19.2",
         "gtts",
@@ -50,6 +52,7 @@ setup(
         "matplotlib>=3.5.0",  # For Excel visualizations
         "numpy>=1.20.0",      # For Excel data processing
         "pandas>=1.3.0",      # Enhanced Excel handling
+        "numexpr>=2.8.0",     # Vectorized evaluation for pandas query()
         "openpyxl>=3.0.9",    # Excel file operations
         "xlwings>=0.27.0"     # Excel application interaction
     ],
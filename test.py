@@ -109,9 +109,12 @@ async def main():
         print(f"\nQuestion: {question}")
         print("-" * 50)
         
+        # Capture in the background while the user answers, so it's ready if wanted
+        capture = screenshot.capture_async(force_new=True)
+        
         # Ask if user wants to include a screenshot
         include_screenshot = input("Include screenshot with your question? (y/n): ").lower() == 'y'
-        screenshot_encoded = screenshot.capture(force_new=True) if include_screenshot else None
+        screenshot_encoded = capture.result() if include_screenshot else None
         
         # Get the response from the assistant
         print("Sending question to AI...")
@@ -123,15 +126,16 @@ async def main():
         print("=" * 50)
     
     elif choice == "2":
-        # Capture a screenshot
+        # Capture a screenshot in the background while the user types
         print("\nCapturing desktop screenshot...")
-        screenshot_encoded = screenshot.capture(force_new=True)
+        capture = screenshot.capture_async(force_new=True)
+        
+        # Ask a question about the screen
+        question = input("\nEnter your question: ")
+        screenshot_encoded = capture.result()
         
         if screenshot_encoded:
             print("Screenshot captured successfully!")
-            
-            # Ask a question about the screen
-            question = input("\nEnter your question: ")
             print(f"\nQuestion: {question}")
             print("-" * 50)
             
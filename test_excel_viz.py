@@ -6,8 +6,11 @@ This script tests the fix for the Excel visualization error:
 
 import os
 import sys
+import concurrent.futures
 import pandas as pd
 import logging
+import matplotlib
+matplotlib.use("Agg")  # Headless backend; skips probing for a GUI toolkit
 import matplotlib.pyplot as plt
 from pathlib import Path
 
@@ -179,14 +182,23 @@ def test_date_column():
         logger.info(f"Date column test passed: Chart saved to {chart_path}")
         return True
 
+TESTS = {
+    "pie": test_pie_chart,
+    "mixed": test_mixed_types,
+    "date": test_date_column,
+}
+
+def _run_test(name):
+    """Run a single named test (in a worker process)"""
+    return TESTS[name]()
+
 def main():
     """Run all tests"""
     logger.info("Starting Excel visualization tests")
     
-    # Run tests
-    pie_test = test_pie_chart()
-    mixed_test = test_mixed_types()
-    date_test = test_date_column()
+    # Run tests; they're independent and render-bound, so each gets its own process
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(TESTS)) as executor:
+        pie_test, mixed_test, date_test = executor.map(_run_test, TESTS)
     
     # Report results
     logger.info("Test Results:")